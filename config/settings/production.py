@@ -152,3 +152,5 @@ LOGGING = {
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+FEED_JOBS_BACKEND = env("FEED_JOBS_BACKEND", default="redis")
+SEEN_FILTER_BACKEND = env("SEEN_FILTER_BACKEND", default="redis")
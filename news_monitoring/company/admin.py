@@ -1,10 +1,17 @@
 from django.contrib import admin
 
 from .models import Company
+from .models import CompanyAlias
+
+
+class CompanyAliasInline(admin.TabularInline):
+    model = CompanyAlias
+    extra = 1
 
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
+    inlines = [CompanyAliasInline]
     list_display = (
         "name",
         "domain",
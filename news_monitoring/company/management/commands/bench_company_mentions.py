@@ -0,0 +1,165 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from news_monitoring.company import mentions
+
+# Share of the generated words that are company names
+MENTION_RATE = 0.02
+
+WORDS = [
+    "shares",
+    "rose",
+    "after",
+    "the",
+    "company",
+    "reported",
+    "quarterly",
+    "earnings",
+    "ahead",
+    "of",
+    "forecasts",
+    "while",
+    "rivals",
+    "cut",
+    "jobs",
+    "and",
+    "regulators",
+    "opened",
+    "an",
+    "inquiry",
+    "into",
+    "the",
+    "merger",
+    "of",
+    "two",
+    "banks",
+    "as",
+    "oil",
+    "prices",
+    "fell",
+    "on",
+    "weaker",
+    "demand",
+]
+SYLLABLES = [
+    "ac",
+    "me",
+    "glo",
+    "bex",
+    "ini",
+    "tech",
+    "um",
+    "brel",
+    "la",
+    "stark",
+    "wayne",
+    "won",
+    "ka",
+    "hoo",
+    "li",
+    "van",
+    "de",
+    "lay",
+    "soy",
+    "lent",
+    "cy",
+    "ber",
+    "dyne",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of finding company mentions in a story with the "
+        "Aho-Corasick automaton and with a substring test per company, and the cost "
+        "of applying one company change to the automaton."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--companies",
+            type=int,
+            nargs="+",
+            default=[100, 1_000, 10_000, 100_000],
+            help="Companies to match.",
+        )
+        parser.add_argument(
+            "--text-size",
+            type=int,
+            default=5_000,
+            help="Approximate story length in characters.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)  # noqa: S311
+        self.stdout.write(
+            f"{'companies':>9} | {'build ms':>9} | {'automaton ms':>12} | "
+            f"{'substring ms':>12} | {'1 change ms':>11}",
+        )
+        for count in options["companies"]:
+            names = [self.name(rng, i) for i in range(count)]
+            text = self.text(rng, names, options["text_size"])
+            self.run(names, text, options["repeat"])
+
+    def run(self, names, text, repeat):
+        patterns = [(i, mentions.normalize(name)) for i, name in enumerate(names)]
+
+        automaton = mentions.Automaton()
+        started = time.perf_counter()
+        for i, pattern in patterns:
+            automaton.add(pattern, i)
+        list(automaton.search(""))  # Links the trie
+        build_seconds = time.perf_counter() - started
+
+        normalized = mentions.normalize(text)
+        automaton_seconds = self.measure(
+            lambda: list(automaton.search(normalized)),
+            repeat,
+        )
+        substring_seconds = self.measure(
+            lambda: [i for i, pattern in patterns if pattern in normalized],
+            repeat,
+        )
+        change_seconds = self.measure(
+            lambda: self.rename(automaton, *patterns[0]),
+            repeat,
+        )
+        self.stdout.write(
+            f"{len(names):>9,} | {build_seconds * 1000:>9.2f} | "
+            f"{automaton_seconds * 1000:>12.2f} | "
+            f"{substring_seconds * 1000:>12.2f} | {change_seconds * 1000:>11.2f}",
+        )
+
+    def name(self, rng, i):
+        return "".join(rng.choices(SYLLABLES, k=3)).title() + f" {i}"
+
+    def text(self, rng, names, size):
+        """Random news words with a few company names in between."""
+        words: list[str] = []
+        while sum(len(word) + 1 for word in words) < size:
+            words.append(
+                rng.choice(names) if rng.random() < MENTION_RATE else rng.choice(WORDS),
+            )
+        return " ".join(words)
+
+    def rename(self, automaton, key, pattern):
+        """Swap one company's pattern and relink, as a rename's refresh does."""
+        automaton.remove(pattern, key)
+        automaton.add(pattern, key)
+        list(automaton.search(""))
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
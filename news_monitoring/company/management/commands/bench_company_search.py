@@ -0,0 +1,117 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+
+from news_monitoring.company.models import Company
+from news_monitoring.utils import trigram
+
+PREFIXES = [
+    "acme",
+    "globex",
+    "initech",
+    "umbrella",
+    "stark",
+    "wayne",
+    "wonka",
+    "hooli",
+    "vandelay",
+    "soylent",
+    "cyberdyne",
+    "tyrell",
+    "oscorp",
+]
+SUFFIXES = [
+    "holdings",
+    "group",
+    "capital",
+    "labs",
+    "systems",
+    "energy",
+    "foods",
+    "media",
+    "motors",
+    "bank",
+    "partners",
+    "logistics",
+]
+QUERIES = ["wonka", "tyrell sys", "logist", "cyberdine", "zzqx"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of the previous icontains company search and the trigram "
+        "search on generated companies. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--companies",
+            type=int,
+            default=100_000,
+            help="Companies to generate.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["companies"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def run(self, count, repeat):
+        self.generate(count, uuid.uuid4().hex[:8])
+        self.stdout.write(f"pg_trgm installed: {trigram.is_available()}")
+        self.stdout.write(
+            f"{'query':<12} | {'icontains ms':>12} | {'rows':>6} | {'trigram ms':>10} "
+            f"| {'rows':>4}",
+        )
+        for query in QUERIES:
+            old_qs = Company.objects.filter(name__icontains=query).values("id", "name")
+            new_qs = trigram.search(Company.objects.all(), query).values("id", "name")
+            old_seconds, old_rows = self.measure(
+                lambda qs=old_qs: list(qs.all()),
+                repeat,
+            )
+            new_seconds, new_rows = self.measure(
+                lambda qs=new_qs: list(qs.all()),
+                repeat,
+            )
+            self.stdout.write(
+                f"{query:<12} | {old_seconds * 1000:>12.2f} | {len(old_rows):>6} | "
+                f"{new_seconds * 1000:>10.2f} | {len(new_rows):>4}",
+            )
+
+    def generate(self, count, tag):
+        """Insert ``count`` companies named "<prefix> <suffix> <n>" in one statement."""
+        prefixes = f"(ARRAY[{', '.join(f"'{word}'" for word in PREFIXES)}])"
+        suffixes = f"(ARRAY[{', '.join(f"'{word}'" for word in SUFFIXES)}])"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Company._meta.db_table}
+                    (name, domain, added_on, updated_on)
+                SELECT
+                    initcap({prefixes}[1 + mod(i, {len(PREFIXES)})] || ' '
+                        || {suffixes}[1 + mod(i / {len(PREFIXES)}, {len(SUFFIXES)})])
+                        || ' ' || %(tag)s || i,
+                    'https://' || %(tag)s || i || '.example.com', now(), now()
+                FROM generate_series(1, %(count)s) i
+                """,  # noqa: S608
+                {"tag": tag, "count": count},
+            )
+            cursor.execute(f"ANALYZE {Company._meta.db_table}")
+
+    def measure(self, func, repeat):
+        best, result = float("inf"), None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - started)
+        return best, result
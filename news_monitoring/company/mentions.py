@@ -0,0 +1,220 @@
+"""
+Company mentions in story text, found with an Aho-Corasick automaton.
+
+A company is known by its name, the host of its domain ("acme.com") and its
+aliases (``CompanyAlias``). The patterns of every company are compiled into one
+automaton, so scanning a text costs time linear in its length, plus the matches
+reported, however many companies there are. Matches must start and end at word
+boundaries, so "Acme" is not found in "Acmeville". Case and runs of whitespace
+are ignored.
+
+Each process keeps one automaton and refreshes it incrementally: one aggregate
+query tells whether any company changed since the last refresh, and only the
+changed companies are read back and their patterns swapped in the trie. The
+failure links are then recomputed in one pass over the trie, which is linear in
+the total length of the patterns and needs no query. Companies are read back
+from the last refresh's ``utils.commits.horizon`` on, not from the newest
+``updated_on`` seen, so a change that commits after a newer one is not missed.
+
+Stories are tagged with the companies their title or body mention, with their
+source's tagged companies, or both, as ``settings.STORY_TAGGING`` says.
+"""
+
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from news_monitoring.company.models import Company
+from news_monitoring.company.models import CompanyAlias
+from news_monitoring.utils import commits
+
+MENTIONS = "mentions"
+SOURCE = "source"
+BOTH = "both"
+
+
+def get_tagging():
+    """Return the configured ``STORY_TAGGING``: ``MENTIONS``, ``SOURCE`` or ``BOTH``."""
+    tagging = getattr(settings, "STORY_TAGGING", BOTH)
+    if tagging not in (MENTIONS, SOURCE, BOTH):
+        msg = f"STORY_TAGGING must be {MENTIONS!r}, {SOURCE!r} or {BOTH!r}."
+        raise ImproperlyConfigured(msg)
+    return tagging
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def company_patterns(company):
+    """Return the normalized patterns of ``company``; its aliases must be prefetched."""
+    host = (urlparse(company.domain).hostname or "").removeprefix("www.")
+    names = [company.name, host, *(alias.alias for alias in company.aliases.all())]
+    return {pattern for pattern in map(normalize, names) if pattern}
+
+
+class Automaton:
+    """
+    An Aho-Corasick automaton of patterns, each reported with the keys it was added for.
+
+    Patterns can be added and removed at any time; the failure links are only
+    recomputed before the next search.
+    """
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._keys: list[set] = [set()]  # The keys of the pattern ending at each node
+        self._depth = [0]
+        self._fail = [0]
+        # The nearest node down the failure chain where a pattern ends
+        self._output = [0]
+        self._linked = True
+
+    def add(self, pattern, key):
+        node = 0
+        for char in pattern:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._keys.append(set())
+                self._depth.append(self._depth[node] + 1)
+                self._fail.append(0)
+                self._output.append(0)
+            node = child
+        self._keys[node].add(key)
+        self._linked = False
+
+    def remove(self, pattern, key):
+        # The nodes stay; a node that ends no pattern anymore is a prefix of nothing
+        node = 0
+        for char in pattern:
+            child = self._goto[node].get(char)
+            if child is None:
+                return
+            node = child
+        self._keys[node].discard(key)
+        self._linked = False
+
+    def _link(self):
+        """Compute the failure and output links, breadth first."""
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = self._output[child] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._output[child] = fail if self._keys[fail] else self._output[fail]
+                queue.append(child)
+        self._linked = True
+
+    def search(self, text):
+        """Yield ``(start, end, keys)`` for each pattern found on word boundaries."""
+        if not self._linked:
+            self._link()
+        goto, fail, keys, depth, output = (
+            self._goto,
+            self._fail,
+            self._keys,
+            self._depth,
+            self._output,
+        )
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if end < len(text) and text[end].isalnum():
+                continue  # No match can end inside a word
+            found = node if keys[node] else output[node]
+            while found:
+                start = end - depth[found]
+                if start == 0 or not text[start - 1].isalnum():
+                    yield start, end, keys[found]
+                found = output[found]
+
+
+class Matcher:
+    """The automaton of every company's patterns, kept in step with the table."""
+
+    def __init__(self):
+        self._automaton = Automaton()
+        self._patterns = {}  # company id: patterns
+        # The (count, newest updated_on) of the companies at the last refresh
+        self._checked = None
+        self._horizon = None  # Every change up to it was read at the last refresh
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Apply the changed companies; return how many were re-read or dropped."""
+        state = Company.objects.aggregate(count=Count("id"), newest=Max("updated_on"))
+        checked = (state["count"], state["newest"])
+        # Until the horizon passes the newest stamp, older ones can still commit
+        if checked == self._checked and (
+            checked[1] is None or checked[1] <= self._horizon
+        ):
+            return 0
+
+        horizon = commits.horizon(timezone.now())
+        companies_qs = Company.objects.prefetch_related(
+            Prefetch("aliases", CompanyAlias.objects.only("alias")),
+        )
+        if self._horizon:
+            companies_qs = companies_qs.filter(updated_on__gt=self._horizon)
+        changed = 0
+        for company in companies_qs.only("id", "name", "domain", "updated_on"):
+            self._set(company.id, company_patterns(company))
+            changed += 1
+        if len(self._patterns) != checked[0]:  # Some were deleted
+            for company_id in self._patterns.keys() - set(
+                Company.objects.values_list("id", flat=True),
+            ):
+                self._set(company_id, set())
+                del self._patterns[company_id]
+                changed += 1
+        self._checked = checked
+        self._horizon = horizon
+        return changed
+
+    def _set(self, company_id, patterns):
+        previous = self._patterns.get(company_id, set())
+        for pattern in previous - patterns:
+            self._automaton.remove(pattern, company_id)
+        for pattern in patterns - previous:
+            self._automaton.add(pattern, company_id)
+        self._patterns[company_id] = patterns
+
+    def find(self, *texts):
+        """Return the ids of the companies mentioned in any of ``texts``."""
+        mentioned = set()
+        with self._lock:
+            for text in texts:
+                for _, _, keys in self._automaton.search(normalize(text)):
+                    mentioned |= keys
+        return mentioned
+
+    def refreshed(self):
+        with self._lock:
+            self.refresh()
+        return self
+
+
+_matcher = Matcher()
+
+
+def get_matcher():
+    """Return this process's matcher, caught up with the changed companies."""
+    return _matcher.refreshed()
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from news_monitoring.utils.trigram import add_trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_rename_company_url_company_domain_and_more'),
+    ]
+
+    operations = [
+        add_trigram_index('company.Company', 'name', 'company_name_trgm'),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.13 on 2026-10-18 18:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=255)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='company.company')),
+            ],
+            options={
+                'verbose_name_plural': 'company aliases',
+                'unique_together': {('company', 'alias')},
+            },
+        ),
+    ]
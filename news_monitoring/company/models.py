@@ -1,21 +1,42 @@
 from urllib.parse import urlparse
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
 
 from news_monitoring.users import models as user_model
 
 
 class Company(models.Model):
-    added_by = models.ForeignKey(user_model.User, on_delete=models.SET_NULL, null=True, related_name="added_companies")
-    updated_by = models.ForeignKey(user_model.User, on_delete=models.SET_NULL, null=True,
-                                   related_name="updated_companies")
+    added_by = models.ForeignKey(
+        user_model.User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="added_companies",
+    )
+    updated_by = models.ForeignKey(
+        user_model.User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="updated_companies",
+    )
 
     name = models.CharField(max_length=255, unique=True)
     domain = models.URLField(unique=True)
-    
+
     added_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Substring and similarity search of names; see utils.trigram
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="company_name_trgm",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         """Extract only the domain from the entered URL before saving."""
         parsed_url = urlparse(self.domain)
@@ -24,3 +45,64 @@ class Company(models.Model):
 
     def __str__(self):
         return self.name
+
+
+def touch_companies(company_ids):
+    """Mark the companies changed, for the mention matchers that pick them up."""
+    Company.objects.filter(id__in=company_ids).update(updated_on=timezone.now())
+
+
+class CompanyAliasQuerySet(models.QuerySet):
+    """Alias writes in bulk mark their companies changed, as single ones do."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        touch_companies({alias.company_id for alias in created})
+        return created
+
+    def update(self, **kwargs):
+        company_ids = set(self.values_list("company_id", flat=True))
+        if "company" in kwargs or "company_id" in kwargs:
+            company = kwargs.get("company", kwargs.get("company_id"))
+            company_ids.add(getattr(company, "id", company))
+        updated = super().update(**kwargs)
+        touch_companies(company_ids)
+        return updated
+
+    def delete(self):
+        company_ids = set(self.values_list("company_id", flat=True))
+        result = super().delete()
+        touch_companies(company_ids)
+        return result
+
+
+class CompanyAlias(models.Model):
+    """Another name a company is mentioned by: a brand, ticker or former name."""
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+    )
+    alias = models.CharField(max_length=255)
+
+    objects = CompanyAliasQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("company", "alias")
+        verbose_name_plural = "company aliases"
+
+    def __str__(self):
+        return self.alias
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._touch_company()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._touch_company()
+        return result
+
+    def _touch_company(self):
+        touch_companies([self.company_id])
@@ -0,0 +1,54 @@
+def tag_companies(relation, object_ids, company_ids, *, replace=False):
+    """
+    Write the through-rows of a ``tagged_companies`` relation for many objects at once.
+
+    All rows go out in a single ``bulk_create`` on the through model, so tagging a
+    whole batch costs one query (two with ``replace``) instead of several per object.
+    Existing rows are left alone, and m2m_changed signals are not sent.
+
+    Args:
+        relation: The many-to-many descriptor, e.g. ``Story.tagged_companies``.
+        object_ids (Iterable[int]): Ids of the stories/sources to tag.
+        company_ids (Iterable[int | str]): Ids of the companies to tag them with.
+        replace (bool): Also drop the objects' tags that are not in ``company_ids``.
+    """
+    through = relation.through
+    object_column = f"{relation.field.m2m_field_name()}_id"
+    company_column = f"{relation.field.m2m_reverse_field_name()}_id"
+    object_ids = list(object_ids)
+    company_ids = {int(company_id) for company_id in company_ids}
+
+    if replace:
+        through.objects.filter(**{f"{object_column}__in": object_ids}).exclude(
+            **{f"{company_column}__in": company_ids},
+        ).delete()
+
+    through.objects.bulk_create(
+        [
+            through(**{object_column: object_id, company_column: company_id})
+            for object_id in object_ids
+            for company_id in company_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def tag_each(relation, company_ids_by_object):
+    """
+    Like :func:`tag_companies`, with each object's own companies, still in one query.
+
+    Args:
+        relation: The many-to-many descriptor, e.g. ``Story.tagged_companies``.
+        company_ids_by_object (dict[int, Iterable[int]]): Company ids per object id.
+    """
+    through = relation.through
+    object_column = f"{relation.field.m2m_field_name()}_id"
+    company_column = f"{relation.field.m2m_reverse_field_name()}_id"
+    through.objects.bulk_create(
+        [
+            through(**{object_column: object_id, company_column: company_id})
+            for object_id, company_ids in company_ids_by_object.items()
+            for company_id in company_ids
+        ],
+        ignore_conflicts=True,
+    )
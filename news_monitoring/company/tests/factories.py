@@ -0,0 +1,13 @@
+from factory import Sequence
+from factory.django import DjangoModelFactory
+
+from news_monitoring.company.models import Company
+
+
+class CompanyFactory(DjangoModelFactory[Company]):
+    name = Sequence(lambda n: f"Company {n}")
+    domain = Sequence(lambda n: f"https://company{n}.example.com")
+
+    class Meta:
+        model = Company
+        django_get_or_create = ["name"]
@@ -0,0 +1,150 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections
+from django.utils import timezone
+
+from news_monitoring.company import mentions
+from news_monitoring.company.models import Company
+from news_monitoring.company.models import CompanyAlias
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.utils import commits
+
+
+class TestAutomaton:
+    def automaton(self, *patterns):
+        automaton = mentions.Automaton()
+        for key, pattern in enumerate(patterns):
+            automaton.add(pattern, key)
+        return automaton
+
+    def test_overlapping_patterns_are_all_found(self):
+        automaton = self.automaton("he", "she", "his", "hers", "she sells")
+
+        found = [
+            (start, end, keys)
+            for start, end, keys in automaton.search("she sells hers")
+        ]
+
+        assert found == [(0, 3, {1}), (0, 9, {4}), (10, 14, {3})]
+
+    def test_matches_stop_at_word_boundaries(self):
+        automaton = self.automaton("acme", "acme.com")
+
+        assert [
+            keys for _, _, keys in automaton.search("acmes acme.com acme-built macme")
+        ] == [{0}, {1}, {0}]
+
+    def test_removed_patterns_are_not_found(self):
+        automaton = self.automaton("acme", "acme corp")
+        list(automaton.search("acme corp"))
+
+        automaton.remove("acme corp", 1)
+        automaton.add("acme corp", 2)
+
+        assert [keys for _, _, keys in automaton.search("acme corp")] == [{0}, {2}]
+
+
+def test_tagging_must_be_known(settings):
+    settings.STORY_TAGGING = "everything"
+
+    with pytest.raises(ImproperlyConfigured):
+        mentions.get_tagging()
+
+
+@pytest.mark.django_db
+class TestMatcher:
+    @pytest.fixture(autouse=True)
+    def settled(self, monkeypatch):
+        monkeypatch.setattr(commits, "SETTLE", datetime.timedelta(0))
+
+    def test_names_domains_and_aliases(self):
+        acme = CompanyFactory(name="Acme  Corp", domain="https://www.acme.com/about")
+        CompanyAlias.objects.create(company=acme, alias="ACME")
+        CompanyFactory(name="Globex")
+
+        assert mentions.company_patterns(acme) == {"acme corp", "acme.com", "acme"}
+        assert mentions.get_matcher().find("Shares of acme\nCorp rose", "") == {acme.id}
+
+    def test_refresh_reads_only_the_changed_companies(self, django_assert_num_queries):
+        acme, globex = CompanyFactory(name="Acme"), CompanyFactory(name="Globex")
+        matcher = mentions.Matcher()
+        assert matcher.refresh() == len([acme, globex])
+
+        with django_assert_num_queries(1):
+            assert matcher.refresh() == 0
+
+        CompanyAlias.objects.create(company=globex, alias="Initech")
+        assert matcher.refresh() == 1
+        assert matcher.find("Initech and Acme") == {acme.id, globex.id}
+
+        acme.name = "Acme Holdings"
+        acme.save()
+        globex.delete()
+        assert matcher.refresh() == len([acme, globex])
+        assert matcher.find("Initech and Acme Holdings and Acme") == {acme.id}
+        assert matcher.find("Acme") == set()
+
+    def test_aliases_deleted_in_bulk_are_dropped(self):
+        acme = CompanyFactory(name="Acme")
+        CompanyAlias.objects.bulk_create(
+            [
+                CompanyAlias(company=acme, alias=alias)
+                for alias in ("Wile", "Roadrunner")
+            ],
+        )
+        matcher = mentions.Matcher()
+        matcher.refresh()
+        assert matcher.find("Wile") == {acme.id}
+
+        CompanyAlias.objects.filter(company=acme).delete()
+        matcher.refresh()
+
+        assert matcher.find("Wile and Roadrunner") == set()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_changes_committed_after_newer_ones_are_read(self):
+        acme, globex = CompanyFactory(name="Acme"), CompanyFactory(name="Globex")
+        matcher = mentions.Matcher()
+        matcher.refresh()
+        other = connections.create_connection("default")
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as other_cursor:
+                other_cursor.execute("SELECT 1")
+                other_cursor.execute(
+                    f"UPDATE {Company._meta.db_table} "  # noqa: S608
+                    "SET name = %s, updated_on = %s WHERE id = %s",
+                    ["Initech", timezone.now(), acme.id],
+                )
+                globex.save()
+                matcher.refresh()
+                other.commit()
+        finally:
+            other.close()
+
+        matcher.refresh()
+
+        assert matcher.find("Initech") == {acme.id}
+
+
+@pytest.mark.django_db
+def test_benchmark_reports_every_size():
+    out = StringIO()
+    sizes = ["10", "50"]
+
+    call_command(
+        "bench_company_mentions",
+        "--companies",
+        *sizes,
+        "--repeat",
+        "1",
+        stdout=out,
+    )
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 1 + len(sizes)  # A header and a line per size
+    assert lines[-1].split("|")[0].strip() == "50"
@@ -0,0 +1,58 @@
+import pytest
+
+from news_monitoring.company import services
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source.models import Source
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestTagCompanies:
+    @pytest.mark.parametrize("batch_size", [1, 10, 100])
+    def test_a_batch_is_tagged_in_one_query(
+        self,
+        batch_size,
+        django_assert_num_queries,
+    ):
+        companies = CompanyFactory.create_batch(3)
+        stories = StoryFactory.create_batch(batch_size, company=companies[0])
+
+        with django_assert_num_queries(1):
+            services.tag_companies(
+                Story.tagged_companies,
+                [s.id for s in stories],
+                [c.id for c in companies],
+            )
+
+        assert Story.tagged_companies.through.objects.count() == batch_size * 3
+
+    def test_existing_tags_are_kept(self):
+        first, second = CompanyFactory.create_batch(2)
+        story = StoryFactory()
+        story.tagged_companies.set([first])
+
+        services.tag_companies(
+            Story.tagged_companies,
+            [story.id],
+            [first.id, str(second.id)],
+        )
+
+        assert set(story.tagged_companies.all()) == {first, second}
+
+    def test_replace_drops_other_tags_in_two_queries(self, django_assert_num_queries):
+        first, second, third = CompanyFactory.create_batch(3)
+        source = SourceFactory()
+        source.tagged_companies.set([first, second])
+
+        with django_assert_num_queries(2):
+            services.tag_companies(
+                Source.tagged_companies,
+                [source.id],
+                [second.id, third.id],
+                replace=True,
+            )
+
+        assert set(source.tagged_companies.all()) == {second, third}
@@ -0,0 +1,68 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.utils import trigram
+
+pytestmark = pytest.mark.django_db
+
+
+def search(client, **params):
+    return [
+        company["name"]
+        for company in client.get(reverse("company:search_companies"), params).json()
+    ]
+
+
+class TestSearchCompanies:
+    def test_closest_names_come_first(self, client):
+        for name in ["Acme Holdings", "Pacmen", "Acme", "Globex"]:
+            CompanyFactory(name=name)
+
+        names = search(client, q="acme")
+
+        assert names[0] == "Acme"
+        assert set(names) == {"Acme", "Acme Holdings", "Pacmen"}
+
+    def test_results_are_limited(self, client):
+        for i in range(30):
+            CompanyFactory(name=f"Acme {i}")
+
+        assert len(search(client, q="acme")) == trigram.SEARCH_LIMIT
+        limit = 5
+        assert len(search(client, q="acme", limit=str(limit))) == limit
+        assert len(search(client, q="acme", limit="1000")) <= trigram.MAX_SEARCH_LIMIT
+
+    def test_ids_and_empty_queries(self, client):
+        acme = CompanyFactory(name="Acme")
+        CompanyFactory(name="Globex")
+
+        assert search(client, ids=f"{acme.id},x") == ["Acme"]
+        assert search(client, q=" ") == []
+
+    def test_misspelt_words_match(self, client):
+        if not trigram.is_available():
+            pytest.skip("pg_trgm is not installed")
+        CompanyFactory(name="Cyberdyne Systems")
+        CompanyFactory(name="Globex")
+
+        assert search(client, q="cyberdine") == ["Cyberdyne Systems"]
+
+
+def test_search_benchmark_runs():
+    out = StringIO()
+
+    call_command(
+        "bench_company_search",
+        "--companies",
+        "300",
+        "--repeat",
+        "1",
+        stdout=out,
+    )
+
+    queries = [line.split()[0] for line in out.getvalue().splitlines()[2:]]
+    assert queries == ["wonka", "tyrell", "logist", "cyberdine", "zzqx"]
@@ -1,19 +1,22 @@
 from django.contrib import messages
 from django.http import JsonResponse
-from django.shortcuts import render, redirect
+from django.shortcuts import redirect
+from django.shortcuts import render
 
 from news_monitoring.company import models
+from news_monitoring.utils import trigram
 
 
 def add_company(request):
     """
     Handle the process of adding a new company.
 
-        - If the request method is POST, it extracts the 'name' and 'domain' from the form data.
+        - If the request method is POST, it extracts 'name' and 'domain' from the form.
         - Validates that both fields are provided.
-        - If the user is authenticated, the company is associated with the user via 'added_by'.
+        - If the user is authenticated, the company is associated with the user via
+          'added_by'.
         - Otherwise, 'added_by' is set to None.
-        - After successful creation, displays a success message and redirects to the same page.
+        - After successful creation, displays a success message and redirects back.
         - If the request method is not POST, renders the company addition form.
 
     Args:
@@ -50,13 +53,16 @@ def search_companies(request):
     Search for companies based on a query string or a list of company IDs.
 
     - If 'ids' is provided in the GET parameters, returns companies matching those IDs.
-    - If 'q' (query) is provided, performs a case-insensitive partial match search on the company name.
+    - If 'q' (query) is provided, returns the companies whose name contains it or a word
+      similar to it, best match first (see utils.trigram).
     - If neither is provided, returns an empty result set.
-    - The result is returned as a JSON response with each company represented by its ID and name.
+    - The result is returned as a JSON response of each company's ID and name.
 
     GET Parameters:
         q (str, optional): A search keyword to filter companies by name.
-        ids (str, optional): A comma-separated list of company IDs to retrieve specific companies.
+        ids (str, optional): A comma-separated list of company IDs to retrieve.
+        limit (int, optional): The maximum number of search results, 20 by default and
+            at most 100.
 
     Args:
         request (HttpRequest): The HTTP request object.
@@ -66,12 +72,14 @@ def search_companies(request):
     """
     query = request.GET.get("q", "").strip()
     ids = request.GET.get("ids", "")
+    limit = request.GET.get("limit", "")
+    limit = int(limit) if limit.isdigit() else trigram.SEARCH_LIMIT
 
     if ids:
         ids_list = [int(i) for i in ids.split(",") if i.isdigit()]
         companies = models.Company.objects.filter(id__in=ids_list)
     elif query:
-        companies = models.Company.objects.filter(name__icontains=query)
+        companies = trigram.search(models.Company.objects.all(), query, limit=limit)
     else:
         companies = models.Company.objects.none()
 
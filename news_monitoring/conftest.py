@@ -1,5 +1,8 @@
 import pytest
+from django.core.cache import cache
 
+from news_monitoring.company import mentions
+from news_monitoring.story import seen
 from news_monitoring.users.models import User
 from news_monitoring.users.tests.factories import UserFactory
 
@@ -9,6 +12,26 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_mention_matcher(monkeypatch):
+    # Each test's companies are rolled back, but a matcher built earlier knows them
+    monkeypatch.setattr(mentions, "_matcher", mentions.Matcher())
+
+
+@pytest.fixture(autouse=True)
+def _fresh_seen_filters():
+    # Filters hold hashes of stories other tests rolled back, and follow test settings
+    seen.get_filters.cache_clear()
+    yield
+    seen.get_filters.cache_clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -1,11 +1,18 @@
-
 from django.contrib import admin
+
 from news_monitoring.source.models import Source
 
 
 @admin.register(Source)
 class SourceAdmin(admin.ModelAdmin):
-    list_display = ("name", "url", "display_tagged_companies", "added_by")
+    list_display = (
+        "name",
+        "url",
+        "display_tagged_companies",
+        "added_by",
+        "not_modified_count",
+        "bytes_saved",
+    )
     search_fields = ("name", "url")
     list_filter = ("added_on",)
     ordering = ("-updated_on",)
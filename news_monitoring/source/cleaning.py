@@ -0,0 +1,147 @@
+"""
+Summary cleaning: turn the HTML of a feed entry summary into plain text.
+
+Most summaries are plain text or a handful of simple inline/paragraph tags, which
+regular expressions strip far faster than building a BeautifulSoup tree. Anything
+the fast path cannot handle safely (scripts, styles, comments, CDATA, stray ``<``)
+falls back to BeautifulSoup. Both paths separate words at block-level tags, drop
+comments and unsafe elements without separating the words around them, decode
+entities and collapse runs of whitespace to one space.
+
+They differ on malformed entities only. The fast paths decode them as browsers do
+(:func:`html.unescape`, so ``&copyright`` reads "©right"), while BeautifulSoup
+leaves a name it does not know as it is, without its semicolon.
+
+The cleaner used at ingest is ``settings.SUMMARY_CLEANER`` (a dotted path to a
+callable taking and returning a string), defaulting to :func:`clean_summary`.
+"""
+
+import functools
+import html
+import re
+
+from bs4 import BeautifulSoup
+from bs4 import NavigableString
+from bs4 import PageElement
+from bs4 import Tag
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_CLEANER = "news_monitoring.source.cleaning.clean_summary"
+
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "br",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "td",
+        "th",
+        "tr",
+        "ul",
+    },
+)
+UNSAFE_TAGS = frozenset(
+    {"script", "style", "template", "textarea", "title", "noscript", "iframe"},
+)
+
+_TAG = re.compile(
+    r"""</?([A-Za-z][A-Za-z0-9]*)[^<>"']*(?:(?:"[^"]*"|'[^']*')[^<>"']*)*>""",
+)
+_UNSAFE_ELEMENT = re.compile(
+    r"<!--.*?-->|<(script|style|template|textarea|title|noscript|iframe)\b[^>]*>.*?</\1\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_whitespace(text):
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def clean_plain(text):
+    """Fast path for text without markup: decode entities and collapse whitespace."""
+    if "&" in text:
+        text = html.unescape(text)
+    return normalize_whitespace(text)
+
+
+def _replace_tag(match):
+    return " " if match.group(1).lower() in BLOCK_TAGS else ""
+
+
+def clean_simple_markup(text):
+    """
+    Strip simple markup with a regular expression.
+
+    Returns None when the text holds anything the regex cannot be trusted with, so
+    the caller can fall back to a real parser.
+    """
+    lowered = text.lower()
+    if "<!--" in text or any(f"<{tag}" in lowered for tag in UNSAFE_TAGS):
+        text = _UNSAFE_ELEMENT.sub("", text)
+    tags = _TAG.findall(text)
+    if len(tags) != text.count("<") or any(tag.lower() in UNSAFE_TAGS for tag in tags):
+        return None
+    return clean_plain(_TAG.sub(_replace_tag, text))
+
+
+def clean_with_parser(text):
+    """Robust path: BeautifulSoup repairs the markup and drops unsafe elements."""
+    parts: list[str] = []
+    # Walk the tree with an explicit stack; a plain str on it ends a block tag
+    soup = BeautifulSoup(text, "html.parser")
+    pending: list[PageElement | str] = list(reversed(soup.contents))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, Tag):
+            if node.name in UNSAFE_TAGS:
+                continue
+            if node.name in BLOCK_TAGS:
+                parts.append(" ")
+                pending.append(" ")
+            pending.extend(reversed(node.contents))
+        elif type(node) in (NavigableString, str):
+            # Comments, CDATA and the like are other subclasses, and are skipped
+            parts.append(str(node))
+    return normalize_whitespace("".join(parts))
+
+
+def clean_summary(text):
+    """Return the plain text of an entry summary by the cheapest safe path."""
+    if not text:
+        return ""
+    if "<" not in text:
+        return clean_plain(text)
+    cleaned = clean_simple_markup(text)
+    if cleaned is None:
+        cleaned = clean_with_parser(text)
+    return cleaned
+
+
+@functools.cache
+def get_summary_cleaner():
+    """Return the configured summary cleaner."""
+    return import_string(getattr(settings, "SUMMARY_CLEANER", DEFAULT_CLEANER))
@@ -0,0 +1,117 @@
+"""HTTP layer for feed downloads, with conditional GET support."""
+
+import gzip
+import time
+import urllib.error
+import urllib.request
+import zlib
+from dataclasses import dataclass
+from http import HTTPStatus
+
+USER_AGENT = "NewsMonitoring/1.0 (+feed ingestion)"
+DEFAULT_TIMEOUT = 20
+
+
+@dataclass
+class FetchResult:
+    """Outcome of downloading a single feed."""
+
+    url: str
+    status: int | None = None
+    content: bytes = b""
+    headers: dict | None = None  # Names lowercased, as HTTP compares them
+    error: str = ""
+    fetch_seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.error and self.status == HTTPStatus.OK
+
+    @property
+    def not_modified(self):
+        return self.status == HTTPStatus.NOT_MODIFIED
+
+    @property
+    def etag(self):
+        return (self.headers or {}).get("etag", "")
+
+    @property
+    def last_modified(self):
+        return (self.headers or {}).get("last-modified", "")
+
+
+@dataclass
+class SourceReport:
+    """Per-source timings and counters of a feed import."""
+
+    source_id: int
+    name: str
+    url: str
+    status: int | None = None
+    fetched_bytes: int = 0
+    entries: int = 0
+    new_stories: int = 0
+    skipped_entries: int = 0  # Below the source's watermark, so not read at all
+    not_modified: bool = False
+    bytes_saved: int = 0
+    # The feed was downloaded and parsed for another source with the same URL
+    shared_fetch: bool = False
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    store_seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def total_seconds(self):
+        return self.fetch_seconds + self.parse_seconds + self.store_seconds
+
+
+def _lowercase_headers(message):
+    """Return response headers as a dict keyed on lowercased names."""
+    return {name.lower(): value for name, value in message.items()}
+
+
+def _decode_body(content, encoding):
+    """Undo the transfer compression we asked the server for."""
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(content)
+    if encoding == "deflate":
+        return zlib.decompress(content)
+    return content
+
+
+def fetch_feed(url, timeout=DEFAULT_TIMEOUT, etag="", last_modified=""):
+    """
+    Download a feed without parsing it; never raises, failures are on the result.
+
+    When the validators of the previous download are given they are sent as
+    ``If-None-Match``/``If-Modified-Since``, and an unchanged feed comes back as an
+    empty 304 result.
+    """
+    result = FetchResult(url=url)
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    request = urllib.request.Request(url, headers=headers)  # noqa: S310
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+            result.status = response.status
+            result.headers = _lowercase_headers(response.headers)
+            result.content = _decode_body(
+                response.read(),
+                result.headers.pop("content-encoding", None),
+            )
+    except urllib.error.HTTPError as e:
+        result.status = e.code
+        result.headers = _lowercase_headers(e.headers) if e.headers else {}
+        if e.code != HTTPStatus.NOT_MODIFIED:
+            result.error = f"HTTP {e.code}"
+    except Exception as e:  # noqa: BLE001
+        result.error = str(e) or e.__class__.__name__
+    result.fetch_seconds = time.perf_counter() - started
+    return result
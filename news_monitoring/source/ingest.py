@@ -0,0 +1,91 @@
+"""
+Concurrent feed ingestion engine.
+
+Feeds are downloaded by a bounded pool of worker threads that only do network I/O.
+Every finished download is handed back to the calling thread, which parses the feed
+and writes the new stories, so parsing and database work never hold up a download
+and all database access stays on a single connection.
+
+Sources of different companies often follow the same feed. They are grouped by
+canonical feed URL so each feed is downloaded and parsed once per run, and its
+entries are fanned out to every source in the group.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from news_monitoring.source import feeds
+from news_monitoring.source import services
+from news_monitoring.story.canonical import canonicalize_url
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = feeds.DEFAULT_TIMEOUT
+
+
+def group_by_feed(sources):
+    """Group sources by canonical feed URL, keeping their first-seen order."""
+    groups: dict[str, list] = {}
+    for source in sources:
+        groups.setdefault(canonicalize_url(source.url), []).append(source)
+    return list(groups.values())
+
+
+def shared_validators(group):
+    """Return the validators to send for a group: only ones all its sources agree on."""
+    validators = {(source.etag, source.last_modified) for source in group}
+    return validators.pop() if len(validators) == 1 else ("", "")
+
+
+def ingest_sources(
+    sources,
+    user=None,
+    workers=DEFAULT_WORKERS,
+    timeout=DEFAULT_TIMEOUT,
+    fetch=feeds.fetch_feed,
+):
+    """
+    Fetch every feed concurrently and store the new stories of each source.
+
+    Sources with the same canonical feed URL share one download and one parse.
+    Stories are attributed to ``user`` when given, otherwise to the user who added
+    the source, and always belong to the source's company. Each download is a
+    conditional GET using the validators stored on the sources, when they agree.
+
+    Args:
+        sources (Iterable[Source]): The sources to refresh.
+        user (User, optional): The user recorded as ``added_by`` on new stories.
+        workers (int): Maximum number of concurrent downloads.
+        timeout (float): Socket timeout in seconds for each download.
+        fetch (Callable): Downloader, replaceable for tests.
+
+    Returns:
+        list[SourceReport]: One report per source, grouped by feed in completion order.
+    """
+    groups = group_by_feed(sources)
+    reports: list[feeds.SourceReport] = []
+    if not groups:
+        return reports
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(groups)))) as executor:
+        futures = {}
+        for group in groups:
+            etag, last_modified = shared_validators(group)
+            future = executor.submit(
+                fetch,
+                group[0].url,
+                timeout=timeout,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            futures[future] = group
+
+        for future in as_completed(futures):
+            followers = [
+                (source, user or source.added_by, source.company)
+                for source in futures[future]
+            ]
+            reports.extend(
+                services.import_shared_fetch_result(followers, future.result()),
+            )
+
+    return reports
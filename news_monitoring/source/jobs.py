@@ -0,0 +1,183 @@
+"""
+Background feed fetch jobs.
+
+The fetch endpoint only enqueues a job and returns its id; the import runs elsewhere
+and records its progress on the job, which the status endpoint reads back.
+
+Two backends are available through ``settings.FEED_JOBS_BACKEND``:
+
+- ``"redis"``: jobs are pushed on a Redis list for ``manage.py run_fetch_worker``.
+- ``"local"``: jobs run on a thread pool inside the web process, or inline when
+  ``settings.FEED_JOBS_EAGER`` is set. No Redis is needed; tests use this one.
+"""
+
+import functools
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import cast
+
+import redis
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from news_monitoring.source import feeds
+from news_monitoring.source import services
+from news_monitoring.source.models import Source
+from news_monitoring.users.models import User
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+JOB_TTL = 24 * 60 * 60
+
+
+def _new_job(source_id, user_id):
+    now = timezone.now().isoformat()
+    return {
+        "id": uuid.uuid4().hex,
+        "source_id": source_id,
+        "user_id": user_id,
+        "status": QUEUED,
+        "progress": 0.0,
+        "new_stories": 0,
+        "error": "",
+        "created_on": now,
+        "updated_on": now,
+    }
+
+
+class LocalJobQueue:
+    """In-process job queue; jobs and their status live in this process only."""
+
+    def __init__(self, *, eager=False, workers=2):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = (
+            None
+            if eager
+            else ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-job")
+        )
+
+    def enqueue(self, source_id, user_id):
+        job = _new_job(source_id, user_id)
+        with self._lock:
+            self._jobs[job["id"]] = job
+
+        if self._executor is None:
+            run_job(self, job["id"])
+        else:
+            self._executor.submit(self._run_in_thread, job["id"])
+        return job["id"]
+
+    def _run_in_thread(self, job_id):
+        try:
+            run_job(self, job_id)
+        finally:
+            close_old_connections()
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields, updated_on=timezone.now().isoformat())
+
+
+class RedisJobQueue:
+    """Job queue on Redis: a list of pending job ids plus one expiring hash per job."""
+
+    queue_key = "feed-jobs:pending"
+    job_key = "feed-jobs:job:{}"
+    int_fields = ("source_id", "user_id", "new_stories")
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def enqueue(self, source_id, user_id):
+        job = _new_job(source_id, user_id)
+        key = self.job_key.format(job["id"])
+        pipeline = self.client.pipeline()
+        pipeline.hset(key, mapping=job)
+        pipeline.expire(key, JOB_TTL)
+        pipeline.rpush(self.queue_key, job["id"])
+        pipeline.execute()
+        return job["id"]
+
+    def pop(self, timeout=5):
+        """Block until a job id is available, or return None after ``timeout``."""
+        item = cast(
+            "list[str] | None",
+            self.client.blpop([self.queue_key], timeout=timeout),
+        )
+        return item[1] if item else None
+
+    def get(self, job_id):
+        job = cast("dict[str, Any]", self.client.hgetall(self.job_key.format(job_id)))
+        if not job:
+            return None
+        for field in self.int_fields:
+            job[field] = int(job[field])
+        job["progress"] = float(job["progress"])
+        return job
+
+    def update(self, job_id, **fields):
+        self.client.hset(
+            self.job_key.format(job_id),
+            mapping={**fields, "updated_on": timezone.now().isoformat()},
+        )
+
+
+@functools.cache
+def get_queue():
+    """Return the job queue configured by ``settings.FEED_JOBS_BACKEND``."""
+    if settings.FEED_JOBS_BACKEND == "redis":
+        return RedisJobQueue(settings.REDIS_URL)
+    return LocalJobQueue(eager=getattr(settings, "FEED_JOBS_EAGER", False))
+
+
+def enqueue_fetch(source, user):
+    """Queue a fetch of ``source`` on behalf of ``user`` and return the job id."""
+    return get_queue().enqueue(source.id, user.id)
+
+
+def get_job(job_id):
+    return get_queue().get(job_id)
+
+
+def run_job(queue, job_id):
+    """Fetch the job's source and import its new stories, recording progress."""
+    job = queue.get(job_id)
+    if job is None:
+        return
+
+    queue.update(job_id, status=RUNNING, progress=0.1)
+    try:
+        source = Source.objects.select_related("company").get(id=job["source_id"])
+        user = User.objects.get(id=job["user_id"])
+
+        result = feeds.fetch_feed(
+            source.url,
+            etag=source.etag,
+            last_modified=source.last_modified,
+        )
+        queue.update(job_id, progress=0.5)
+
+        report = services.import_fetch_result(source, result, user, source.company)
+    except Exception as e:  # noqa: BLE001
+        queue.update(job_id, status=FAILED, progress=1.0, error=str(e))
+        return
+
+    queue.update(
+        job_id,
+        status=FAILED if report.error else DONE,
+        progress=1.0,
+        new_stories=report.new_stories,
+        error=report.error,
+    )
@@ -0,0 +1,120 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import services as story_services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-entry EXISTS dedup with the batched dedup of feed entries "
+        "(query count and wall time per feed size). All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[50, 100, 200, 500],
+            help="Feed sizes.",
+        )
+        parser.add_argument(
+            "--seen",
+            type=float,
+            default=0.8,
+            help="Fraction of entries already stored.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["sizes"], options["seen"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def run(self, sizes, seen, repeat):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+
+        self.stdout.write(
+            f"{'entries':>8} | {'per-entry queries':>17} {'ms':>8} | "
+            f"{'batched queries':>15} {'ms':>8}",
+        )
+        for size in sizes:
+            links = [f"https://bench.example.com/{tag}/{size}/{i}" for i in range(size)]
+            articles = story_services.get_or_create_canonical_articles(
+                [
+                    Article(
+                        title=link,
+                        body_text="",
+                        article_url=link,
+                        article_url_hash=url_hash(link),
+                        published_date=timezone.now(),
+                    )
+                    for link in links[: int(size * seen)]
+                ],
+            )
+            Story.objects.bulk_create(
+                Story(
+                    article_id=article_id,
+                    article_url_hash=link_hash,
+                    published_date=published_date,
+                    company=company,
+                    added_by=user,
+                )
+                for link_hash, (article_id, published_date) in articles.items()
+            )
+
+            legacy_queries, legacy_seconds = self.measure(
+                lambda links=links: {
+                    link
+                    for link in links
+                    if Story.objects.filter(article__article_url=link).exists()
+                },
+                repeat,
+            )
+            batched_queries, batched_seconds = self.measure(
+                lambda links=links: story_services.get_existing_url_hashes(
+                    company,
+                    [url_hash(link) for link in links],
+                ),
+                repeat,
+            )
+            self.stdout.write(
+                f"{size:>8} | {legacy_queries:>17} {legacy_seconds * 1000:>8.2f} | "
+                f"{batched_queries:>15} {batched_seconds * 1000:>8.2f}",
+            )
+
+    def measure(self, func, repeat):
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        best = float("inf")
+        for _ in range(repeat):
+            queries.clear()
+            with connection.execute_wrapper(count_queries):
+                started = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - started)
+        return len(queries), best
@@ -0,0 +1,73 @@
+import json
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from news_monitoring.source import cleaning
+
+CORPUS = Path(cleaning.__file__).parent / "benchmarks" / "summary_corpus.json"
+
+
+def legacy_clean(text):
+    return BeautifulSoup(text, "html.parser").get_text()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput (entries/sec) of the summary cleaning pipeline with "
+        "BeautifulSoup get_text() on a corpus of feed entry summaries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--corpus",
+            default=str(CORPUS),
+            help="JSON list of {kind, summary} objects.",
+        )
+        parser.add_argument(
+            "--entries",
+            type=int,
+            default=10000,
+            help="Entries cleaned per measurement.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with Path(options["corpus"]).open(encoding="utf-8") as corpus_file:
+            corpus = json.load(corpus_file)
+
+        kinds: dict[str, list[str]] = {}
+        for item in corpus:
+            kinds.setdefault(item["kind"], []).append(item["summary"])
+        kinds["all"] = [item["summary"] for item in corpus]
+
+        self.stdout.write(
+            f"{'corpus':>10} | {'BeautifulSoup/s':>15} | {'pipeline/s':>12} | "
+            f"{'speedup':>7}",
+        )
+        for kind, summaries in kinds.items():
+            entries = (summaries * (options["entries"] // len(summaries) + 1))[
+                : options["entries"]
+            ]
+            legacy = self.measure(legacy_clean, entries, options["repeat"])
+            pipeline = self.measure(cleaning.clean_summary, entries, options["repeat"])
+            self.stdout.write(
+                f"{kind:>10} | {legacy:>15,.0f} | {pipeline:>12,.0f} | "
+                f"{pipeline / legacy:>6.1f}x",
+            )
+
+    def measure(self, clean, entries, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for entry in entries:
+                clean(entry)
+            best = min(best, time.perf_counter() - started)
+        return len(entries) / best
@@ -0,0 +1,132 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from news_monitoring.source import ingest
+from news_monitoring.source.models import Source
+from news_monitoring.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch the feeds of all (or the selected) sources concurrently and import "
+        "their new stories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            type=int,
+            nargs="+",
+            dest="source_ids",
+            help="Only these source ids.",
+        )
+        parser.add_argument(
+            "--company",
+            type=int,
+            dest="company_id",
+            help="Only sources of this company id.",
+        )
+        parser.add_argument(
+            "--search",
+            default="",
+            help="Only sources whose name or URL contains this text.",
+        )
+        parser.add_argument(
+            "--user",
+            default="",
+            help="Email of the user new stories are attributed to.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=ingest.DEFAULT_WORKERS,
+            help="Concurrent downloads.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=ingest.DEFAULT_TIMEOUT,
+            help="Per-feed timeout (s).",
+        )
+
+    def handle(self, *args, **options):
+        sources = Source.objects.select_related("company", "added_by").order_by("id")
+        if options["source_ids"]:
+            sources = sources.filter(id__in=options["source_ids"])
+        if options["company_id"]:
+            sources = sources.filter(company_id=options["company_id"])
+        if options["search"]:
+            sources = sources.filter(
+                name__icontains=options["search"],
+            ) | sources.filter(
+                url__icontains=options["search"],
+            )
+
+        user = None
+        if options["user"]:
+            user = User.objects.filter(email=options["user"]).first()
+            if user is None:
+                msg = f"No user with email {options['user']!r}"
+                raise CommandError(msg)
+
+        reports = ingest.ingest_sources(
+            sources,
+            user=user,
+            workers=options["workers"],
+            timeout=options["timeout"],
+        )
+        for report in sorted(reports, key=lambda r: r.source_id):
+            self.stdout.write(self.format_report(report))
+
+        failed = sum(1 for report in reports if report.error)
+        not_modified = [report for report in reports if report.not_modified]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(reports)} sources, {sum(not r.shared_fetch for r in reports)} "
+                f"downloads, {sum(r.new_stories for r in reports)} new stories, "
+                f"{sum(r.fetched_bytes for r in reports)} bytes fetched, {failed} "
+                f"failed, {len(not_modified)} not modified "
+                f"({sum(r.bytes_saved for r in not_modified)} bytes and "
+                f"{len(not_modified)} parses saved)",
+            ),
+        )
+
+    def format_report(self, report):
+        if report.shared_fetch:
+            return self.format_shared_report(report)
+        if report.not_modified:
+            return (
+                f"[{report.source_id}] {report.name}: not modified, "
+                f"{report.bytes_saved} bytes saved | fetch "
+                f"{report.fetch_seconds * 1000:.0f}ms"
+            )
+        line = (
+            f"[{report.source_id}] {report.name}: {self.format_entries(report)}, "
+            f"{report.new_stories} new | fetch {report.fetch_seconds * 1000:.0f}ms, "
+            f"parse {report.parse_seconds * 1000:.0f}ms, store "
+            f"{report.store_seconds * 1000:.0f}ms"
+        )
+        if report.error:
+            return self.style.ERROR(f"{line} | {report.error}")
+        return line
+
+    def format_entries(self, report):
+        if report.skipped_entries:
+            return (
+                f"{report.entries} entries "
+                f"({report.skipped_entries} below the watermark)"
+            )
+        return f"{report.entries} entries"
+
+    def format_shared_report(self, report):
+        if report.not_modified:
+            line = f"[{report.source_id}] {report.name}: not modified (shared download)"
+        else:
+            line = (
+                f"[{report.source_id}] {report.name}: {self.format_entries(report)}, "
+                f"{report.new_stories} new (shared download) | store "
+                f"{report.store_seconds * 1000:.0f}ms"
+            )
+        if report.error:
+            return self.style.ERROR(f"{line} | {report.error}")
+        return line
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import close_old_connections
+
+from news_monitoring.source import jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued feed fetch jobs from Redis until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=0,
+            help="Exit after this many jobs (0 = never).",
+        )
+        parser.add_argument(
+            "--poll",
+            type=int,
+            default=5,
+            help="Seconds to block waiting for a job.",
+        )
+
+    def handle(self, *args, **options):
+        if settings.FEED_JOBS_BACKEND != "redis":
+            msg = (
+                "FEED_JOBS_BACKEND is not 'redis'; jobs already run inside the web "
+                "process."
+            )
+            raise CommandError(msg)
+
+        queue = jobs.get_queue()
+        done = 0
+        self.stdout.write("Waiting for feed fetch jobs...")
+        while not options["max_jobs"] or done < options["max_jobs"]:
+            job_id = queue.pop(timeout=options["poll"])
+            if job_id is None:
+                continue
+
+            close_old_connections()
+            jobs.run_job(queue, job_id)
+            job = queue.get(job_id) or {}
+            self.stdout.write(
+                f"Job {job_id}: {job.get('status')}, {job.get('new_stories', 0)} new "
+                f"stories {job.get('error', '')}",
+            )
+            done += 1
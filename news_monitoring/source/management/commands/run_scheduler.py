@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from news_monitoring.source import ingest
+from news_monitoring.source import scheduler
+
+
+class LoggingScheduler(scheduler.Scheduler):
+    def __init__(self, stdout, **kwargs):
+        super().__init__(**kwargs)
+        self.stdout = stdout
+
+    def reschedule(self, source, report, cadence=None):
+        super().reschedule(source, report, cadence)
+        self.stdout.write(
+            f"[{source.id}] {source.name}: {report.new_stories} "
+            f"new{' (not modified)' if report.not_modified else ''}"
+            f"{f', {report.error}' if report.error else ''} | next poll in "
+            f"{source.poll_interval}s",
+        )
+
+
+class Command(BaseCommand):
+    help = "Poll sources continuously, each on its own adaptive schedule."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Sources polled per round.",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=int,
+            default=60,
+            help="Longest idle sleep in seconds.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=ingest.DEFAULT_WORKERS,
+            help="Concurrent downloads.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Poll the due sources once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        runner = LoggingScheduler(
+            self.stdout,
+            batch_size=options["batch_size"],
+            max_sleep=options["max_sleep"],
+            workers=options["workers"],
+        )
+        try:
+            runner.run(iterations=1 if options["once"] else None)
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped.")
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.13 on 2026-10-18 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0003_alter_source_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='bytes_saved',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='etag',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='feed_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='last_modified',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='not_modified_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
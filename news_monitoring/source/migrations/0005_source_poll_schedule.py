@@ -0,0 +1,33 @@
+# Generated by Django 5.0.13 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0004_source_conditional_get'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='failure_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='last_polled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='next_poll_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='poll_interval',
+            field=models.PositiveIntegerField(default=3600),
+        ),
+    ]
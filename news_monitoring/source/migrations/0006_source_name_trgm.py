@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from news_monitoring.utils.trigram import add_trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0005_source_poll_schedule'),
+    ]
+
+    operations = [
+        add_trigram_index('source.Source', 'name', 'source_name_trgm'),
+    ]
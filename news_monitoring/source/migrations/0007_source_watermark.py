@@ -0,0 +1,24 @@
+# Generated by Django 5.0.13 on 2026-10-18 19:09
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0006_source_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='watermark_keys',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='watermark_published',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
-
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from news_monitoring.company.models import Company
@@ -6,20 +7,63 @@ from news_monitoring.users.models import User
 
 
 class Source(models.Model):
-    tagged_companies = models.ManyToManyField(Company, related_name="tagged_sources", blank=True)
+    tagged_companies = models.ManyToManyField(
+        Company,
+        related_name="tagged_sources",
+        blank=True,
+    )
 
-    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="sources",)
-    added_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="added_sources")
-    updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="updated_sources",)
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="sources",
+    )
+    added_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="added_sources",
+    )
+    updated_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="updated_sources",
+    )
 
     name = models.CharField(max_length=255)
     url = models.URLField(max_length=500)
 
+    # Conditional GET validators of the last full download, and what 304 answers saved.
+    etag = models.CharField(max_length=255, blank=True, default="")
+    last_modified = models.CharField(max_length=64, blank=True, default="")
+    feed_size = models.PositiveIntegerField(default=0)
+    not_modified_count = models.PositiveIntegerField(default=0)
+    bytes_saved = models.PositiveBigIntegerField(default=0)
+
+    # The entries of the last import, which the next one stops at; see source.watermarks
+    watermark_keys = ArrayField(models.BigIntegerField(), default=list, blank=True)
+    watermark_published = models.DateTimeField(null=True, blank=True)
+
+    # Adaptive polling state, maintained by the scheduler.
+    poll_interval = models.PositiveIntegerField(default=3600)  # seconds
+    next_poll_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_polled_at = models.DateTimeField(null=True, blank=True)
+    failure_count = models.PositiveSmallIntegerField(default=0)
+
     added_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("company", "url")
+        indexes = [
+            # Substring and similarity search of names; see utils.trigram
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="source_name_trgm",
+            ),
+        ]
 
     def __str__(self):
         return f"Name - {self.name} and URL - {self.url}"
@@ -1,15 +1,36 @@
-import feedparser
+import logging
 import time
-from bs4 import BeautifulSoup
+from collections import defaultdict
 from datetime import datetime
 
-from django.core.paginator import Paginator
-from django.db import IntegrityError, transaction
+import feedparser
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import F
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
+from news_monitoring.company import mentions
+from news_monitoring.company import services as company_services
+from news_monitoring.source import cleaning
+from news_monitoring.source import feeds
+from news_monitoring.source import watermarks
 from news_monitoring.source.models import Source
+from news_monitoring.story import alerts
+from news_monitoring.story import canonical
+from news_monitoring.story import facets
+from news_monitoring.story import fingerprints
+from news_monitoring.story import seen
+from news_monitoring.story import services as story_services
+from news_monitoring.story.models import Article
 from news_monitoring.story.models import Story
+from news_monitoring.story.models import make_excerpt
+from news_monitoring.utils import pagination
+from news_monitoring.utils import response_cache
+from news_monitoring.utils import trigram
+
+logger = logging.getLogger(__name__)
 
 
 def get_source(user, source_id):
@@ -22,7 +43,9 @@ def get_source(user, source_id):
         else:
             source_obj = get_object_or_404(queryset, id=source_id, company=user.company)
 
-        return source_obj, list(source_obj.tagged_companies.values_list("id", flat=True))
+        return source_obj, list(
+            source_obj.tagged_companies.values_list("id", flat=True),
+        )
 
     except Exception as e:
         print(f"Error fetching source object: {e}")
@@ -32,7 +55,9 @@ def get_source(user, source_id):
 def get_sources(user, search_query):
     """Fetch sources filtered by user and search query."""
     try:
-        queryset = Source.objects.select_related("company").prefetch_related("tagged_companies")
+        queryset = Source.objects.select_related("company").prefetch_related(
+            "tagged_companies",
+        )
         if not user.is_staff:
             queryset = queryset.filter(company=user.company)
 
@@ -46,46 +71,88 @@ def get_sources(user, search_query):
         return Source.objects.none()
 
 
-def get_sources_json(sources_qs, page_number):
-    """Return paginated sources as JSON."""
-    paginator = Paginator(sources_qs, 10)  # Paginate results
-    page_obj = paginator.get_page(page_number)
+def search_sources(user, search_query, limit=trigram.SEARCH_LIMIT):
+    """Return the user's sources best matching ``search_query`` as ``{id, name}``."""
+    queryset = Source.objects.all()
+    if not user.is_staff:
+        queryset = queryset.filter(company=user.company)
+
+    return list(
+        trigram.search(queryset, search_query, limit=limit).values("id", "name"),
+    )
+
+
+def get_sources_json(sources_qs, cursor):
+    """Return one keyset-paginated page of sources, newest first, as JSON."""
+    try:
+        page_obj = pagination.paginate(sources_qs, ("-id",), cursor)
+    except pagination.InvalidCursorError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
 
     sources_data = [
         {
             "id": source.id,
             "name": source.name,
             "url": source.url,
-            "tagged_companies": [company.name for company in source.tagged_companies.all()],
+            "tagged_companies": [
+                company.name for company in source.tagged_companies.all()
+            ],
         }
-        for source in page_obj
+        for source in page_obj.items
     ]
 
-    return JsonResponse({
-        "sources": sources_data,
-        "has_next": page_obj.has_next(),
-        "has_previous": page_obj.has_previous(),
-        "current_page": page_obj.number,
-        "total_pages": paginator.num_pages,
-    })
+    return JsonResponse(
+        {
+            "sources": sources_data,
+            "has_next": page_obj.has_next,
+            "has_previous": page_obj.has_previous,
+            "next_cursor": page_obj.next_cursor,
+            "previous_cursor": page_obj.previous_cursor,
+        },
+    )
 
 
 def update_or_create_source(source, user, name, url, company, tagged_companies):
     """Create or update a source with optimized database transactions."""
     try:
         with transaction.atomic():
-
+            previous_company_id = source.company_id if source else None
             if source:
+                update_fields = ["name", "url", "company", "updated_by"]
+                if url != source.url or company != source.company:
+                    # What the feed sent before was imported for another URL or company
+                    source.watermark_keys, source.watermark_published = [], None
+                    source.etag = source.last_modified = ""
+                    update_fields += [
+                        "watermark_keys",
+                        "watermark_published",
+                        "etag",
+                        "last_modified",
+                    ]
                 source.name = name
                 source.url = url
                 source.company = company
                 source.updated_by = user
-                source.save(update_fields=["name", "url", "company", "updated_by"])
+                source.save(update_fields=update_fields)
             else:
-                source = Source.objects.create(name=name, url=url, company=company, added_by=user)
+                source = Source.objects.create(
+                    name=name,
+                    url=url,
+                    company=company,
+                    added_by=user,
+                )
 
             if tagged_companies:
-                source.tagged_companies.set(tagged_companies)
+                company_services.tag_companies(
+                    Source.tagged_companies,
+                    [source.id],
+                    tagged_companies,
+                    replace=True,
+                )
+            response_cache.invalidate(source.company_id, response_cache.SOURCES)
+            if previous_company_id not in (None, source.company_id):
+                # The source also left the list of the company it moved from
+                response_cache.invalidate(previous_company_id, response_cache.SOURCES)
 
         return True
     except IntegrityError as e:
@@ -106,7 +173,14 @@ def validate_form_data(user, payload, source_id):
 
         if name and url:
             source, _ = get_source(user, source_id) if source_id else (None, [])
-            success = update_or_create_source(source, user, name, url, company, tagged_companies)
+            success = update_or_create_source(
+                source,
+                user,
+                name,
+                url,
+                company,
+                tagged_companies,
+            )
 
             return success, "Success" if success else "Error updating source"
 
@@ -119,41 +193,322 @@ def validate_form_data(user, payload, source_id):
 
 def import_stories_from_feed(source, user):
     """Fetch and save new stories from the source feed."""
+    result = feeds.fetch_feed(
+        source.url,
+        etag=source.etag,
+        last_modified=source.last_modified,
+    )
+    report = import_fetch_result(source, result, user, user.company)
+    if report.error:
+        logger.warning("Error importing stories from %s: %s", source.url, report.error)
+    return report.new_stories
+
+
+def import_fetch_result(source, result, user, company):
+    """
+    Parse a downloaded feed and save its new entries as stories of ``company``.
+
+    Returns:
+        SourceReport: Timings and counters of the import, with ``error`` set on failure.
+    """
+    return import_shared_fetch_result([(source, user, company)], result)[0]
+
+
+def import_shared_fetch_result(followers, result):
+    """
+    Parse one download of a feed and save its new entries for each following source.
+
+    The feed is parsed, cleaned and fingerprinted once; each follower then gets its
+    own dedup lookups and batched insert, in its own transaction, so one company's
+    failure does not hold back the others. Only the entries above a follower's
+    watermark are cleaned and saved for it (see ``source.watermarks``), and the
+    watermark moves to the feed once they are saved. A 304 answer to a
+    conditional GET skips parsing and all story writes; it only bumps the
+    sources' savings counters. A full download stores the new validators on a
+    source once its stories are saved, so a failed import is retried in full
+    next time.
+
+    Args:
+        followers (list[tuple[Source, User, Company]]): Each source with the user and
+            company its new stories are saved for. The first one made the download.
+        result (FetchResult): The download.
+
+    Returns:
+        list[SourceReport]: One report per follower, in order. The download and the
+        parse are accounted to the first report only.
+    """
+    reports = [
+        feeds.SourceReport(
+            source_id=source.id,
+            name=source.name,
+            url=source.url,
+            status=result.status,
+            fetched_bytes=len(result.content) if index == 0 else 0,
+            fetch_seconds=result.fetch_seconds,
+            shared_fetch=index > 0,
+            error=result.error,
+        )
+        for index, (source, _, _) in enumerate(followers)
+    ]
+    if result.not_modified:
+        for report, (source, _, _) in zip(reports, followers, strict=True):
+            report.not_modified = True
+            report.bytes_saved = source.feed_size
+        record_not_modified([source for source, _, _ in followers])
+        return reports
+    if not result.ok:
+        for report in reports:
+            report.error = report.error or f"HTTP {result.status}"
+        return reports
+
+    started = time.perf_counter()
     try:
-        feed = feedparser.parse(source.url)
-        new_stories = []
-
-        for entry in feed.entries:
-            if Story.objects.filter(article_url=entry.link).exists():
-                continue  # Skip if story already exists
-
-            published_date = (
-                datetime.fromtimestamp(time.mktime(entry.published_parsed))
-                if hasattr(entry, "published_parsed") else None
-            )
-            body_text_cleaned = BeautifulSoup(entry.get("summary", ""), "html.parser").get_text()
+        feed = feedparser.parse(result.content, response_headers=result.headers)
+        new_counts = [
+            watermarks.new_entry_count(source, feed.entries)
+            for source, _, _ in followers
+        ]
+        prepared = list(iter_prepared_entries(feed.entries[: max(new_counts)]))
+    except Exception as e:
+        for report in reports:
+            report.error = f"Error parsing feed: {e}"
+        return reports
+    finally:
+        reports[0].parse_seconds = time.perf_counter() - started
+
+    for report, new_count, follower in zip(reports, new_counts, followers, strict=True):
+        report.entries = len(feed.entries)
+        report.skipped_entries = len(feed.entries) - new_count
+        entries = [fields for index, fields in prepared if index < new_count]
+        store_follower_entries(report, follower, entries, result, feed.entries)
+    return reports
+
+
+def store_follower_entries(report, follower, entries, result, feed_entries):
+    """Save one follower's new entries and move its watermark, in one transaction."""
+    source, user, company = follower
+    if user is None:
+        report.error = "No user to attribute the stories to"
+        return
+
+    started = time.perf_counter()
+    try:
+        with transaction.atomic():
+            if entries:
+                report.new_stories = save_feed_entries(source, user, company, entries)
+            remember_feed(source, result, feed_entries)
+    except Exception as e:
+        report.error = f"Error saving stories: {e}"
+    report.store_seconds = time.perf_counter() - started
+
+
+def remember_feed(source, result, entries):
+    """
+    Store a full download's validators for the next conditional GET, and its watermark.
+
+    Nothing is written when neither changed, as for a stable feed without validators.
+    """
+    validators = (result.etag[:255], result.last_modified[:64], len(result.content))
+    changed = watermarks.advance(source, entries)
+    if not changed and validators == (
+        source.etag,
+        source.last_modified,
+        source.feed_size,
+    ):
+        return
+    source.etag, source.last_modified, source.feed_size = validators
+    Source.objects.filter(id=source.id).update(
+        etag=source.etag,
+        last_modified=source.last_modified,
+        feed_size=source.feed_size,
+        watermark_keys=source.watermark_keys,
+        watermark_published=source.watermark_published,
+    )
+
+
+def record_not_modified(sources):
+    """Count a 304 for each source: one skipped parse and its last download's bytes."""
+    Source.objects.filter(id__in=[source.id for source in sources]).update(
+        not_modified_count=F("not_modified_count") + 1,
+        bytes_saved=F("bytes_saved") + F("feed_size"),
+    )
+
+
+def prepare_feed_entries(entries):
+    """
+    Turn parsed feed entries into their articles' fields, independent of any company.
+
+    Links are canonicalized and hashed, summaries cleaned and fingerprinted, and
+    entries repeating an earlier link of the feed are dropped.
+    """
+    return [fields for _, fields in iter_prepared_entries(entries)]
+
+
+def iter_prepared_entries(entries):
+    """Yield ``(index, fields)`` of :func:`prepare_feed_entries` for ``entries``."""
+    clean_summary = cleaning.get_summary_cleaner()
+    seen_hashes = set()
+
+    for index, entry in enumerate(entries):
+        if not entry.get("link"):
+            continue
+        link = canonical.canonicalize_url(entry.link)
+        link_hash = canonical.url_hash(link)
+        if link_hash in seen_hashes:
+            continue
+        seen_hashes.add(link_hash)
+
+        published_parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        published_date = (
+            datetime.fromtimestamp(time.mktime(published_parsed))
+            if published_parsed
+            else timezone.now()
+        )
+        body_text_cleaned = clean_summary(entry.get("summary", ""))
+
+        yield (
+            index,
+            {
+                "title": entry.title,
+                "body_text": body_text_cleaned,
+                "excerpt": make_excerpt(body_text_cleaned),
+                "article_url": link,
+                "article_url_hash": link_hash,
+                "published_date": published_date,
+                **fingerprints.fingerprint_fields(body_text_cleaned),
+            },
+        )
+
+
+def save_feed_entries(source, user, company, entries):
+    """
+    Save the prepared feed entries not stored yet and return how many were added.
+
+    Entries are resolved against the company's stories by URL hash in one batched
+    query, once its seen filter (``story.seen``) ruled out the definitely new ones.
+    The new ones are linked to the canonical article of their URL, which is only
+    written when no company has stored it yet. Near duplicates of a stored story,
+    or of an earlier entry of the feed, are linked to the original or skipped, as
+    ``settings.NEAR_DUPLICATE_ACTION`` says. The new stories are tagged
+    as :func:`get_feed_tags` says, and matched against the company's saved searches
+    (``story.alerts``).
+
+    Args:
+        entries (list[dict]): Article fields from :func:`prepare_feed_entries`.
+    """
+    seen_hashes = story_services.get_stored_url_hashes(
+        company,
+        [entry["article_url_hash"] for entry in entries],
+    )
+    new_articles = [
+        Article(**entry)
+        for entry in entries
+        if entry["article_url_hash"] not in seen_hashes  # Skip if story already exists
+    ]
 
+    stored, within = fingerprints.find_near_duplicates(company, new_articles)
+    if fingerprints.get_settings()[2] == fingerprints.SKIP:
+        new_articles = [
+            article
+            for index, article in enumerate(new_articles)
+            if index not in stored and index not in within
+        ]
+        stored, within = {}, {}
+
+    new_stories = []
+    if new_articles:
+        canonical = story_services.get_or_create_canonical_articles(new_articles)
+        for index, article in enumerate(new_articles):
+            article_id, published_date = canonical[article.article_url_hash]
             new_stories.append(
                 Story(
-                    title=entry.title,
-                    body_text=body_text_cleaned,
-                    article_url=entry.link,
-                    published_date=published_date,
-                    company=user.company,
+                    company=company,
                     source=source,
-                    added_by=user
-                )
+                    added_by=user,
+                    article_id=article_id,
+                    article_url_hash=article.article_url_hash,
+                    published_date=published_date,
+                    duplicate_of_id=stored.get(index),
+                ),
             )
-
-        if new_stories:
-            Story.objects.bulk_create(new_stories, ignore_conflicts=True)  # Bulk insert for performance
-
-            # Assign tagged companies efficiently in bulk
-            story_ids = [story.id for story in new_stories]
-            tagged_companies = list(source.tagged_companies.all())
-            for story in Story.objects.filter(id__in=story_ids):
-                story.tagged_companies.set(tagged_companies)
-    except feedparser.CharacterEncodingOverride as e:
-        print(f"Error parsing feed: {e}")
-    except Exception as e:
-        print(f"Unexpected error importing stories: {e}")
+        seen.add(company.id, [story.article_url_hash for story in new_stories])
+        # Only the rows inserted here are tagged, counted and matched
+        story_ids = story_services.insert_new_stories(new_stories)
+        tags = get_feed_tags(
+            source,
+            [
+                article
+                for article in new_articles
+                if article.article_url_hash in story_ids
+            ],
+        )
+        if any(tags.values()):
+            company_services.tag_each(
+                Story.tagged_companies,
+                {
+                    story_ids[url_hash]: company_ids
+                    for url_hash, company_ids in tags.items()
+                    if url_hash in story_ids
+                },
+            )
+        if within:
+            link_duplicates_within_feed(company, new_stories, within, story_ids)
+        added = Story.objects.filter(id__in=story_ids.values())
+        facets.add(added)
+        alerts.percolate(added)
+        response_cache.invalidate(company.id, response_cache.STORIES)
+        return len(story_ids)
+
+    return 0
+
+
+def get_feed_tags(source, articles):
+    """
+    Return ``{url hash: company ids}`` to tag the stories of new ``articles`` with.
+
+    Depending on ``settings.STORY_TAGGING``, these are the companies each article's
+    title or body mentions (see company.mentions), the source's tagged companies,
+    or both.
+    """
+    tagging = mentions.get_tagging()
+    source_tags = set()
+    if tagging in (mentions.SOURCE, mentions.BOTH):
+        source_tags = set(source.tagged_companies.values_list("id", flat=True))
+    if tagging == mentions.SOURCE:
+        return {article.article_url_hash: source_tags for article in articles}
+    matcher = mentions.get_matcher()
+    return {
+        article.article_url_hash: source_tags
+        | matcher.find(article.title, article.body_text)
+        for article in articles
+    }
+
+
+def link_duplicates_within_feed(company, stories, within, story_ids):
+    """
+    Point stories saved as near duplicates of an entry at that entry's row.
+
+    Args:
+        story_ids (dict[int, int]): Ids of the stories inserted, by URL hash. An
+            original stored by another import is looked up; a duplicate stored by
+            another import is left as it is.
+    """
+    pairs = [
+        (stories[original_index].article_url_hash, stories[index].article_url_hash)
+        for index, original_index in within.items()
+        if stories[index].article_url_hash in story_ids
+    ]
+    original_ids = dict(story_ids)
+    missing = {original for original, _ in pairs} - original_ids.keys()
+    if missing:
+        original_ids.update(
+            Story.objects.filter(
+                company=company,
+                article_url_hash__in=missing,
+            ).values_list("article_url_hash", "id"),
+        )
+    duplicates = defaultdict(list)
+    for original, duplicate in pairs:
+        duplicates[original_ids[original]].append(story_ids[duplicate])
+    for original_id, duplicate_ids in duplicates.items():
+        Story.objects.filter(id__in=duplicate_ids).update(duplicate_of_id=original_id)
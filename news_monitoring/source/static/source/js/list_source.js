@@ -1,9 +1,14 @@
 $(document).ready(function () {
-    fetchSources(1);
+    fetchSources();
 
     // Re-fetch sources when search input changes
     $("#search-source").on("input", function () {
-        fetchSources(1);
+        fetchSources();
+    });
+
+    $(document).on("click", ".pagination-link", function (e) {
+        e.preventDefault();
+        fetchSources($(this).attr("data-cursor"));  // Cursor of the page to show
     });
 
     // Attach event handler for fetching stories
@@ -29,10 +34,10 @@ $(document).ready(function () {
     });
 });
 
-function fetchSources(page=1) {
+function fetchSources(cursor = "") {
         $.ajax({
             url: sourceListUrl,
-            data: {q: $("#search-source").val().trim()},
+            data: {q: $("#search-source").val().trim(), cursor: cursor},
             dataType: "json",
             success: function (response) {
                 let sourceTableBody = $("#source-table tbody");
@@ -40,6 +45,7 @@ function fetchSources(page=1) {
 
                 if (!response.sources || response.sources.length === 0) {
                     sourceTableBody.append("<tr><td colspan='4'>No results found.</td></tr>");
+                    updatePagination(response);
                     return;
                 }
 
@@ -82,7 +88,8 @@ function fetchStories() {
             method: "POST",
             headers: { "X-CSRFToken": csrfToken },
             success: function (response) {
-                $("#fetch-message").text(response.message).show().delay(3000).fadeOut();
+                $("#fetch-message").text(response.message).show();
+                pollFetchStatus(response.status_url);
             },
             error: function (xhr) {
                 console.error("Error fetching story:", xhr.responseText);
@@ -90,3 +97,24 @@ function fetchStories() {
             }
         });
     }
+
+function pollFetchStatus(statusUrl) {
+        $.ajax({
+            url: statusUrl,
+            dataType: "json",
+            success: function (job) {
+                if (job.status === "queued" || job.status === "running") {
+                    setTimeout(function () { pollFetchStatus(statusUrl); }, 1000);
+                    return;
+                }
+
+                let message = job.status === "done"
+                    ? `${job.new_stories} new stories fetched.`
+                    : `Failed to fetch stories: ${job.error}`;
+                $("#fetch-message").text(message).show().delay(3000).fadeOut();
+            },
+            error: function (xhr) {
+                console.error("Error checking fetch status:", xhr.responseText);
+            }
+        });
+    }
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+MARKETS_ENTRIES = 3  # Items in fixtures/markets.xml
+TECH_ENTRIES = 2  # Entries in fixtures/tech.atom
+
+
+def make_feed(count, prefix="https://wire.example.com/articles"):
+    """Build an RSS document with ``count`` entries, newest first."""
+    items = "".join(
+        f"<item><title>Wire story {i}</title><link>{prefix}/{i}</link>"
+        f"<pubDate>Tue, 01 Apr 2025 {i % 24:02d}:00:00 GMT</pubDate>"
+        f"<description>Body of wire story {i}.</description></item>"
+        for i in range(count)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Wire</title>'
+        f"{items}</channel></rss>"
+    ).encode()
+
+
+class FeedServer(ThreadingHTTPServer):
+    """Local HTTP stand-in that serves the fixture feeds and records every request."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FeedRequestHandler)
+        self.delay = 0.0
+        self.requests = []
+        self.overrides = {}
+        self.validators = True
+        self.compress = False  # Gzip bodies for clients that accept it
+        self.lowercase_headers = False  # Send header names as some servers do
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server_port}/{name}"
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    server: FeedServer
+
+    def do_GET(self):  # noqa: N802
+        self.server.requests.append((self.path, dict(self.headers.items())))
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        name = self.path.lstrip("/")
+        if name in self.server.overrides:
+            body = self.server.overrides[name]
+        else:
+            path = FIXTURES_DIR / name
+            if not path.is_file():
+                self.send_error(404)
+                return
+            body = path.read_bytes()
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'  # noqa: S324
+        if self.server.validators and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml; charset=utf-8")
+        if self.server.validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Tue, 01 Apr 2025 10:00:00 GMT")
+        if self.server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_header(self, keyword, value):
+        if self.server.lowercase_headers:
+            keyword = keyword.lower()
+        super().send_header(keyword, value)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    server = FeedServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
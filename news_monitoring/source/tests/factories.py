@@ -0,0 +1,17 @@
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source.models import Source
+from news_monitoring.users.tests.factories import UserFactory
+
+
+class SourceFactory(DjangoModelFactory[Source]):
+    company = SubFactory(CompanyFactory)
+    added_by = SubFactory(UserFactory)
+    name = Sequence(lambda n: f"Source {n}")
+    url = Sequence(lambda n: f"https://feeds.example.com/{n}.xml")
+
+    class Meta:
+        model = Source
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from news_monitoring.source import cleaning
+from news_monitoring.source.management.commands.bench_summary_cleaning import CORPUS
+
+with CORPUS.open(encoding="utf-8") as corpus_file:
+    SUMMARIES = [item["summary"] for item in json.load(corpus_file)]
+
+
+@pytest.mark.parametrize("summary", SUMMARIES)
+def test_fast_paths_match_the_parser(summary):
+    assert cleaning.clean_summary(summary) == cleaning.clean_with_parser(summary)
+
+
+@pytest.mark.parametrize(
+    "summary",
+    ["Acme<!-- ad -->Corp", "<b>Acme</b><style>b {}</style>Corp", "a <!-- -->b"],
+)
+def test_comments_and_unsafe_elements_match_the_parser(summary):
+    assert cleaning.clean_simple_markup(summary) == cleaning.clean_with_parser(summary)
+
+
+@pytest.mark.parametrize(
+    ("summary", "expected"),
+    [
+        ("", ""),
+        ("  Rates\n held\t steady ", "Rates held steady"),
+        ("AT&amp;T&#8217;s&nbsp;plan", "AT&T’s plan"),  # noqa: RUF001
+        (
+            "<p>Shares <b>rose</b> 3%.</p><p>Bonds fell.</p>",
+            "Shares rose 3%. Bonds fell.",
+        ),
+        ("Line one<br/>line two", "Line one line two"),
+        (
+            "<p>Escaped &lt;b&gt;markup&lt;/b&gt; stays text</p>",
+            "Escaped <b>markup</b> stays text",
+        ),
+        ('<a href="https://example.com/?a=1&amp;b=2" title="a > b">Link</a>', "Link"),
+        (
+            "<p>News<script>if (a < b) { x(); }</script> today<!-- ad --></p>",
+            "News today",
+        ),
+        ("Moves of < 5% in <b>Acme</b>", "Moves of < 5% in Acme"),
+    ],
+)
+def test_clean_summary(summary, expected):
+    assert cleaning.clean_summary(summary) == expected
+
+
+def test_unsafe_markup_is_left_to_the_parser():
+    assert cleaning.clean_simple_markup("Moves of < 5% in <b>Acme</b>") is None
+    assert cleaning.clean_simple_markup("<p>Shares <b>rose</b></p>") == "Shares rose"
+
+
+def test_summary_cleaner_is_configurable(settings):
+    settings.SUMMARY_CLEANER = "news_monitoring.source.cleaning.clean_with_parser"
+    cleaning.get_summary_cleaner.cache_clear()
+    try:
+        assert cleaning.get_summary_cleaner() is cleaning.clean_with_parser
+    finally:
+        cleaning.get_summary_cleaner.cache_clear()
@@ -0,0 +1,678 @@
+import datetime
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from news_monitoring.company import mentions
+from news_monitoring.company.models import Company
+from news_monitoring.company.models import CompanyAlias
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source import feeds
+from news_monitoring.source import ingest
+from news_monitoring.source import services
+from news_monitoring.source.models import Source
+from news_monitoring.source.tests.conftest import FIXTURES_DIR
+from news_monitoring.source.tests.conftest import MARKETS_ENTRIES
+from news_monitoring.source.tests.conftest import TECH_ENTRIES
+from news_monitoring.source.tests.conftest import make_feed
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.test_fingerprints import OTHER_BODY
+from news_monitoring.story.tests.test_fingerprints import REWRITTEN_BODY
+from news_monitoring.story.tests.test_fingerprints import WIRE_BODY
+from news_monitoring.utils import commits
+
+pytestmark = pytest.mark.django_db
+
+
+def make_wire_feed(prefix, bodies):
+    items = "".join(
+        "<item><title>Copy "
+        f"{i}</title><link>{prefix}/{i}</link><description>{body}</description></item>"
+        for i, body in enumerate(bodies)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Wire</title>'
+        f"{items}</channel></rss>"
+    ).encode()
+
+
+def make_dated_feed(numbers):
+    """RSS of wire stories ``numbers`` in order, each published at its number's hour."""
+    items = "".join(
+        "<item><title>Wire story "
+        f"{i}</title><link>https://wire.example.com/articles/{i}</link><pubDate>Tue, "
+        f"01 Apr 2025 {i:02d}:00:00 GMT</pubDate></item>"
+        for i in numbers
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Wire</title>'
+        f"{items}</channel></rss>"
+    ).encode()
+
+
+class TestIngestSources:
+    def test_new_stories_are_saved_per_source(self, feed_server, settings):
+        settings.STORY_TAGGING = mentions.SOURCE
+        tagged = CompanyFactory()
+        markets = SourceFactory(url=feed_server.url("markets.xml"))
+        markets.tagged_companies.set([tagged])
+        tech = SourceFactory(url=feed_server.url("tech.atom"))
+
+        reports = ingest.ingest_sources([markets, tech])
+
+        by_source = {report.source_id: report for report in reports}
+        assert by_source[markets.id].entries == MARKETS_ENTRIES
+        assert by_source[markets.id].new_stories == MARKETS_ENTRIES
+        assert by_source[tech.id].new_stories == TECH_ENTRIES
+        assert not any(report.error for report in reports)
+        assert (
+            Story.objects.filter(source=markets, company=markets.company).count()
+            == MARKETS_ENTRIES
+        )
+        assert (
+            Story.objects.filter(source=tech, company=tech.company).count()
+            == TECH_ENTRIES
+        )
+        story = Story.objects.get(
+            article__article_url="https://markets.example.com/articles/stocks-rally",
+        )
+        assert (
+            story.article.body_text
+            == "Equities climbed on Tuesday after softer inflation data."
+        )
+        assert story.article.excerpt == story.article.body_text
+        assert list(story.tagged_companies.all()) == [tagged]
+
+    def test_second_run_adds_nothing(self, feed_server):
+        feed_server.validators = False
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+
+        ingest.ingest_sources([source])
+        [report] = ingest.ingest_sources([source])
+
+        assert report.entries == MARKETS_ENTRIES
+        assert report.new_stories == 0
+        assert Story.objects.count() == MARKETS_ENTRIES
+
+    def test_downloads_run_concurrently(self, feed_server):
+        delay, count = 0.3, 4
+        feed_server.delay = delay
+        for i in range(count):
+            feed_server.overrides[f"wire-{i}.xml"] = make_feed(
+                3,
+                prefix=f"https://wire.example.com/{i}",
+            )
+        sources = [
+            SourceFactory(url=feed_server.url(f"wire-{i}.xml")) for i in range(count)
+        ]
+
+        started = time.perf_counter()
+        reports = ingest.ingest_sources(sources, workers=count)
+        elapsed = time.perf_counter() - started
+
+        assert len(reports) == count
+        assert all(report.fetch_seconds >= delay for report in reports)
+        assert elapsed < count * delay
+
+    def test_failures_are_reported_not_raised(self, feed_server):
+        missing = SourceFactory(url=feed_server.url("missing.xml"))
+        unreachable = SourceFactory(url="http://127.0.0.1:9/feed.xml")
+
+        reports = ingest.ingest_sources([missing, unreachable], timeout=2)
+
+        by_source = {report.source_id: report for report in reports}
+        assert by_source[missing.id].status == HTTPStatus.NOT_FOUND
+        assert by_source[missing.id].error == "HTTP 404"
+        assert by_source[unreachable.id].error
+        assert Story.objects.count() == 0
+
+    def test_stories_need_a_user(self, feed_server):
+        source = SourceFactory(url=feed_server.url("markets.xml"), added_by=None)
+
+        [report] = ingest.ingest_sources([source])
+
+        assert report.error == "No user to attribute the stories to"
+        assert Story.objects.count() == 0
+
+
+class TestIngestFeedsCommand:
+    def test_reports_timings_per_source(self, feed_server):
+        markets = SourceFactory(url=feed_server.url("markets.xml"))
+        SourceFactory(url=feed_server.url("tech.atom"))
+        out = StringIO()
+
+        call_command("ingest_feeds", "--source", str(markets.id), stdout=out)
+
+        output = out.getvalue()
+        assert f"[{markets.id}] {markets.name}: 3 entries, 3 new | fetch " in output
+        assert "1 sources, 1 downloads, 3 new stories" in output
+        assert len(feed_server.requests) == 1
+
+
+class TestSharedFeeds:
+    def test_feed_is_fetched_and_parsed_once_for_every_follower(
+        self,
+        feed_server,
+        monkeypatch,
+    ):
+        parses = []
+        parse = services.feedparser.parse
+
+        def counting_parse(*args, **kwargs):
+            parses.append(1)
+            return parse(*args, **kwargs)
+
+        monkeypatch.setattr(services.feedparser, "parse", counting_parse)
+        first = SourceFactory(url=feed_server.url("markets.xml"))
+        followers = [first] + [
+            SourceFactory(url=feed_server.url("markets.xml/")) for _ in range(3)
+        ]
+
+        reports = ingest.ingest_sources(followers)
+
+        assert len(feed_server.requests) == 1
+        assert len(parses) == 1
+        assert [report.new_stories for report in reports] == [3, 3, 3, 3]
+        assert [report.shared_fetch for report in reports] == [False, True, True, True]
+        assert sum(report.fetched_bytes for report in reports) == len(
+            (FIXTURES_DIR / "markets.xml").read_bytes(),
+        )
+        for source in followers:
+            assert (
+                Story.objects.filter(company=source.company, source=source).count()
+                == MARKETS_ENTRIES
+            )
+        assert (
+            Article.objects.count() == MARKETS_ENTRIES
+        )  # Stored once, linked by every follower
+
+    def test_not_modified_is_shared(self, feed_server):
+        sources = SourceFactory.create_batch(3, url=feed_server.url("markets.xml"))
+        ingest.ingest_sources(sources)
+        sources = list(Source.objects.filter(id__in=[source.id for source in sources]))
+
+        reports = ingest.ingest_sources(sources)
+
+        _, (_, headers) = feed_server.requests  # One download per run
+        assert "If-None-Match" in headers
+        assert all(report.not_modified for report in reports)
+        assert set(Source.objects.values_list("not_modified_count", flat=True)) == {1}
+
+    def test_validators_are_only_sent_when_all_followers_agree(self, feed_server):
+        sources = SourceFactory.create_batch(2, url=feed_server.url("markets.xml"))
+        ingest.ingest_sources(sources[:1])
+        sources = list(
+            Source.objects.filter(id__in=[source.id for source in sources]).order_by(
+                "id",
+            ),
+        )
+
+        reports = ingest.ingest_sources(sources)
+
+        assert "If-None-Match" not in feed_server.requests[1][1]
+        assert [report.new_stories for report in reports] == [0, 3]
+        assert len(set(Source.objects.values_list("etag", flat=True))) == 1
+
+    def test_one_follower_failing_does_not_block_the_others(
+        self,
+        feed_server,
+        monkeypatch,
+    ):
+        sources = SourceFactory.create_batch(2, url=feed_server.url("markets.xml"))
+        save = services.save_feed_entries
+
+        def fail_first(source, *args):
+            if source.id == sources[0].id:
+                msg = "boom"
+                raise RuntimeError(msg)
+            return save(source, *args)
+
+        monkeypatch.setattr(services, "save_feed_entries", fail_first)
+
+        reports = ingest.ingest_sources(sources)
+
+        assert [report.error for report in reports] == [
+            "Error saving stories: boom",
+            "",
+        ]
+        assert (
+            Story.objects.filter(company=sources[1].company).count() == MARKETS_ENTRIES
+        )
+
+
+class TestConditionalGet:
+    def test_validators_are_stored_and_sent(self, feed_server):
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+        ingest.ingest_sources([source])
+
+        assert source.etag.startswith('"')
+        assert source.last_modified == "Tue, 01 Apr 2025 10:00:00 GMT"
+        assert source.feed_size == len((FIXTURES_DIR / "markets.xml").read_bytes())
+        first_headers, second_headers = (headers for _, headers in feed_server.requests)
+        assert "If-None-Match" not in first_headers
+        assert second_headers["If-None-Match"] == source.etag
+        assert second_headers["If-Modified-Since"] == source.last_modified
+
+    def test_header_names_are_matched_in_any_case(self, feed_server):
+        feed_server.compress = True
+        feed_server.lowercase_headers = True
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+
+        [first] = ingest.ingest_sources([source])
+        source.refresh_from_db()
+        [second] = ingest.ingest_sources([source])
+
+        assert first.entries == MARKETS_ENTRIES  # The gzipped body was decoded
+        assert source.etag.startswith('"')
+        assert source.last_modified == "Tue, 01 Apr 2025 10:00:00 GMT"
+        assert second.not_modified
+
+    def test_not_modified_skips_parsing_and_counts_savings(
+        self,
+        feed_server,
+        monkeypatch,
+    ):
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError
+
+        monkeypatch.setattr(services.feedparser, "parse", fail_parse)
+        [report] = ingest.ingest_sources([source])
+
+        assert report.not_modified
+        assert report.status == HTTPStatus.NOT_MODIFIED
+        assert report.fetched_bytes == 0
+        assert report.bytes_saved == source.feed_size
+        assert not report.error
+        source.refresh_from_db()
+        assert source.not_modified_count == 1
+        assert source.bytes_saved == source.feed_size
+
+    def test_changed_feed_is_downloaded_again(self, feed_server):
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+
+        feed_server.overrides["markets.xml"] = (
+            (FIXTURES_DIR / "markets.xml")
+            .read_bytes()
+            .replace(
+                b"Central bank holds rates",
+                b"Central bank cuts rates",
+            )
+        )
+        [report] = ingest.ingest_sources([source])
+
+        assert not report.not_modified
+        assert report.entries == MARKETS_ENTRIES
+
+    def test_failed_import_keeps_old_validators(self, feed_server, monkeypatch):
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+
+        def fail_save(*args, **kwargs):
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        monkeypatch.setattr(services, "save_feed_entries", fail_save)
+        [report] = ingest.ingest_sources([source])
+
+        assert report.error == "Error saving stories: boom"
+        source.refresh_from_db()
+        assert source.etag == ""
+
+
+class TestWatermarks:
+    def test_stable_feed_does_no_story_work(
+        self,
+        feed_server,
+        django_assert_num_queries,
+    ):
+        feed_server.validators = False
+        feed_server.overrides["wire.xml"] = make_dated_feed([2, 1, 0])
+        source = SourceFactory(url=feed_server.url("wire.xml"))
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+        result = feeds.fetch_feed(source.url)
+        user, company = source.added_by, source.company
+
+        # Savepoint and its release: no lookup, no insert, no source update
+        with django_assert_num_queries(2):
+            report = services.import_fetch_result(source, result, user, company)
+
+        assert (report.entries, report.skipped_entries, report.new_stories) == (3, 3, 0)
+
+    def test_only_entries_above_the_watermark_are_prepared(
+        self,
+        feed_server,
+        monkeypatch,
+    ):
+        feed_server.overrides["wire.xml"] = make_dated_feed([2, 1, 0])
+        source = SourceFactory(url=feed_server.url("wire.xml"))
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+        prepared = []
+        iter_prepared = services.iter_prepared_entries
+
+        def record_prepared(entries):
+            prepared.extend(entries)
+            return iter_prepared(entries)
+
+        monkeypatch.setattr(services, "iter_prepared_entries", record_prepared)
+
+        numbers = [4, 3, 2, 1, 0]
+        feed_server.overrides["wire.xml"] = make_dated_feed(numbers)
+        [report] = ingest.ingest_sources([source])
+
+        assert (report.skipped_entries, report.new_stories) == (3, 2)
+        assert [entry.link for entry in prepared] == [
+            f"https://wire.example.com/articles/{i}" for i in (4, 3)
+        ]
+        source.refresh_from_db()
+        assert len(source.watermark_keys) == len(numbers)
+        assert source.watermark_published.hour == max(numbers)
+
+    def test_reordered_feed_is_read_in_full(self, feed_server):
+        feed_server.overrides["wire.xml"] = make_dated_feed([3, 1, 0])
+        source = SourceFactory(url=feed_server.url("wire.xml"))
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+
+        # Story 2 was published late, below stories the source already has
+        numbers = [3, 2, 1, 0]
+        feed_server.overrides["wire.xml"] = make_dated_feed(numbers)
+        [report] = ingest.ingest_sources([source])
+
+        assert (report.skipped_entries, report.new_stories) == (0, 1)
+        assert Story.objects.filter(source=source).count() == len(numbers)
+
+    def test_moving_a_source_resets_its_watermark(self, feed_server):
+        feed_server.overrides["wire.xml"] = make_dated_feed([2, 1, 0])
+        source = SourceFactory(url=feed_server.url("wire.xml"))
+        ingest.ingest_sources([source])
+        source.refresh_from_db()
+        company = CompanyFactory()
+
+        services.update_or_create_source(
+            source,
+            source.added_by,
+            source.name,
+            source.url,
+            company,
+            [],
+        )
+        [report] = ingest.ingest_sources([source])
+
+        assert (report.skipped_entries, report.new_stories) == (0, 3)
+        assert Story.objects.filter(company=company).count() == report.new_stories
+
+    def test_command_reports_skipped_entries(self, feed_server):
+        feed_server.validators = False
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+        ingest.ingest_sources([source])
+        out = StringIO()
+
+        call_command("ingest_feeds", "--source", str(source.id), stdout=out)
+
+        assert (
+            f"[{source.id}] {source.name}: 3 entries (3 below the watermark), 0 new | "
+            in out.getvalue()
+        )
+
+
+class TestDeduplication:
+    def test_links_are_resolved_in_one_query_per_feed(
+        self,
+        feed_server,
+        django_assert_num_queries,
+    ):
+        feed_server.validators = False
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+        ingest.ingest_sources([source])
+        result = feeds.fetch_feed(source.url)
+        source.watermark_keys = []  # Read the feed in full
+
+        # Savepoint, link lookup, validators update, savepoint release: no query per
+        # entry, and the seen filter was caught up by the import above.
+        with django_assert_num_queries(4):
+            report = services.import_fetch_result(
+                source,
+                result,
+                source.added_by,
+                source.company,
+            )
+
+        assert report.new_stories == 0
+
+    def test_dedup_is_scoped_to_the_company(self, feed_server):
+        feed_server.validators = False
+        first = SourceFactory(url=feed_server.url("markets.xml"))
+        second = SourceFactory(url=feed_server.url("markets.xml"))
+
+        ingest.ingest_sources([first])
+        [report] = ingest.ingest_sources([second])
+
+        assert report.new_stories == MARKETS_ENTRIES
+        assert Story.objects.filter(company=second.company).count() == MARKETS_ENTRIES
+
+    def test_repeated_links_in_a_feed_are_saved_once(self, feed_server):
+        body = (FIXTURES_DIR / "markets.xml").read_bytes()
+        feed_server.overrides["markets.xml"] = body.replace(
+            b"https://markets.example.com/articles/oil-slips",
+            b"https://markets.example.com/articles/stocks-rally",
+        )
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+
+        [report] = ingest.ingest_sources([source])
+
+        assert report.new_stories == MARKETS_ENTRIES - 1
+        assert Story.objects.count() == MARKETS_ENTRIES - 1
+
+    def test_links_are_deduplicated_on_their_canonical_form(self, feed_server):
+        body = (FIXTURES_DIR / "markets.xml").read_bytes()
+        feed_server.overrides["markets.xml"] = body.replace(
+            b"https://markets.example.com/articles/oil-slips",
+            b"http://www.markets.example.com/articles/stocks-rally/?utm_source=rss",
+        )
+        source = SourceFactory(url=feed_server.url("markets.xml"))
+
+        [report] = ingest.ingest_sources([source])
+
+        assert report.new_stories == MARKETS_ENTRIES - 1
+        assert set(Story.objects.values_list("article__article_url", flat=True)) == {
+            "https://markets.example.com/articles/stocks-rally",
+            "https://markets.example.com/articles/rates-hold",
+        }
+
+    @pytest.mark.parametrize("action", ["link", "skip"])
+    def test_near_duplicate_wire_copies(self, action, feed_server, settings):
+        settings.NEAR_DUPLICATE_ACTION = action
+        feed_server.overrides["agency.xml"] = make_wire_feed(
+            "https://agency.example.com",
+            [WIRE_BODY, OTHER_BODY],
+        )
+        copy_bodies = [REWRITTEN_BODY, REWRITTEN_BODY.replace("Thursday", "Thursday,")]
+        feed_server.overrides["paper.xml"] = make_wire_feed(
+            "https://paper.example.com",
+            copy_bodies,
+        )
+        agency = SourceFactory(url=feed_server.url("agency.xml"))
+        paper = SourceFactory(url=feed_server.url("paper.xml"), company=agency.company)
+
+        ingest.ingest_sources([agency])
+        [report] = ingest.ingest_sources([paper])
+
+        original = Story.objects.get(
+            article__article_url="https://agency.example.com/0",
+        )
+        copies = Story.objects.filter(source=paper)
+        if action == "link":
+            assert report.new_stories == len(copy_bodies)
+            assert {story.duplicate_of_id for story in copies} == {original.id}
+        else:
+            assert report.new_stories == 0
+            assert not copies.exists()
+
+    def test_near_duplicates_within_a_feed_are_linked(self, feed_server):
+        bodies = [WIRE_BODY, REWRITTEN_BODY]
+        feed_server.overrides["paper.xml"] = make_wire_feed(
+            "https://paper.example.com",
+            bodies,
+        )
+        source = SourceFactory(url=feed_server.url("paper.xml"))
+
+        [report] = ingest.ingest_sources([source])
+
+        assert report.new_stories == len(bodies)
+        original = Story.objects.get(article__article_url="https://paper.example.com/0")
+        assert original.duplicate_of_id is None
+        assert (
+            Story.objects.get(
+                article__article_url="https://paper.example.com/1",
+            ).duplicate_of_id
+            == original.id
+        )
+
+    def test_benchmark_reports_query_counts(self):
+        out = StringIO()
+
+        call_command("bench_feed_dedup", "--sizes", "10", "--repeat", "1", stdout=out)
+
+        entries, _, legacy_queries, _, _, batched_queries, _ = (
+            out.getvalue().splitlines()[1].split()
+        )
+        assert (entries, legacy_queries, batched_queries) == ("10", "10", "1")
+
+
+class TestTagging:
+    @pytest.mark.parametrize("entries", [3, 30])
+    def test_tagging_cost_does_not_grow_with_the_batch(
+        self,
+        entries,
+        feed_server,
+        django_assert_num_queries,
+        settings,
+    ):
+        settings.STORY_TAGGING = mentions.SOURCE
+        feed_server.overrides["wire.xml"] = make_feed(entries)
+        source = SourceFactory(url=feed_server.url("wire.xml"))
+        source.tagged_companies.set(CompanyFactory.create_batch(2))
+        result = feeds.fetch_feed(source.url)
+
+        # Savepoint, dedup (seen filter horizon and build), canonical articles
+        # (lookup, insert, lookup of the inserted), story insert, source tags,
+        # through insert, three facet counts, saved searches, validators, release.
+        with django_assert_num_queries(15):
+            report = services.import_fetch_result(
+                source,
+                result,
+                source.added_by,
+                source.company,
+            )
+
+        assert report.new_stories == entries
+        assert Story.tagged_companies.through.objects.count() == entries * 2
+
+    @pytest.mark.parametrize("entries", [3, 30])
+    def test_mentions_are_found_without_a_query_per_story(
+        self,
+        entries,
+        feed_server,
+        django_assert_num_queries,
+        settings,
+        monkeypatch,
+    ):
+        settings.STORY_TAGGING = mentions.MENTIONS
+        # The new company counts as settled, so the refresh below only checks
+        monkeypatch.setattr(commits, "SETTLE", datetime.timedelta(0))
+        feed_server.overrides["wire.xml"] = make_feed(entries)
+        source = SourceFactory(url=feed_server.url("wire.xml"))
+        wire = CompanyFactory(name="Wire", domain="https://wire.example.com")
+        mentions.get_matcher()  # Built once per process, then only refreshed
+        result = feeds.fetch_feed(source.url)
+
+        # Savepoint, dedup (seen filter horizon and build), canonical articles
+        # (lookup, insert, lookup of the inserted), story insert, matcher refresh,
+        # through insert, three facet counts, saved searches, validators, release.
+        with django_assert_num_queries(15):
+            services.import_fetch_result(
+                source,
+                result,
+                source.added_by,
+                source.company,
+            )
+
+        assert set(
+            Story.tagged_companies.through.objects.values_list("company_id", flat=True),
+        ) == {wire.id}
+        assert Story.tagged_companies.through.objects.count() == entries
+
+
+class TestGetFeedTags:
+    @pytest.fixture
+    def source(self):
+        source = SourceFactory()
+        source.tagged_companies.set([CompanyFactory(name="Tagged")])
+        return source
+
+    @pytest.fixture
+    def companies(self):
+        acme = CompanyFactory(name="Acme Corp", domain="https://www.acme.com")
+        CompanyAlias.objects.create(company=acme, alias="ACME")
+        return {"acme": acme, "globex": CompanyFactory(name="Globex")}
+
+    def article(self, title, body_text=""):
+        return Article(title=title, body_text=body_text, article_url_hash=hash(title))
+
+    @pytest.mark.parametrize(
+        ("tagging", "expected"),
+        [
+            (mentions.MENTIONS, {"acme"}),
+            (mentions.SOURCE, {"tagged"}),
+            (mentions.BOTH, {"acme", "tagged"}),
+        ],
+    )
+    def test_tagging_setting(self, settings, source, companies, tagging, expected):
+        settings.STORY_TAGGING = tagging
+        article = self.article("Acme Corp beats forecasts")
+        names = {
+            company.id: company.name.split()[0].lower()
+            for company in Company.objects.all()
+        }
+
+        tags = services.get_feed_tags(source, [article])
+
+        assert {
+            names[company_id] for company_id in tags[article.article_url_hash]
+        } == expected
+
+    def test_names_domains_and_aliases_at_word_boundaries(
+        self,
+        settings,
+        source,
+        companies,
+    ):
+        settings.STORY_TAGGING = mentions.MENTIONS
+        articles = [
+            self.article("ACME shares rally"),
+            self.article("Markets", "More at www.acme.com/investors, said   GLOBEX."),
+            self.article("Acmeville floods", "Globexian rivals."),
+        ]
+
+        tags = services.get_feed_tags(source, articles)
+
+        assert [tags[article.article_url_hash] for article in articles] == [
+            {companies["acme"].id},
+            {companies["acme"].id, companies["globex"].id},
+            set(),
+        ]
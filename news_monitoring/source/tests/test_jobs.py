@@ -0,0 +1,108 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from news_monitoring.source import jobs
+from news_monitoring.source.tests.conftest import MARKETS_ENTRIES
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story.models import Story
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def source(feed_server):
+    return SourceFactory(url=feed_server.url("markets.xml"))
+
+
+@pytest.fixture
+def owner_client(client, source):
+    source.added_by.company = source.company
+    source.added_by.save()
+    client.force_login(source.added_by)
+    return client
+
+
+class TestFetchStoriesView:
+    def test_post_enqueues_a_job(self, owner_client, source):
+        response = owner_client.post(
+            reverse("source:fetch-story", kwargs={"source_id": source.id}),
+        )
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        data = response.json()
+        assert data["status_url"] == reverse(
+            "source:fetch-status",
+            kwargs={"job_id": data["job_id"]},
+        )
+
+    def test_status_reports_new_stories(self, owner_client, source):
+        response = owner_client.post(
+            reverse("source:fetch-story", kwargs={"source_id": source.id}),
+        )
+
+        job = owner_client.get(response.json()["status_url"]).json()
+
+        assert job["status"] == jobs.DONE
+        assert job["progress"] == 1.0
+        assert job["new_stories"] == MARKETS_ENTRIES
+        assert job["source_id"] == source.id
+        assert (
+            Story.objects.filter(source=source, company=source.company).count()
+            == MARKETS_ENTRIES
+        )
+
+    def test_failed_fetch_is_reported(self, owner_client, source, feed_server):
+        source.url = feed_server.url("missing.xml")
+        source.save()
+
+        response = owner_client.post(
+            reverse("source:fetch-story", kwargs={"source_id": source.id}),
+        )
+        job = owner_client.get(response.json()["status_url"]).json()
+
+        assert job["status"] == jobs.FAILED
+        assert job["error"] == "HTTP 404"
+
+    def test_sources_of_other_companies_are_not_found(self, owner_client):
+        other = SourceFactory()
+
+        response = owner_client.post(
+            reverse("source:fetch-story", kwargs={"source_id": other.id}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_get_is_rejected(self, owner_client, source):
+        response = owner_client.get(
+            reverse("source:fetch-story", kwargs={"source_id": source.id}),
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_jobs_of_other_users_are_not_found(self, owner_client, source, client):
+        job_id = jobs.enqueue_fetch(source, SourceFactory().added_by)
+
+        response = owner_client.get(
+            reverse("source:fetch-status", kwargs={"job_id": job_id}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+def test_local_queue_runs_jobs_in_the_background(source):
+    queue = jobs.LocalJobQueue(workers=1)
+
+    job_id = queue.enqueue(source.id, source.added_by.id)
+    deadline = time.monotonic() + 10
+    while (
+        queue.get(job_id)["status"] in (jobs.QUEUED, jobs.RUNNING)
+        and time.monotonic() < deadline
+    ):
+        time.sleep(0.05)
+
+    assert queue.get(job_id)["status"] == jobs.DONE
+    assert queue.get(job_id)["new_stories"] == MARKETS_ENTRIES
@@ -0,0 +1,272 @@
+import datetime
+import random
+from collections import Counter
+from collections import defaultdict
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from news_monitoring.source import scheduler
+from news_monitoring.source.feeds import SourceReport
+from news_monitoring.source.models import Source
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+
+pytestmark = pytest.mark.django_db
+
+START = datetime.datetime(2025, 4, 1, tzinfo=datetime.UTC)
+
+
+class SimulatedClock:
+    """Clock whose time only moves when the scheduler sleeps or the test advances it."""
+
+    def __init__(self, start=START):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += datetime.timedelta(seconds=max(seconds, 1))
+
+
+class NoJitter(random.Random):
+    """Random source that leaves every poll time unjittered."""
+
+    def uniform(self, a, b):
+        return 1.0
+
+
+class SimulatedFeeds:
+    """
+    Stand-in for ``ingest_sources`` importing what each source published.
+
+    Every source publishes a story each ``period`` seconds, and a poll imports
+    whatever was published since the previous poll.
+    """
+
+    def __init__(self, clock, periods):
+        self.clock = clock
+        self.periods = periods
+        self.last_poll = {}
+        self.fetches: Counter[int] = Counter()
+        self.delays = defaultdict(list)
+
+    def published_between(self, source_id, since, until):
+        period = datetime.timedelta(seconds=self.periods[source_id])
+        published = START + period * ((since - START) // period + 1)
+        while published <= until:
+            yield published
+            published += period
+
+    def __call__(self, sources, workers=None):
+        now = self.clock.now()
+        reports = []
+        for source in sources:
+            published = list(
+                self.published_between(
+                    source.id,
+                    self.last_poll.get(source.id, START),
+                    now,
+                ),
+            )
+            self.last_poll[source.id] = now
+            self.fetches[source.id] += 1
+            self.delays[source.id].extend(
+                (now - moment).total_seconds() for moment in published
+            )
+            articles = Article.objects.bulk_create(
+                Article(
+                    title=f"{source.name} {moment}",
+                    body_text="",
+                    article_url=f"{source.url}/{moment.isoformat()}",
+                    article_url_hash=url_hash(f"{source.url}/{moment.isoformat()}"),
+                    published_date=moment.date(),
+                )
+                for moment in published
+            )
+            Story.objects.bulk_create(
+                Story(
+                    article=article,
+                    article_url_hash=article.article_url_hash,
+                    published_date=article.published_date,
+                    company=source.company,
+                    source=source,
+                    added_by=source.added_by,
+                )
+                for article in articles
+            )
+            reports.append(
+                SourceReport(
+                    source_id=source.id,
+                    name=source.name,
+                    url=source.url,
+                    status=200,
+                    new_stories=len(published),
+                ),
+            )
+        return reports
+
+
+def report(new_stories=0, error=""):
+    return SourceReport(
+        source_id=1,
+        name="",
+        url="",
+        new_stories=new_stories,
+        error=error,
+    )
+
+
+class TestNextInterval:
+    def test_quiet_sources_back_off(self):
+        assert scheduler.next_interval(1000, report()) == 1000 * scheduler.BACKOFF
+
+    def test_busy_sources_are_polled_sooner(self):
+        new_stories = 3
+
+        assert (
+            scheduler.next_interval(3000, report(new_stories=new_stories))
+            == 3000 / new_stories
+        )
+
+    def test_interval_is_pulled_towards_the_publish_cadence(self):
+        interval = scheduler.next_interval(3000, report(new_stories=1), cadence=1000)
+
+        assert interval == (3000 + 1000) / 2
+
+    def test_interval_is_clamped(self):
+        assert (
+            scheduler.next_interval(10, report(new_stories=5)) == scheduler.MIN_INTERVAL
+        )
+        assert scheduler.next_interval(10**6, report()) == scheduler.MAX_INTERVAL
+
+
+class TestFailureDelay:
+    def test_errors_back_off_exponentially(self):
+        assert scheduler.failure_delay(600, 1) == 600 * 2
+        assert scheduler.failure_delay(600, 2) == 600 * 2**2
+
+    def test_error_backoff_is_capped(self):
+        failures = scheduler.MAX_FAILURE_BACKOFF.bit_length()
+
+        assert scheduler.failure_delay(600, failures) == (
+            600 * scheduler.MAX_FAILURE_BACKOFF
+        )
+
+
+class TestScheduler:
+    def test_only_due_sources_are_polled(self):
+        clock = SimulatedClock()
+        never_polled = SourceFactory()
+        due = SourceFactory(next_poll_at=START - datetime.timedelta(minutes=1))
+        SourceFactory(next_poll_at=START + datetime.timedelta(minutes=1))
+        feeds = SimulatedFeeds(clock, {never_polled.id: 600, due.id: 600})
+
+        scheduler.Scheduler(clock=clock, ingest_sources=feeds).run_once()
+
+        assert set(feeds.fetches) == {never_polled.id, due.id}
+
+    def test_consecutive_failures_double_the_delay_once_each(self):
+        interval, failures = 600, 3
+        source = SourceFactory(poll_interval=interval)
+        runner = scheduler.Scheduler(clock=SimulatedClock(), rng=NoJitter())
+
+        for _ in range(failures):
+            runner.reschedule(source, report(error="HTTP 500"))
+
+        source.refresh_from_db()
+        assert source.failure_count == failures
+        assert source.poll_interval == interval
+        assert source.next_poll_at == START + datetime.timedelta(
+            seconds=interval * 2**failures,
+        )
+
+    def test_first_success_after_failures_keeps_the_learned_interval(self):
+        source = SourceFactory(poll_interval=600)
+        runner = scheduler.Scheduler(clock=SimulatedClock(), rng=NoJitter())
+
+        succeeded = report(new_stories=1)
+
+        runner.reschedule(source, report(error="HTTP 500"))
+        runner.reschedule(source, report(error="HTTP 500"))
+        runner.reschedule(source, succeeded)
+
+        source.refresh_from_db()
+        assert source.failure_count == 0
+        assert source.poll_interval == scheduler.next_interval(600, succeeded)
+        assert source.next_poll_at == START + datetime.timedelta(
+            seconds=source.poll_interval,
+        )
+
+    def test_next_poll_is_jittered(self):
+        clock = SimulatedClock()
+        sources = SourceFactory.create_batch(20, poll_interval=1000)
+        feeds = SimulatedFeeds(clock, {source.id: 10**6 for source in sources})
+
+        scheduler.Scheduler(
+            clock=clock,
+            ingest_sources=feeds,
+            rng=random.Random(1),  # noqa: S311
+        ).run_once()
+
+        polled = Source.objects.filter(id__in=feeds.fetches)
+        offsets = {
+            (next_poll_at - START).total_seconds()
+            for next_poll_at in polled.values_list("next_poll_at", flat=True)
+            if next_poll_at
+        }
+        assert len(offsets) == len(sources)
+        assert all(1500 * 0.9 <= offset <= 1500 * 1.1 for offset in offsets)
+
+    def test_adaptive_polling_keeps_freshness_with_fewer_fetches(self):
+        """
+        Two weeks of sources of different rates, against polling every 15 minutes.
+
+        Sources publish every 30 minutes, 3 hours, day and week. Freshness holds when
+        each story is picked up, on average, before its source publishes again.
+        """
+        clock = SimulatedClock()
+        periods = [30 * 60, 3 * 3600, 24 * 3600, 7 * 24 * 3600]
+        sources = SourceFactory.create_batch(len(periods), poll_interval=900)
+        feeds = SimulatedFeeds(
+            clock,
+            {
+                source.id: period
+                for source, period in zip(sources, periods, strict=True)
+            },
+        )
+        runner = scheduler.Scheduler(
+            clock=clock,
+            ingest_sources=feeds,
+            max_sleep=24 * 3600,
+            rng=random.Random(7),  # noqa: S311
+        )
+
+        end = START + datetime.timedelta(days=14)
+        while clock.now() < end:
+            runner.run(iterations=1)
+
+        for source, period in zip(sources, periods, strict=True):
+            delays = feeds.delays[source.id]
+            assert sum(delays) / len(delays) <= period
+        fixed_fetches = len(sources) * 14 * 24 * 4
+        assert sum(feeds.fetches.values()) < fixed_fetches / 4
+
+
+def test_command_polls_due_sources_once(feed_server):
+    source = SourceFactory(url=feed_server.url("markets.xml"))
+    out = StringIO()
+
+    call_command("run_scheduler", "--once", stdout=out)
+
+    source.refresh_from_db()
+    assert (
+        f"[{source.id}] {source.name}: 3 new | next poll in {source.poll_interval}s"
+        in out.getvalue()
+    )
+    assert source.last_polled_at <= timezone.now() < source.next_poll_at
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source import services
+from news_monitoring.source.tests.factories import SourceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_source_list_is_paginated_with_cursors(client, user):
+    user.company = CompanyFactory()
+    user.save()
+    client.force_login(user)
+    SourceFactory.create_batch(12, company=user.company)
+    SourceFactory()  # Another company's
+
+    first = client.get(reverse("source:fetch_sources")).json()
+    second = client.get(
+        reverse("source:fetch_sources"),
+        {"cursor": first["next_cursor"]},
+    ).json()
+
+    assert [len(first["sources"]), len(second["sources"])] == [10, 2]
+    assert (
+        first["sources"][0]["id"]
+        > first["sources"][-1]["id"]
+        > second["sources"][0]["id"]
+    )
+    assert (second["has_previous"], second["has_next"]) == (True, False)
+    assert (
+        client.get(reverse("source:fetch_sources"), {"cursor": "x"}).status_code
+        == HTTPStatus.BAD_REQUEST
+    )
+
+
+def test_source_search_is_ranked_and_scoped(client, user):
+    user.company = CompanyFactory()
+    user.save()
+    client.force_login(user)
+    for name in ["Reuters Business", "Reuters", "AP News"]:
+        SourceFactory(company=user.company, name=name)
+    SourceFactory(name="Reuters World")  # Another company's
+
+    results = client.get(
+        reverse("source:search_sources"),
+        {"q": "reuters", "limit": "5"},
+    ).json()
+
+    assert [source["name"] for source in results] == ["Reuters", "Reuters Business"]
+    assert client.get(reverse("source:search_sources")).json() == []
+
+
+def test_source_list_cache_is_retired_by_writes(
+    client,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    user.company = CompanyFactory()
+    user.save()
+    client.force_login(user)
+    source = SourceFactory(company=user.company, added_by=user, name="Wire")
+
+    assert [
+        s["name"] for s in client.get(reverse("source:fetch_sources")).json()["sources"]
+    ] == ["Wire"]
+    with django_capture_on_commit_callbacks(execute=True):
+        services.update_or_create_source(
+            source,
+            user,
+            "Wire desk",
+            source.url,
+            user.company,
+            [],
+        )
+    assert [
+        s["name"] for s in client.get(reverse("source:fetch_sources")).json()["sources"]
+    ] == ["Wire desk"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("source:delete", args=[source.id]))
+    assert client.get(reverse("source:fetch_sources")).json()["sources"] == []
+
+
+def test_moving_a_source_retires_both_companies_lists(
+    client,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    user.company = CompanyFactory()
+    user.save()
+    client.force_login(user)
+    source = SourceFactory(company=user.company, added_by=user, name="Wire")
+    other_company = CompanyFactory()
+    assert client.get(reverse("source:fetch_sources")).json()["sources"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        services.update_or_create_source(
+            source,
+            user,
+            source.name,
+            source.url,
+            other_company,
+            [],
+        )
+
+    assert client.get(reverse("source:fetch_sources")).json()["sources"] == []
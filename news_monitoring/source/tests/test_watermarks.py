@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from news_monitoring.source import watermarks
+from news_monitoring.source.models import Source
+
+
+def entry(i, hour=None):
+    """A parsed feed entry published on 1 April 2025 at ``hour``, or at hour ``i``."""
+    return {
+        "id": f"https://wire.example.com/{i}",
+        "published_parsed": time.strptime(
+            f"2025-04-01 {i if hour is None else hour:02d}",
+            "%Y-%m-%d %H",
+        ),
+    }
+
+
+def watermarked(*entries):
+    source = Source()
+    watermarks.advance(source, list(entries))
+    return source
+
+
+class TestNewEntryCount:
+    def test_stops_at_the_first_seen_entry(self):
+        source = watermarked(entry(2), entry(1), entry(0))
+        new, seen = [entry(4), entry(3)], [entry(2), entry(1)]
+
+        assert watermarks.new_entry_count(source, new + seen) == len(new)
+        assert watermarks.new_entry_count(source, [entry(2), entry(1), entry(0)]) == 0
+
+    @pytest.mark.parametrize(
+        ("entries", "reason"),
+        [
+            ([entry(4), entry(3)], "no entry was seen"),
+            (
+                [entry(2), entry(3, hour=0), entry(1)],
+                "an unseen entry below a seen one",
+            ),
+            (
+                [entry(2), entry(1, hour=5)],
+                "a seen entry republished after the watermark",
+            ),
+        ],
+    )
+    def test_feeds_are_read_in_full(self, entries, reason):
+        source = watermarked(entry(2), entry(1), entry(0))
+
+        assert watermarks.new_entry_count(source, entries) == len(entries), reason
+
+    def test_sources_without_a_watermark_are_read_in_full(self):
+        entries = [entry(1), entry(0)]
+
+        assert watermarks.new_entry_count(Source(), entries) == len(entries)
+
+    def test_entries_without_an_id_are_keyed_on_their_link(self):
+        link_only = {"link": "https://wire.example.com/0"}
+
+        assert watermarks.entry_key(link_only) == watermarks.entry_key(entry(0))
+
+
+class TestAdvance:
+    def test_keeps_the_newest_time_and_reports_changes(self):
+        source = watermarked(entry(2), entry(1))
+
+        assert not watermarks.advance(source, [entry(2), entry(1)])
+        assert watermarks.advance(source, [entry(1)])
+        assert source.watermark_published == watermarks.entry_published(entry(2))
+        assert source.watermark_keys == [watermarks.entry_key(entry(1))]
+
+    def test_keys_are_capped(self):
+        source = watermarked(
+            *(entry(i, hour=0) for i in range(watermarks.WATERMARK_KEYS + 10)),
+        )
+
+        assert len(source.watermark_keys) == watermarks.WATERMARK_KEYS
@@ -9,5 +9,7 @@ urlpatterns = [
     path("edit/<int:source_id>/", views.add_or_edit_source, name="edit"),
     path("delete/<int:source_id>/", views.delete_source, name="delete"),
     path("fetch-story/<int:source_id>/", views.fetch_stories, name="fetch-story"),
+    path("fetch-status/<str:job_id>/", views.fetch_status, name="fetch-status"),
     path("fetch-sources/", views.fetch_sources, name="fetch_sources"),
+    path("search/", views.search_sources, name="search_sources"),
 ]
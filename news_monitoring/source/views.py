@@ -1,14 +1,15 @@
-from allauth.core.internal.httpkit import redirect
+from django import shortcuts
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django import shortcuts
 from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
+from django.urls import reverse
 
 from news_monitoring.company import models as company_model
+from news_monitoring.source import jobs
 from news_monitoring.source import models as source_model
 from news_monitoring.source import services
+from news_monitoring.utils import response_cache
+from news_monitoring.utils import trigram
 
 
 @login_required
@@ -30,8 +31,10 @@ def add_or_edit_source(request, source_id=None):
                     "error": "Name and URL are required!",
                     "source": source_obj,
                     "companies": companies,
-                    "tagged_companies": tagged_companies.values_list("id", flat=True) if tagged_companies else []
-                }
+                    "tagged_companies": tagged_companies.values_list("id", flat=True)
+                    if tagged_companies
+                    else [],
+                },
             )
         else:
             return shortcuts.redirect("source:list")
@@ -58,32 +61,84 @@ def list_sources(request):
 
 @login_required
 def fetch_sources(request):
-    search_query = request.GET.get('q', '').strip()
-    page_number = request.GET.get('page')
-    sources_qs = services.get_sources(request.user, search_query)
+    search_query = request.GET.get("q", "").strip()
+    cursor = request.GET.get("cursor", "").strip()
+
+    def build():
+        return services.get_sources_json(
+            services.get_sources(request.user, search_query),
+            cursor,
+        )
+
+    params = {"q": search_query, "cursor": cursor}
+    return response_cache.cached_json(
+        response_cache.SOURCES,
+        request.user,
+        params,
+        build,
+    )
 
-    return services.get_sources_json(sources_qs, page_number)
+
+@login_required
+def search_sources(request):
+    """Autocomplete: up to ``limit`` of the user's sources best matching ``q``."""
+    search_query = request.GET.get("q", "").strip()
+    limit = request.GET.get("limit", "")
+    if not search_query:
+        return JsonResponse([], safe=False)
+
+    limit = int(limit) if limit.isdigit() else trigram.SEARCH_LIMIT
+    return JsonResponse(
+        services.search_sources(request.user, search_query, limit),
+        safe=False,
+    )
 
 
 @login_required
 def delete_source(request, source_id):
-    source = shortcuts.get_object_or_404(source_model.Source, id=source_id, added_by=request.user)
+    source = shortcuts.get_object_or_404(
+        source_model.Source,
+        id=source_id,
+        added_by=request.user,
+    )
 
     if request.method == "POST":
+        # Its stories go with it, leaving tombstones; see story.signals
         source.delete()
+        response_cache.invalidate(
+            source.company_id,
+            response_cache.SOURCES,
+            response_cache.STORIES,
+        )
         messages.success(request, "Source deleted successfully.")
         return shortcuts.redirect("source:list")
     return shortcuts.redirect("source:list")
 
 
-@csrf_exempt
+@login_required
 def fetch_stories(request, source_id):
     if request.method == "POST":
-        print("++++++++++++++++++++++")
-        print("Inside fetch Story view")
-        print("+++++++++++++++++++++++")
-        services.import_stories_from_feed(source_id)
-        # return shortcuts.redirect("story:list")
-        return JsonResponse({"message": f"Stories fetched successfully for !"})
+        source_obj, _ = services.get_source(request.user, source_id)
+        if source_obj is None:
+            return JsonResponse({"error": "Source not found"}, status=404)
+
+        job_id = jobs.enqueue_fetch(source_obj, request.user)
+        return JsonResponse(
+            {
+                "message": f"Fetching stories for {source_obj.name}.",
+                "job_id": job_id,
+                "status_url": reverse("source:fetch-status", kwargs={"job_id": job_id}),
+            },
+            status=202,
+        )
 
     return JsonResponse({"error": "Invalid request method"}, status=400)
+
+
+@login_required
+def fetch_status(request, job_id):
+    job = jobs.get_job(job_id)
+    if job is None or (job["user_id"] != request.user.id and not request.user.is_staff):
+        return JsonResponse({"error": "Job not found"}, status=404)
+
+    return JsonResponse(job)
@@ -1,27 +1,22 @@
+// Pages are keyset-paginated: the server returns opaque cursors for the pages
+// before and after the current one instead of page numbers.
 function updatePagination(response) {
     let paginationContainer = $(".pagination");
-    console.log("Pagination Container Found:", paginationContainer.length);
     paginationContainer.empty(); // Clear existing pagination
-    console.log("Hi Sameer")
-    console.log(response)
 
-    if (response.total_pages > 1) {
+    if (response.has_previous || response.has_next) {
         let paginationHtml = '<div class="pagination-links">';
 
         if (response.has_previous) {
-            paginationHtml += `<button class="pagination-link" data-page="1">« First</button>`;
-            paginationHtml += `<button class="pagination-link" data-page="${response.current_page - 1}">Previous</button>`;
+            paginationHtml += `<button class="pagination-link" data-cursor="">« First</button>`;
+            paginationHtml += `<button class="pagination-link" data-cursor="${response.previous_cursor}">Previous</button>`;
         }
 
-        paginationHtml += `<span> Page ${response.current_page} of ${response.total_pages} </span>`;
-
         if (response.has_next) {
-            paginationHtml += `<button class="pagination-link" data-page="${response.current_page + 1}">Next</button>`;
-            paginationHtml += `<button class="pagination-link" data-page="${response.total_pages}">Last »</button>`;
+            paginationHtml += `<button class="pagination-link" data-cursor="${response.next_cursor}">Next</button>`;
         }
 
         paginationHtml += '</div>';
         paginationContainer.append(paginationHtml);
-        console.log("Page - Updated")
     }
 }
@@ -1,12 +1,61 @@
 from django.contrib import admin
 
+from . import services
+from .models import Article
+from .models import SavedSearch
+from .models import SearchNotification
 from .models import Story
 
 
+@admin.register(Article)
+class ArticleAdmin(admin.ModelAdmin):
+    list_display = ("title", "published_date", "canonical", "added_on")
+    search_fields = ("title", "article_url")
+    list_filter = ("canonical", "published_date")
+    ordering = ("-published_date",)
+    date_hierarchy = "published_date"
+
+
 @admin.register(Story)
 class StoryAdmin(admin.ModelAdmin):
-    list_display = ("title", "source_id", "published_date", "added_by", "added_on")
-    search_fields = ("title",)
+    list_display = (
+        "__str__",
+        "source_id",
+        "published_date",
+        "added_by",
+        "added_on",
+        "duplicate_of_id",
+    )
+    search_fields = ("article__title",)
     list_filter = ("published_date", "source")
     ordering = ("-published_date",)
+
+    # Through the service, so deletions leave tombstones and the counts follow
+    def delete_model(self, request, obj):
+        services.delete_stories_and_invalidate(Story.objects.filter(id=obj.id))
+
+    def delete_queryset(self, request, queryset):
+        services.delete_stories_and_invalidate(queryset)
+
     date_hierarchy = "published_date"
+    raw_id_fields = ("article", "duplicate_of")
+    list_select_related = ("article",)
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ("name", "query", "user", "created_on")
+    search_fields = ("name", "query")
+    # The query is only saved through services.create_saved_search, which indexes it
+    readonly_fields = ("query", "anchors")
+    raw_id_fields = ("user",)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(SearchNotification)
+class SearchNotificationAdmin(admin.ModelAdmin):
+    list_display = ("saved_search", "story", "created_on", "read_on")
+    raw_id_fields = ("saved_search", "story")
+    list_select_related = ("saved_search", "story__article")
@@ -0,0 +1,133 @@
+"""
+Saved-search alerts, matched as stories are imported.
+
+Re-running every saved search of a company against each imported story costs one
+full-text match per search, so a feed run grows with the number of searches. As
+in a percolator, the searches are indexed instead: each keeps the *anchors* of
+its query, lexemes of which a story must contain at least one to possibly match
+(``SavedSearch.anchors``, under a GIN index). A new story is matched with one
+indexed array-overlap lookup of its lexemes, and the query itself only runs for
+the few candidate searches that share one.
+
+The anchors come from PostgreSQL's ``querytree()`` of the parsed query, which
+drops negated terms. Of an AND or a phrase, the side with the fewest and then
+the longest lexemes is kept (any one side must be present); of an OR, both
+sides are. Queries with nothing left, such as ``-layoffs`` or only stopwords,
+are refused since they cannot be anchored.
+
+:func:`percolate` runs at the end of every feed import (see
+``source.services.save_feed_entries``) and records the matches of the new
+original stories as ``SearchNotification`` rows. Stories written or edited by
+hand, and near duplicates, raise no alerts. A search is matched against the stories
+of its user's company at the time of the import, not of when it was saved.
+"""
+
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+from news_monitoring.story.models import SEARCH_CONFIG
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import SavedSearch
+from news_monitoring.story.models import SearchNotification
+from news_monitoring.users.models import User
+
+# querytree() prints lexemes quoted, with quotes doubled, and the operators !, <N>/<->,
+# & and |
+TOKEN_RE = re.compile(r"'((?:[^']|'')*)'(?::\*?[A-D]*)?|(<\d+>|<->|[&|!()])")
+PRECEDENCE = {"|": 1, "&": 2, "<->": 3}
+
+
+class UnanchoredQueryError(ValueError):
+    """The query has no term a matching story must contain, so it cannot be indexed."""
+
+
+def get_anchors(query):
+    """Return the sorted lexemes every story matching ``query`` has one of."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT querytree(websearch_to_tsquery(%s::regconfig, %s))",
+            [SEARCH_CONFIG, query],
+        )
+        tree = cursor.fetchone()[0]
+    anchors = _parse(TOKEN_RE.findall(tree)) if tree not in ("", "T") else None
+    if not anchors:
+        raise UnanchoredQueryError(query)
+    return sorted(anchors)
+
+
+def _parse(tokens):
+    """Return the anchors of a ``querytree()``, or None when any story may match."""
+    position = 0
+
+    def operand():
+        nonlocal position
+        lexeme, operator = tokens[position]
+        position += 1
+        if operator == "(":
+            anchors = expression(0)
+            position += 1  # The closing parenthesis
+            return anchors
+        if operator == "!":
+            operand()
+            return None
+        return {lexeme.replace("''", "'")}
+
+    def expression(min_precedence):
+        nonlocal position
+        anchors = operand()
+        while position < len(tokens):
+            operator = tokens[position][1]
+            precedence = PRECEDENCE.get("<->" if operator.startswith("<") else operator)
+            if precedence is None or precedence < min_precedence:
+                break
+            position += 1
+            right = expression(precedence + 1)
+            if precedence == PRECEDENCE["|"]:
+                anchors = None if anchors is None or right is None else anchors | right
+            else:
+                anchors = min(
+                    (side for side in (anchors, right) if side is not None),
+                    key=lambda side: (len(side), -min(map(len, side))),
+                    default=None,
+                )
+        return anchors
+
+    return expression(0)
+
+
+def percolate(stories):
+    """Notify the company's saved searches that the original ``stories`` match."""
+    try:
+        sql, params = (
+            stories.filter(duplicate_of__isnull=True)
+            .order_by()
+            .values(
+                "id",
+                "company_id",
+                "article_id",
+            )
+            .query.sql_with_params()
+        )
+    except EmptyResultSet:  # e.g. id__in=[]: nothing to match
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {SearchNotification._meta.db_table}
+                (saved_search_id, story_id, created_on)
+            SELECT saved.id, story.id, now()
+            FROM ({sql}) story
+            JOIN {Article._meta.db_table} article ON article.id = story.article_id
+            JOIN {SavedSearch._meta.db_table} saved
+                ON saved.anchors && tsvector_to_array(article.search_vector)
+            JOIN {User._meta.db_table} owner
+                ON owner.id = saved.user_id AND owner.company_id = story.company_id
+            WHERE article.search_vector
+                @@ websearch_to_tsquery(%s::regconfig, saved.query)
+            ON CONFLICT (saved_search_id, story_id) DO NOTHING
+            """,  # noqa: S608
+            [*params, SEARCH_CONFIG],
+        )
+        return cursor.rowcount
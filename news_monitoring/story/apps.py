@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StoryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "news_monitoring.story"
+
+    def ready(self):
+        import news_monitoring.story.signals  # noqa: F401
@@ -0,0 +1,88 @@
+"""
+Canonical article URLs.
+
+Feeds link to the same article under many spellings: tracking parameters,
+``http`` vs ``https``, ``www.``, default ports, fragments and trailing slashes.
+:func:`canonicalize_url` removes the noise that never changes the page while
+keeping a URL that still opens it; :func:`url_hash` additionally ignores the scheme
+and ``www.`` and returns the fixed-width key stories are deduplicated on.
+"""
+
+import hashlib
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+TRACKING_PARAMETER_PREFIXES = ("utm_", "mc_", "pk_", "hsa_")
+TRACKING_PARAMETERS = frozenset(
+    {
+        "_ga",
+        "_hsenc",
+        "_hsmi",
+        "cmpid",
+        "dclid",
+        "fbclid",
+        "gclid",
+        "icid",
+        "igshid",
+        "mkt_tok",
+        "msclkid",
+        "ocid",
+        "ref",
+        "ref_src",
+        "smid",
+        "soc_src",
+        "soc_trk",
+        "spm",
+        "yclid",
+    },
+)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMETERS or name.startswith(TRACKING_PARAMETER_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    Return the canonical spelling of an article URL.
+
+    The scheme and host are lowercased, default ports, fragments, tracking
+    parameters and trailing slashes are dropped and the remaining query parameters
+    are sorted. URLs that do not parse as http(s) are only stripped of whitespace.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    if parts.username or parts.password:
+        host = f"{parts.netloc.rpartition('@')[0]}@{host}"
+    parameters = parse_qsl(parts.query, keep_blank_values=True)
+    query = urlencode(
+        sorted((name, value) for name, value in parameters if not _is_tracking(name)),
+    )
+    return urlunsplit((scheme, host, parts.path.rstrip("/"), query, ""))
+
+
+def url_hash(url):
+    """Return the signed 64-bit dedup key of ``url`` without scheme or ``www.``."""
+    canonical = canonicalize_url(url)
+    key = canonical.partition("://")[2] or canonical
+    key = key.removeprefix("www.")
+    return int.from_bytes(
+        hashlib.blake2b(key.encode(), digest_size=8).digest(),
+        "big",
+        signed=True,
+    )
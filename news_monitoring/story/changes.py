@@ -0,0 +1,69 @@
+"""
+Tombstones and cursors of the changes feed (``services.get_story_changes``).
+
+Clients keep the ``cursor`` of their last response and ask for the changes after
+it, instead of re-reading the list. Stories are found by ``updated_on`` (which
+``auto_now`` also sets on creation) on the ``story_company_updated_idx`` index,
+and deletions by the ``StoryTombstone`` rows :func:`record_deletions` writes
+before stories are deleted. Both streams are keyset-paginated on
+``(changed_at, kind, id)`` and merged, so a page is two index range scans
+however large the company is.
+
+Story deletes from the admin, and cascades from a deleted source or user, go
+through ``services.delete_stories`` as well (see ``story.signals``). A deleted
+company takes its tombstones with it, and stories deleted by raw SQL or by
+``Story.delete()`` outside these paths leave none.
+
+Only changes up to ``utils.commits.horizon`` are returned, so the feed never
+moves its cursor past a change that is stamped but not committed yet.
+Tombstones are pruned after ``STORY_TOMBSTONE_DAYS`` (``manage.py
+prune_story_tombstones``); older cursors are refused and the client reloads.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.utils import timezone
+
+from news_monitoring.story.models import StoryTombstone
+from news_monitoring.utils import pagination
+
+STORY = 0
+TOMBSTONE = 1
+CAUGHT_UP = 2  # Sorts after both kinds at the same instant
+ORDERING = ("changed_at", "kind", "id")
+
+
+class ExpiredCursorError(ValueError):
+    """The cursor is older than the kept tombstones; deletions may be missed."""
+
+
+def retention():
+    return datetime.timedelta(days=getattr(settings, "STORY_TOMBSTONE_DAYS", 30))
+
+
+def record_deletions(stories_qs):
+    """Write a tombstone for each of ``stories_qs``, before they are deleted."""
+    try:
+        sql, params = stories_qs.values("company_id", "id").query.sql_with_params()
+    except EmptyResultSet:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {StoryTombstone._meta.db_table} "  # noqa: S608
+            "(company_id, story_id, deleted_on) "
+            f"SELECT company_id, id, %s FROM ({sql}) deleted",
+            [timezone.now(), *params],
+        )
+
+
+def caught_up_cursor(horizon):
+    """The cursor of a client that has every change up to ``horizon``."""
+    return pagination.encode_cursor([horizon, CAUGHT_UP, 0])
+
+
+def prune(before):
+    """Delete the tombstones of deletions before ``before``; returns how many."""
+    return StoryTombstone.objects.filter(deleted_on__lt=before).delete()[0]
@@ -0,0 +1,107 @@
+"""
+Full dumps of stories as NDJSON or CSV, streamed in constant memory.
+
+The stories are read through a server-side cursor (``QuerySet.iterator()``), a
+batch at a time, and their tagged company names are resolved with one query per
+batch. Each batch is encoded and yielded before the next one is fetched, so a
+dump of millions of stories holds no more than ``batch_size`` of them at once,
+whether it is written to a ``StreamingHttpResponse`` or to a file.
+"""
+
+import csv
+import io
+import itertools
+from collections import defaultdict
+
+import orjson
+from django.db.models import F
+
+from news_monitoring.story.models import Story
+
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (NDJSON, CSV)
+CONTENT_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+BATCH_SIZE = 2000
+STORY_FIELDS = ("id", "company_id", "source_id", "duplicate_of_id", "published_date")
+ARTICLE_FIELDS = ("title", "article_url", "body_text")  # Read from the shared article
+FIELDS = (
+    "id",
+    "company_id",
+    "source_id",
+    "duplicate_of_id",
+    "title",
+    "article_url",
+    "published_date",
+    "body_text",
+    "tagged_companies",
+)
+TAG_SEPARATOR = "; "
+
+
+def _tag_names(story_ids):
+    """Return ``{story id: [company names in name order]}`` for one batch of stories."""
+    names = defaultdict(list)
+    rows = (
+        Story.tagged_companies.through.objects.filter(story_id__in=story_ids)
+        .order_by(
+            "company__name",
+        )
+        .values_list("story_id", "company__name")
+    )
+    for story_id, name in rows:
+        names[story_id].append(name)
+    return names
+
+
+def iter_batches(stories_qs, batch_size=BATCH_SIZE):
+    """Yield lists of up to ``batch_size`` story dicts with ``FIELDS`` keys, by id."""
+    rows = (
+        stories_qs.order_by("id")
+        .values(
+            *STORY_FIELDS,
+            **{field: F(f"article__{field}") for field in ARTICLE_FIELDS},
+        )
+        .iterator(chunk_size=batch_size)
+    )
+    for batch in itertools.batched(rows, batch_size):
+        names = _tag_names([row["id"] for row in batch])
+        for row in batch:
+            row["tagged_companies"] = names.get(row["id"], [])
+        yield batch
+
+
+def _ndjson(batches):
+    for batch in batches:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in batch)
+
+
+def _csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    yield buffer.getvalue().encode()  # Even for an empty dump
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            row["tagged_companies"] = TAG_SEPARATOR.join(row["tagged_companies"])
+            writer.writerow(row[field] for field in FIELDS)
+        yield buffer.getvalue().encode()
+
+
+def export_stories(stories_qs, export_format=NDJSON, batch_size=BATCH_SIZE):
+    """
+    Yield ``stories_qs`` encoded as ``export_format``, one bytes chunk per batch.
+
+    NDJSON has one object per story with the tagged companies as a list; CSV has
+    a header row and the tagged companies joined by ``TAG_SEPARATOR``. Dates are
+    ISO 8601 in both.
+
+    Raises:
+        ValueError: ``export_format`` is not one of ``FORMATS``.
+    """
+    if export_format not in FORMATS:
+        raise ValueError(export_format)
+    encode = _ndjson if export_format == NDJSON else _csv
+    return encode(iter_batches(stories_qs, batch_size))
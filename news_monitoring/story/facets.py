@@ -0,0 +1,107 @@
+"""
+Story counts per day, source and tagged company, kept up to date incrementally.
+
+Grouping a company's stories on every request does not scale with the table, so
+the counts live in ``StoryDayCount``, ``StorySourceCount`` and ``StoryTagCount``.
+Every write that adds, changes or deletes stories calls :func:`add` or
+:func:`remove` with those stories, in its own transaction. These group just the
+affected rows in the database and fold them into the counts with one
+``INSERT ... ON CONFLICT DO UPDATE`` per table, so concurrent writers never
+lose an increment.
+
+Writes that bypass these calls, such as admin edits or raw SQL, let the counts
+drift. ``manage.py rebuild_story_facets`` recomputes them from the stories.
+"""
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Count
+from django.db.models import F
+
+from news_monitoring.story.models import Story
+from news_monitoring.story.models import StoryDayCount
+from news_monitoring.story.models import StorySourceCount
+from news_monitoring.story.models import StoryTagCount
+
+COUNT_MODELS = (StoryDayCount, StorySourceCount, StoryTagCount)
+
+
+def _grouped_counts(stories):
+    """Yield ``(model, key columns, rows of (key1, key2, n))`` for each count table."""
+    originals = stories.filter(duplicate_of__isnull=True).order_by()
+    yield (
+        StoryDayCount,
+        ("company_id", "day"),
+        originals.values(
+            key1=F("company_id"),
+            key2=F("published_date"),
+        ).annotate(n=Count("id")),
+    )
+    yield (
+        StorySourceCount,
+        ("company_id", "source_id"),
+        originals.filter(source__isnull=False)
+        .values(
+            key1=F("company_id"),
+            key2=F("source_id"),
+        )
+        .annotate(n=Count("id")),
+    )
+    yield (
+        StoryTagCount,
+        ("company_id", "tagged_company_id"),
+        Story.tagged_companies.through.objects.filter(
+            story__in=originals.values("id"),
+        )
+        .order_by()
+        .values(key1=F("story__company_id"), key2=F("company_id"))
+        .annotate(n=Count("id")),
+    )
+
+
+def _apply(stories, sign):
+    with connection.cursor() as cursor:
+        for model, (column1, column2), counts in _grouped_counts(stories):
+            try:
+                sql, params = counts.query.sql_with_params()
+            except EmptyResultSet:  # e.g. id__in=[]: nothing to count
+                return
+            table = model._meta.db_table
+            cursor.execute(
+                f"""
+                INSERT INTO {table} ({column1}, {column2}, count)
+                SELECT key1, key2, %s * n FROM ({sql}) counts
+                ON CONFLICT ({column1}, {column2})
+                    DO UPDATE SET count = {table}.count + EXCLUDED.count
+                """,  # noqa: S608
+                [sign, *params],
+            )
+
+
+def add(stories):
+    """Count the Story queryset ``stories`` once they are saved and tagged."""
+    _apply(stories, 1)
+
+
+def remove(stories):
+    """Uncount the Story queryset ``stories`` before they change or are deleted."""
+    _apply(stories, -1)
+
+
+def rebuild(companies=None):
+    """
+    Recompute the counts of ``companies`` (a queryset; all if None) from their stories.
+
+    Returns:
+        dict: Rows written per count table.
+    """
+
+    def scoped(queryset):
+        return queryset if companies is None else queryset.filter(company__in=companies)
+
+    for model in COUNT_MODELS:
+        scoped(model.objects.all()).delete()
+    add(scoped(Story.objects.all()))
+    return {
+        model.__name__: scoped(model.objects.all()).count() for model in COUNT_MODELS
+    }
@@ -0,0 +1,181 @@
+"""
+Near-duplicate detection for stories.
+
+Every story gets a MinHash signature of the word shingles of its body: the share of
+positions two signatures agree on estimates how much of their text the stories
+share (their Jaccard similarity). Two stories are near duplicates when that
+estimate reaches ``NEAR_DUPLICATE_THRESHOLD``. Titles are left out because outlets
+rewrite the headline of a wire story far more often than its text.
+
+To find them without comparing against every stored story, the signature is cut
+into ``NEAR_DUPLICATE_BANDS`` bands and each band is hashed to a key (a banded LSH
+index): similar stories very likely share a key, dissimilar ones very rarely do.
+The keys are stored in ``Article.fingerprint_bands`` under a GIN index, so the
+candidates are one indexed array-overlap query. Changing the number of bands needs
+``manage.py backfill_story_fingerprints`` to rebuild the keys.
+"""
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from news_monitoring.story.models import Story
+
+PERMUTATIONS = 64
+SHINGLE_SIZE = 2
+# Shorter bodies are mostly boilerplate ("Read more...") and are not fingerprinted
+MIN_WORDS = 8
+
+LINK = "link"
+SKIP = "skip"
+
+_PRIME = (1 << 61) - 1
+_VALUE_MASK = (1 << 31) - 1  # Signature values are stored in an integer column
+# Fixed seed: signatures must not change between processes
+_rng = random.Random(20250401)  # noqa: S311
+_PERMUTATION_PARAMS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(PERMUTATIONS)
+]
+
+_WORD = re.compile(r"\w+")
+
+
+def get_settings():
+    """Return the configured ``(threshold, bands, action)``, validated together."""
+    threshold = getattr(settings, "NEAR_DUPLICATE_THRESHOLD", 0.7)
+    bands = getattr(settings, "NEAR_DUPLICATE_BANDS", 16)
+    action = getattr(settings, "NEAR_DUPLICATE_ACTION", LINK)
+    if PERMUTATIONS % bands or not 0 < threshold <= 1:
+        msg = f"NEAR_DUPLICATE_BANDS must divide {PERMUTATIONS} and 0 < threshold <= 1."
+        raise ImproperlyConfigured(msg)
+    # Pairs at the LSH threshold share a band half of the time; above the configured
+    # threshold most would be missed
+    if (1 / bands) ** (bands / PERMUTATIONS) > threshold:
+        msg = "NEAR_DUPLICATE_BANDS is too low for NEAR_DUPLICATE_THRESHOLD."
+        raise ImproperlyConfigured(msg)
+    if action not in (LINK, SKIP):
+        msg = f"NEAR_DUPLICATE_ACTION must be {LINK!r} or {SKIP!r}."
+        raise ImproperlyConfigured(msg)
+    return threshold, bands, action
+
+
+def _hash(value):
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(),
+        "big",
+        signed=True,
+    )
+
+
+def minhash(text):
+    """Return the MinHash signature of ``text``; empty when it is too short."""
+    words = _WORD.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return []
+
+    hashes = {
+        _hash(" ".join(words[i : i + SHINGLE_SIZE]))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    return [
+        min((a * value + b) % _PRIME for value in hashes) & _VALUE_MASK
+        for a, b in _PERMUTATION_PARAMS
+    ]
+
+
+def similarity(first, second):
+    """Estimate the Jaccard similarity of the texts behind two signatures."""
+    return sum(a == b for a, b in zip(first, second, strict=True)) / PERMUTATIONS
+
+
+def band_keys(signature, bands):
+    """Hash each band of a signature, with its position, to one bigint key."""
+    rows = PERMUTATIONS // bands
+    bands_rows = (
+        signature[index * rows : (index + 1) * rows] for index in range(bands)
+    )
+    return [
+        _hash(f"{index}:{','.join(map(str, band))}")
+        for index, band in enumerate(bands_rows)
+    ]
+
+
+def fingerprint_fields(body_text):
+    """Return the fingerprint fields of an article with this body."""
+    signature = minhash(body_text)
+    return {
+        "fingerprint": signature,
+        "fingerprint_bands": band_keys(signature, get_settings()[1])
+        if signature
+        else [],
+    }
+
+
+def find_near_duplicates(company, articles, before_id=None):
+    """
+    Match new stories' fingerprinted ``articles`` against stored stories and each other.
+
+    Stored candidates come from one query on the band index; ``before_id`` limits
+    them to older stories. An article is also matched against the articles before
+    it in the list that are not duplicates themselves.
+
+    Returns:
+        tuple: ``({index: stored original id}, {index: earlier original's index})``
+    """
+    threshold = get_settings()[0]
+    keys = {key for article in articles for key in article.fingerprint_bands}
+    if not keys:
+        return {}, {}
+
+    candidates = Story.objects.filter(
+        company=company,
+        article__fingerprint_bands__overlap=list(keys),
+    )
+    if before_id is not None:
+        candidates = candidates.filter(id__lt=before_id)
+    stored_by_key = defaultdict(list)
+    for story_id, fingerprint, bands, duplicate_of_id in candidates.values_list(
+        "id",
+        "article__fingerprint",
+        "article__fingerprint_bands",
+        "duplicate_of_id",
+    ):
+        for key in bands:
+            stored_by_key[key].append(
+                (story_id, fingerprint, duplicate_of_id or story_id),
+            )
+
+    stored, within = {}, {}
+    batch_by_key: defaultdict[int, list[int]] = defaultdict(list)
+    for index, article in enumerate(articles):
+        if not article.fingerprint_bands:
+            continue
+
+        matches = {
+            (-similarity(article.fingerprint, fingerprint), story_id, original_id)
+            for key in article.fingerprint_bands
+            for story_id, fingerprint, original_id in stored_by_key[key]
+        }
+        matches = {match for match in matches if -match[0] >= threshold}
+        if matches:
+            stored[index] = min(matches)[2]
+            continue
+
+        earlier = {
+            (-similarity(article.fingerprint, articles[other].fingerprint), other)
+            for key in article.fingerprint_bands
+            for other in batch_by_key[key]
+        }
+        earlier = {match for match in earlier if -match[0] >= threshold}
+        if earlier:
+            within[index] = min(earlier)[1]
+            continue
+
+        for key in article.fingerprint_bands:
+            batch_by_key[key].append(index)
+
+    return stored, within
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Case
+from django.db.models import CharField
+from django.db.models import F
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Concat
+from django.db.models.functions import Left
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThan
+
+from news_monitoring.story.models import EXCERPT_LENGTH
+from news_monitoring.story.models import Article
+
+# make_excerpt() in SQL, so bodies never leave the database
+EXCERPT = Case(
+    When(
+        GreaterThan(Length("body_text"), EXCERPT_LENGTH),
+        then=Concat(Left("body_text", EXCERPT_LENGTH), Value("...")),
+    ),
+    default=F("body_text"),
+    output_field=CharField(),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in the excerpt of stored articles that have none, --batch-size articles "
+        "per UPDATE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Articles per UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        missing = (
+            Article.objects.filter(excerpt="").exclude(body_text="").order_by("id")
+        )
+        updated = last_id = 0
+        while True:
+            ids = list(
+                missing.filter(id__gt=last_id).values_list("id", flat=True)[
+                    : options["batch_size"]
+                ],
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            updated += Article.objects.filter(id__in=ids).update(excerpt=EXCERPT)
+        self.stdout.write(f"{updated} article excerpts filled in")
@@ -0,0 +1,134 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import facets
+from news_monitoring.story import fingerprints
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.utils import response_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the MinHash fingerprint and LSH band keys of stored stories, oldest "
+        "first, and with --link point every near duplicate at its original."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company",
+            type=int,
+            dest="company_id",
+            help="Only stories of this company id.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Stories per batch.",
+        )
+        parser.add_argument(
+            "--link",
+            action="store_true",
+            help="Also recompute which stories are near duplicates.",
+        )
+
+    def handle(self, *args, **options):
+        companies = (
+            Company.objects.filter(stories__isnull=False).distinct().order_by("id")
+        )
+        if options["company_id"]:
+            companies = companies.filter(id=options["company_id"])
+
+        for company in companies:
+            fingerprinted, duplicates = self.backfill(
+                company,
+                options["batch_size"],
+                options["link"],
+            )
+            self.stdout.write(
+                f"{company.name}: {fingerprinted} stories fingerprinted, {duplicates} "
+                "near duplicates",
+            )
+
+    def backfill(self, company, batch_size, link):
+        fingerprinted = duplicates = 0
+        last_id = 0
+        while True:
+            stories = list(
+                Story.objects.filter(company=company, id__gt=last_id)
+                .order_by("id")
+                .select_related("article")
+                .only(
+                    "id",
+                    "duplicate_of_id",
+                    "article__body_text",
+                    "article__fingerprint",
+                    "article__fingerprint_bands",
+                )[:batch_size],
+            )
+            if not stories:
+                return fingerprinted, duplicates
+            last_id = stories[-1].id
+
+            changed_articles = self.fingerprint(stories)
+            relinked = self.link(company, stories) if link else []
+            fingerprinted += sum(1 for story in stories if story.article.fingerprint)
+            duplicates += sum(1 for story in stories if story.duplicate_of_id)
+
+            with transaction.atomic():
+                Article.objects.bulk_update(
+                    changed_articles,
+                    ["fingerprint", "fingerprint_bands"],
+                )
+                if relinked:
+                    self.save_links(company, relinked)
+
+    def fingerprint(self, stories):
+        """Refresh the fingerprints of the stories' articles; return those changed."""
+        # Articles are shared; only those whose fingerprint changes are written
+        changed_articles = []
+        for story in stories:
+            article = story.article
+            fields = fingerprints.fingerprint_fields(article.body_text)
+            if [article.fingerprint, article.fingerprint_bands] != list(
+                fields.values(),
+            ):
+                article.fingerprint = fields["fingerprint"]
+                article.fingerprint_bands = fields["fingerprint_bands"]
+                changed_articles.append(article)
+        return changed_articles
+
+    def link(self, company, stories):
+        """Point each story at its original, if any; return the stories changed."""
+        # Earlier batches are relinked already; only older stories qualify
+        stored, within = fingerprints.find_near_duplicates(
+            company,
+            [story.article for story in stories],
+            before_id=stories[0].id,
+        )
+        relinked = []
+        for index, story in enumerate(stories):
+            previous = story.duplicate_of_id
+            if index in stored:
+                story.duplicate_of_id = stored[index]
+            elif index in within:
+                story.duplicate_of_id = stories[within[index]].id
+            else:
+                story.duplicate_of_id = None
+            if story.duplicate_of_id != previous:
+                relinked.append(story)
+        return relinked
+
+    def save_links(self, company, relinked):
+        """Save the new links, moving the relinked stories between the counts."""
+        relinked_qs = Story.objects.filter(id__in=[story.id for story in relinked])
+        # Only originals are counted, so joining or leaving the list moves counts
+        facets.remove(relinked_qs)
+        Story.objects.bulk_update(relinked, ["duplicate_of"])
+        # Joining or leaving the list is also a change the changes feed reports
+        relinked_qs.update(updated_on=timezone.now())
+        facets.add(relinked_qs)
+        response_cache.invalidate(company.id, response_cache.STORIES)
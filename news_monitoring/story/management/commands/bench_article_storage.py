@@ -0,0 +1,163 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.db.migrations.loader import MigrationLoader
+
+from news_monitoring.company.models import Company
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+
+# The last layout that stored the content on every company's story
+LEGACY_MIGRATION = ("story", "0013_story_changes")
+LEGACY_SCHEMA = "bench_legacy"
+# Generated rows; the body is hex digests, which compress too little to stay inline
+BODY = (
+    "(SELECT string_agg(md5(i || ':' || j), ' ') FROM generate_series(1, %(chunks)s) j)"
+)
+FINGERPRINT = "(SELECT array_agg(hashint4(i * 128 + j)) FROM generate_series(1, 128) j)"
+BANDS = "(SELECT array_agg(hashint8(i * 16 + j)) FROM generate_series(1, 16) j)"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the table size, index size and WAL written by importing articles "
+        "that every company follows, with the content stored once per article and "
+        "once per company's story. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--articles",
+            type=int,
+            default=10_000,
+            help="Articles imported.",
+        )
+        parser.add_argument(
+            "--companies",
+            type=int,
+            default=30,
+            help="Companies following every article.",
+        )
+        parser.add_argument(
+            "--body-size",
+            type=int,
+            default=2_000,
+            help="Approximate body length in characters.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["articles"], options["companies"], options["body_size"])
+            transaction.set_rollback(True)
+
+    def run(self, articles, companies, body_size):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        company_ids = [
+            Company.objects.create(
+                name=f"bench-{tag}-{i}",
+                domain=f"https://bench-{tag}-{i}.example.com",
+            ).id
+            for i in range(companies)
+        ]
+        legacy_table = self.create_legacy_table()
+        params = {
+            "url": f"https://bench.example.com/{tag}/",
+            "companies": company_ids,
+            "user": user.id,
+            "count": articles,
+            "chunks": max(1, body_size // 33),
+        }
+
+        self.stdout.write(
+            f"{'layout':<9} | {'rows':>9} | {'table MB':>9} | {'index MB':>9} | "
+            f"{'WAL MB':>9}",
+        )
+        for layout, tables, insert in (
+            ("per-story", [legacy_table], self.insert_legacy(legacy_table)),
+            (
+                "shared",
+                [Article._meta.db_table, Story._meta.db_table],
+                self.insert_shared(),
+            ),
+        ):
+            table_bytes, index_bytes, wal_bytes = self.measure(tables, insert, params)
+            rows = articles * companies + (articles if layout == "shared" else 0)
+            self.stdout.write(
+                f"{layout:<9} | {rows:>9,} | {table_bytes / 1e6:>9.2f} | "
+                f"{index_bytes / 1e6:>9.2f} | {wal_bytes / 1e6:>9.2f}",
+            )
+
+    def create_legacy_table(self):
+        """Create the story table as of ``LEGACY_MIGRATION`` in a schema of its own."""
+        legacy_model = (
+            MigrationLoader(connection)
+            .project_state(LEGACY_MIGRATION)
+            .apps.get_model("story", "Story")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA {LEGACY_SCHEMA}")
+            cursor.execute(f"SET LOCAL search_path TO {LEGACY_SCHEMA}, public")
+            with connection.schema_editor() as schema_editor:
+                schema_editor.create_model(legacy_model)
+            cursor.execute("SET LOCAL search_path TO public")
+        return f"{LEGACY_SCHEMA}.{legacy_model._meta.db_table}"
+
+    def insert_legacy(self, table):
+        return f"""
+            INSERT INTO {table} (
+                title, body_text, excerpt, article_url, article_url_hash,
+                published_date, added_on, updated_on,
+                company_id, added_by_id, fingerprint, fingerprint_bands
+            )
+            SELECT 'Story ' || i, body, left(body, 100) || '...', %(url)s || i, i,
+                DATE '2020-01-01' + i / 500,
+                now(), now(), company_id, %(user)s, {FINGERPRINT}, {BANDS}
+            FROM generate_series(1, %(count)s) i,
+                LATERAL (SELECT {BODY} AS body) bodies,
+                unnest(%(companies)s::bigint[]) company_id
+        """  # noqa: S608
+
+    def insert_shared(self):
+        return f"""
+            WITH articles AS (
+                INSERT INTO {Article._meta.db_table} (
+                    title, body_text, excerpt, article_url, article_url_hash, canonical,
+                    published_date, added_on,
+                    fingerprint, fingerprint_bands
+                )
+                SELECT 'Story ' || i, body, left(body, 100) || '...', %(url)s || i, i,
+                    true, DATE '2020-01-01' + i / 500, now(), {FINGERPRINT}, {BANDS}
+                FROM generate_series(1, %(count)s) i,
+                    LATERAL (SELECT {BODY} AS body) bodies
+                RETURNING id, article_url_hash, published_date
+            )
+            INSERT INTO {Story._meta.db_table} (
+                article_id, article_url_hash, published_date, added_on, updated_on,
+                company_id, added_by_id
+            )
+            SELECT id, article_url_hash, published_date, now(), now(), company_id,
+                %(user)s
+            FROM articles, unnest(%(companies)s::bigint[]) company_id
+        """  # noqa: S608
+
+    def measure(self, tables, sql, params):
+        """Run ``sql``; return how much ``tables``, their indexes and WAL grew."""
+        sizes = " + ".join(f"pg_table_size('{table}')" for table in tables)
+        index_sizes = " + ".join(f"pg_indexes_size('{table}')" for table in tables)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {sizes}, {index_sizes}, pg_current_wal_insert_lsn()",
+            )
+            table_before, index_before, wal_before = cursor.fetchone()
+            cursor.execute(sql, params)
+            cursor.execute(
+                f"SELECT {sizes}, {index_sizes}, "
+                "pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)",
+                [wal_before],
+            )
+            table_after, index_after, wal_bytes = cursor.fetchone()
+        return table_after - table_before, index_after - index_before, int(wal_bytes)
@@ -0,0 +1,216 @@
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import alerts
+from news_monitoring.story.models import SEARCH_CONFIG
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import SavedSearch
+from news_monitoring.story.models import SearchNotification
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+
+SYLLABLES = [
+    "ka",
+    "lo",
+    "mi",
+    "ren",
+    "to",
+    "sha",
+    "vel",
+    "qui",
+    "dor",
+    "ba",
+    "zu",
+    "ne",
+    "fi",
+    "gra",
+    "pol",
+    "tes",
+    "mar",
+    "cu",
+    "vio",
+    "dex",
+]
+VOCABULARY = 50_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of matching imported stories against saved searches "
+        "through the anchor index and by running every saved search of the company. "
+        "All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--searches",
+            type=int,
+            default=10_000,
+            help="Saved searches of the company.",
+        )
+        parser.add_argument(
+            "--stories",
+            type=int,
+            default=200,
+            help="Stories imported.",
+        )
+        parser.add_argument("--words", type=int, default=300, help="Words per story.")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(
+                options["searches"],
+                options["stories"],
+                options["words"],
+                options["repeat"],
+            )
+            transaction.set_rollback(True)
+
+    def run(self, searches, stories, words, repeat):
+        rng = random.Random(0)  # noqa: S311
+        tag = uuid.uuid4().hex[:8]
+        vocabulary = [
+            "".join(rng.choices(SYLLABLES, k=3)) + str(i) for i in range(VOCABULARY)
+        ]
+        # Zipf, like the words of real text
+        weights = [1 / rank for rank in range(1, VOCABULARY + 1)]
+
+        company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+        user = User.objects.create_user(
+            email=f"bench-{tag}@example.com",
+            password=None,
+            company=company,
+        )
+        queries = [self.query(rng, vocabulary) for _ in range(searches)]
+        SavedSearch.objects.bulk_create(
+            SavedSearch(
+                user=user,
+                name=f"Search {i}",
+                query=query,
+                anchors=alerts.get_anchors(query),
+            )
+            for i, query in enumerate(queries)
+        )
+        articles = Article.objects.bulk_create(
+            Article(
+                title=f"Story {i}",
+                body_text=" ".join(rng.choices(vocabulary, weights, k=words)),
+                article_url=f"https://bench.example.com/{tag}/{i}",
+                article_url_hash=i,
+                canonical=False,
+                published_date="2025-04-01",
+            )
+            for i in range(stories)
+        )
+        Story.objects.bulk_create(
+            Story(
+                company=company,
+                added_by=user,
+                article=article,
+                published_date=article.published_date,
+                article_url_hash=article.article_url_hash,
+            )
+            for article in articles
+        )
+        new_stories = Story.objects.filter(company=company)
+        with connection.cursor() as cursor:
+            for model in (SavedSearch, Article, Story):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+            cursor.execute(self.candidates_sql(), [company.id])
+            candidates = cursor.fetchone()[0]
+
+        naive_seconds, naive_matches = self.measure(
+            lambda: self.match_all(company),
+            repeat,
+        )
+        indexed_seconds, indexed_matches = self.measure(
+            lambda: alerts.percolate(new_stories),
+            repeat,
+        )
+        assert naive_matches == indexed_matches, (naive_matches, indexed_matches)
+
+        self.stdout.write(
+            f"{'method':<7} | {'searches':>8} | {'stories':>7} | {'candidates':>10} | "
+            f"{'matches':>7} | {'ms':>9} | {'stories/s':>9}",
+        )
+        for method, seconds, checked in (
+            ("naive", naive_seconds, searches * stories),
+            ("indexed", indexed_seconds, candidates),
+        ):
+            self.stdout.write(
+                f"{method:<7} | {searches:>8,} | {stories:>7,} | {checked:>10,} | "
+                f"{indexed_matches:>7,} | {seconds * 1000:>9.2f} | "
+                f"{stories / seconds:>9,.0f}",
+            )
+
+    def query(self, rng, vocabulary):
+        """One to three words, sometimes a phrase, an alternative or an exclusion."""
+        first, second, third = rng.sample(vocabulary, 3)
+        return rng.choice(
+            (
+                first,
+                f"{first} {second}",
+                f'"{first} {second}"',
+                f"{first} or {second}",
+                f"{first} {second} -{third}",
+            ),
+        )
+
+    def candidates_sql(self):
+        return f"""
+            SELECT count(*)
+            FROM {Story._meta.db_table} story
+            JOIN {Article._meta.db_table} article ON article.id = story.article_id
+            JOIN {SavedSearch._meta.db_table} saved
+                ON saved.anchors && tsvector_to_array(article.search_vector)
+            JOIN {User._meta.db_table} owner
+                ON owner.id = saved.user_id AND owner.company_id = story.company_id
+            WHERE story.company_id = %s
+        """  # noqa: S608
+
+    def match_all(self, company):
+        """Run each saved search against each story, as without the anchor index."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {SearchNotification._meta.db_table}
+                    (saved_search_id, story_id, created_on)
+                SELECT saved.id, story.id, now()
+                FROM {Story._meta.db_table} story
+                JOIN {Article._meta.db_table} article ON article.id = story.article_id
+                JOIN {User._meta.db_table} owner ON owner.company_id = story.company_id
+                JOIN {SavedSearch._meta.db_table} saved ON saved.user_id = owner.id
+                WHERE story.company_id = %s
+                    AND article.search_vector
+                        @@ websearch_to_tsquery(%s::regconfig, saved.query)
+                ON CONFLICT (saved_search_id, story_id) DO NOTHING
+                """,  # noqa: S608
+                [company.id, SEARCH_CONFIG],
+            )
+            return cursor.rowcount
+
+    def measure(self, func, repeat):
+        """Return the best time of ``func`` and its result, rolling back each run."""
+        best = float("inf")
+        for _ in range(repeat):
+            with transaction.atomic():
+                started = time.perf_counter()
+                result = func()
+                best = min(best, time.perf_counter() - started)
+                transaction.set_rollback(True)
+        return best, result
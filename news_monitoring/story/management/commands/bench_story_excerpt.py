@@ -0,0 +1,165 @@
+import re
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import CharField
+from django.db.models import F
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Concat
+from django.db.models.functions import Left
+from django.db.models.functions import Length
+from django.db.models.lookups import GreaterThan
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import services
+from news_monitoring.story.models import EXCERPT_LENGTH
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+
+# make_excerpt() in SQL, on the story's article
+ARTICLE_EXCERPT = Case(
+    When(
+        GreaterThan(Length("article__body_text"), EXCERPT_LENGTH),
+        then=Concat(Left("article__body_text", EXCERPT_LENGTH), Value("...")),
+    ),
+    default=F("article__body_text"),
+    output_field=CharField(),
+)
+_SHARED_BUFFERS = re.compile(r"Buffers: shared(?: hit=(\d+))?(?: read=(\d+))?")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare what one story list page reads and transfers when it selects the "
+        "full body, cuts the body in SQL, or selects the stored excerpt. All data is "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stories",
+            type=int,
+            default=5_000,
+            help="Stories of the benchmark company.",
+        )
+        parser.add_argument(
+            "--body-size",
+            type=int,
+            default=5_000,
+            help="Approximate body length in characters.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Stories per page.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(
+                options["stories"],
+                options["body_size"],
+                options["page_size"],
+                options["repeat"],
+            )
+            transaction.set_rollback(True)
+
+    def run(self, count, body_size, page_size, repeat):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        user.company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+        self.generate(user, count, body_size, tag)
+
+        stories_qs = services.get_stories(user, "", None).order_by(
+            *services.STORY_ORDERING,
+        )
+        fields = ["id", "article__title", "article__article_url", "published_date"]
+        queries = {
+            "full body": stories_qs.values_list(*fields, "article__body_text"),
+            "SQL cut": stories_qs.annotate(cut=ARTICLE_EXCERPT).values_list(
+                *fields,
+                "cut",
+            ),
+            "excerpt": stories_qs.values_list(*fields, "article__excerpt"),
+        }
+        self.stdout.write(
+            f"{'select':<10} | {'bytes/page':>10} | {'buffers':>7} | {'ms/page':>7}",
+        )
+        for name, queryset in queries.items():
+            page = queryset[:page_size]
+            transferred = sum(len(str(value).encode()) for row in page for value in row)
+            seconds = self.measure(lambda page=page: list(page.all()), repeat)
+            self.stdout.write(
+                f"{name:<10} | {transferred:>10,} | {self.buffers(page):>7,} | "
+                f"{seconds * 1000:>7.2f}",
+            )
+
+    def generate(self, user, count, body_size, tag):
+        """Insert stories with hex digest bodies, too incompressible to stay inline."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH articles AS (
+                    INSERT INTO {Article._meta.db_table} (
+                        title, body_text, excerpt, article_url, article_url_hash,
+                        canonical, published_date, added_on,
+                        fingerprint, fingerprint_bands
+                    )
+                    SELECT 'Story ' || i, body, left(body, 100) || '...', %(url)s || i,
+                        i, true, DATE '2020-01-01' + i / 50, now(), '{{}}', '{{}}'
+                    FROM generate_series(1, %(count)s) i,
+                        LATERAL (SELECT string_agg(md5(i || ':' || j), ' ') AS body
+                                 FROM generate_series(1, %(chunks)s) j) bodies
+                    RETURNING id, article_url_hash, published_date
+                )
+                INSERT INTO {Story._meta.db_table} (
+                    article_id, article_url_hash, published_date, added_on, updated_on,
+                    company_id, added_by_id
+                )
+                SELECT id, article_url_hash, published_date, now(), now(), %(company)s,
+                    %(user)s
+                FROM articles
+                """,  # noqa: S608
+                {
+                    "url": f"https://bench.example.com/{tag}/",
+                    "company": user.company_id,
+                    "user": user.id,
+                    "count": count,
+                    "chunks": max(1, body_size // 33),
+                },
+            )
+            cursor.execute(f"ANALYZE {Article._meta.db_table}, {Story._meta.db_table}")
+
+    def buffers(self, queryset):
+        """
+        Shared buffers the query touched, from EXPLAIN (ANALYZE, BUFFERS) of its plan.
+
+        EXPLAIN does not detoast the columns it would return, so the full-body query
+        shows only its index and heap pages; its cost appears in the bytes instead.
+        """
+        match = _SHARED_BUFFERS.search(queryset.explain(analyze=True, buffers=True))
+        return sum(int(blocks) for blocks in match.groups() if blocks) if match else 0
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
@@ -0,0 +1,139 @@
+import resource
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import export
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+
+TAGS = 3
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the throughput and the peak memory (max RSS) of streaming a "
+        "company's stories as NDJSON and CSV at growing sizes. All data is rolled "
+        "back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1_000, 100_000, 1_000_000],
+            help="Stories to export, ascending.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=export.BATCH_SIZE,
+            help="Stories per fetch.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(sorted(options["sizes"]), options["batch_size"])
+            transaction.set_rollback(True)
+
+    def run(self, sizes, batch_size):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+        tagged = [
+            Company.objects.create(
+                name=f"Tagged {tag} {i}",
+                domain=f"https://tagged-{tag}-{i}.example.com",
+            )
+            for i in range(TAGS)
+        ]
+        stories_qs = Story.objects.filter(company=company)
+
+        self.stdout.write(
+            f"{'stories':>9} | {'format':<6} | {'MB':>8} | {'seconds':>7} | "
+            f"{'rows/s':>9} | {'max RSS MB':>10}",
+        )
+        generated = 0
+        for size in sizes:
+            self.generate(company, user, tagged, generated, size, tag)
+            generated = size
+            for export_format in export.FORMATS:
+                written, seconds = self.measure(
+                    export.export_stories(stories_qs, export_format, batch_size),
+                )
+                max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+                self.stdout.write(
+                    f"{size:>9,} | {export_format:<6} | {written / 1e6:>8.1f} | "
+                    f"{seconds:>7.2f} | {size / seconds:>9,.0f} | {max_rss:>10.1f}",
+                )
+
+    def generate(self, company, user, tagged, start, end, tag):  # noqa: PLR0913
+        """Insert stories ``start + 1`` to ``end``, tagged with all of ``tagged``."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH articles AS (
+                    INSERT INTO {Article._meta.db_table} (
+                        title, body_text, excerpt, article_url, article_url_hash,
+                        canonical, published_date, added_on,
+                        fingerprint, fingerprint_bands
+                    )
+                    SELECT 'Story ' || i, body, left(body, 100) || '...', %(url)s || i,
+                        i, true, DATE '2020-01-01' + i / 500, now(), '{{}}', '{{}}'
+                    FROM generate_series(%(start)s + 1, %(end)s) i,
+                        LATERAL (SELECT string_agg(md5(i || ':' || j), ' ') AS body
+                                 FROM generate_series(1, 30) j) bodies
+                    RETURNING id, article_url_hash, published_date
+                )
+                INSERT INTO {Story._meta.db_table} (
+                    article_id, article_url_hash, published_date, added_on, updated_on,
+                    company_id, added_by_id
+                )
+                SELECT id, article_url_hash, published_date, now(), now(), %(company)s,
+                    %(user)s
+                FROM articles
+                """,  # noqa: S608
+                {
+                    "url": f"https://bench.example.com/{tag}/",
+                    "company": company.id,
+                    "user": user.id,
+                    "start": start,
+                    "end": end,
+                },
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {Story.tagged_companies.through._meta.db_table}
+                    (story_id, company_id)
+                SELECT story.id, tagged.id
+                FROM {Story._meta.db_table} story,
+                    unnest(%(tagged)s::bigint[]) tagged(id)
+                WHERE story.company_id = %(company)s
+                    AND story.article_url_hash BETWEEN %(start)s + 1 AND %(end)s
+                """,  # noqa: S608
+                {
+                    "company": company.id,
+                    "start": start,
+                    "end": end,
+                    "tagged": [company.id for company in tagged],
+                },
+            )
+            cursor.execute(
+                f"ANALYZE {Article._meta.db_table}, {Story._meta.db_table}, "
+                f"{Story.tagged_companies.through._meta.db_table}",
+            )
+
+    def measure(self, chunks):
+        """Consume ``chunks`` as a client would; return the bytes and seconds taken."""
+        started = time.perf_counter()
+        written = sum(len(chunk) for chunk in chunks)
+        return written, time.perf_counter() - started
@@ -0,0 +1,126 @@
+import datetime
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db import transaction
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+from news_monitoring.utils import pagination
+
+PAGE_SIZE = 10
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of offset (Paginator) and keyset pagination of the story "
+        "list at shallow and deep pages. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stories",
+            type=int,
+            default=100_000,
+            help="Stories of the benchmark company.",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            nargs="+",
+            default=[1, 100, 1_000, 10_000],
+            help="Pages to time.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["stories"], options["pages"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def run(self, count, pages, repeat):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        user.company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+        start = datetime.date(2020, 1, 1)
+        for offset in range(0, count, 10_000):
+            articles = Article.objects.bulk_create(
+                Article(
+                    title=f"Story {i}",
+                    body_text="",
+                    article_url=f"https://bench.example.com/{tag}/{i}",
+                    article_url_hash=url_hash(f"https://bench.example.com/{tag}/{i}"),
+                    published_date=start + datetime.timedelta(days=i // 50),
+                )
+                for i in range(offset, min(offset + 10_000, count))
+            )
+            Story.objects.bulk_create(
+                Story(
+                    article=article,
+                    article_url_hash=article.article_url_hash,
+                    published_date=article.published_date,
+                    company=user.company,
+                    added_by=user,
+                )
+                for article in articles
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Story._meta.db_table}")
+
+        stories_qs = services.get_stories(user, "", None)
+        self.stdout.write(f"{'page':>8} | {'offset ms':>10} | {'keyset ms':>10}")
+        for page in pages:
+            if (page - 1) * PAGE_SIZE >= count:
+                continue
+            offset_seconds = self.measure(
+                lambda page=page: self.offset_page(stories_qs, page),
+                repeat,
+            )
+            cursor = self.cursor_before(stories_qs, page)
+            keyset_seconds = self.measure(
+                lambda cursor=cursor: services.get_stories_json(stories_qs, cursor),
+                repeat,
+            )
+            self.stdout.write(
+                f"{page:>8} | {offset_seconds * 1000:>10.2f} | "
+                f"{keyset_seconds * 1000:>10.2f}",
+            )
+
+    def offset_page(self, stories_qs, page):
+        """The previous implementation: Paginator's COUNT(*) and OFFSET."""
+        paginator = Paginator(stories_qs.order_by(*services.STORY_ORDERING), PAGE_SIZE)
+        page_obj = paginator.get_page(page)
+        return list(page_obj), paginator.num_pages
+
+    def cursor_before(self, stories_qs, page):
+        """The cursor a client paging forward would hold when asking for ``page``."""
+        if page == 1:
+            return ""
+        last = stories_qs.order_by(*services.STORY_ORDERING).values(
+            "published_date",
+            "id",
+        )[(page - 1) * PAGE_SIZE - 1]
+        return pagination.encode_cursor([last["published_date"], last["id"]])
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
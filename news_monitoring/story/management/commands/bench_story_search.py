@@ -0,0 +1,229 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.db.models import Q
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import services
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+
+PAGE_SIZE = 10
+BODY_WORDS = 60
+# Common news words, so searches match thousands of stories, and rare ones matching few
+VOCABULARY = [
+    "market",
+    "shares",
+    "rates",
+    "bank",
+    "profit",
+    "quarter",
+    "growth",
+    "investors",
+    "earnings",
+    "deal",
+    "merger",
+    "acquisition",
+    "board",
+    "chief",
+    "executive",
+    "revenue",
+    "forecast",
+    "inflation",
+    "economy",
+    "trade",
+    "tariffs",
+    "energy",
+    "oil",
+    "prices",
+    "supply",
+    "chain",
+    "factory",
+    "workers",
+    "union",
+    "strike",
+    "regulator",
+    "lawsuit",
+    "court",
+    "ruling",
+    "settlement",
+    "launch",
+    "product",
+    "customers",
+    "users",
+    "platform",
+    "software",
+    "cloud",
+    "data",
+    "privacy",
+    "security",
+    "breach",
+    "outage",
+    "network",
+    "expansion",
+    "funding",
+    "startup",
+    "valuation",
+    "bonds",
+    "debt",
+    "dividend",
+    "layoffs",
+    "hiring",
+    "plant",
+    "region",
+    "government",
+    "policy",
+    "election",
+    "minister",
+    "budget",
+    "tax",
+    "subsidy",
+    "climate",
+    "emissions",
+]
+RARE_TERMS = 5_000
+QUERIES = ["merger", "oil prices", "rare42", '"supply chain" strike']
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of substring (icontains) and full-text story search on a "
+        "generated corpus. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stories",
+            type=int,
+            default=1_000_000,
+            help="Stories of the benchmark company.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["stories"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def run(self, count, repeat):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        user.company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+        started = time.perf_counter()
+        self.generate(user, count, tag)
+        self.stdout.write(
+            f"Generated {count} stories in {time.perf_counter() - started:.1f}s",
+        )
+
+        self.stdout.write(
+            f"{'query':<24} | {'matches':>8} | {'icontains title':>15} | "
+            f"{'icontains all':>13} | {'fts recent':>10} | {'fts relevance':>13}  (ms, "
+            "first page)",
+        )
+        for query in QUERIES:
+            old_qs = services.get_stories(user, "", None)
+            title_qs = old_qs.filter(article__title__icontains=query)
+            substring_qs = old_qs.filter(
+                Q(article__title__icontains=query)
+                | Q(article__body_text__icontains=query),
+            )
+            search_qs = services.get_stories(user, query, None)
+            timings = [
+                self.measure(
+                    lambda qs=title_qs: services.get_stories_json(qs, ""),
+                    repeat,
+                ),
+                self.measure(
+                    lambda qs=substring_qs: services.get_stories_json(qs, ""),
+                    repeat,
+                ),
+                self.measure(
+                    lambda qs=search_qs: services.get_stories_json(qs, ""),
+                    repeat,
+                ),
+                self.measure(
+                    lambda qs=search_qs: services.get_stories_json(
+                        qs,
+                        "",
+                        services.RELEVANCE,
+                    ),
+                    repeat,
+                ),
+            ]
+            self.stdout.write(
+                f"{query:<24} | {search_qs.count():>8} | {timings[0] * 1000:>15.2f} | "
+                f"{timings[1] * 1000:>13.2f} | {timings[2] * 1000:>10.2f} | "
+                f"{timings[3] * 1000:>13.2f}",
+            )
+
+    def generate(self, user, count, tag):
+        """Insert ``count`` stories of pseudo-random words in one statement."""
+        words = f"(ARRAY[{', '.join(f"'{word}'" for word in VOCABULARY)}])"
+        pick = (
+            f"{words}[1 + mod(abs(hashint4(i * {BODY_WORDS + 1} + j)), "
+            f"{len(VOCABULARY)})]"
+        )
+        rare = f"'rare' || mod(abs(hashint4(-i)), {RARE_TERMS})"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH articles AS (
+                    INSERT INTO {Article._meta.db_table} (
+                        title, body_text, excerpt, article_url, article_url_hash,
+                        canonical, published_date, added_on,
+                        fingerprint, fingerprint_bands
+                    )
+                    SELECT
+                        'Story ' || i || ' '
+                            || array_to_string(
+                                ARRAY(SELECT {pick} FROM generate_series(1, 6) j), ' '
+                            ),
+                        body, left(body, 100) || '...',
+                        %(url)s || i, i, true, DATE '2020-01-01' + i / 500, now(),
+                        '{{}}', '{{}}'
+                    FROM generate_series(1, %(count)s) i,
+                        LATERAL (SELECT array_to_string(
+                                     ARRAY(
+                                         SELECT {pick}
+                                         FROM generate_series(7, {BODY_WORDS}) j
+                                     ),
+                                     ' '
+                                 ) || ' ' || {rare} AS body) bodies
+                    RETURNING id, article_url_hash, published_date
+                )
+                INSERT INTO {Story._meta.db_table} (
+                    article_id, article_url_hash, published_date, added_on, updated_on,
+                    company_id, added_by_id
+                )
+                SELECT id, article_url_hash, published_date, now(), now(), %(company)s,
+                    %(user)s
+                FROM articles
+                """,  # noqa: S608
+                {
+                    "url": f"https://bench.example.com/{tag}/",
+                    "company": user.company_id,
+                    "user": user.id,
+                    "count": count,
+                },
+            )
+            cursor.execute(f"ANALYZE {Article._meta.db_table}, {Story._meta.db_table}")
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
@@ -0,0 +1,191 @@
+import datetime
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import JsonResponse
+
+from news_monitoring.company import services as company_services
+from news_monitoring.company.models import Company
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.story.models import make_excerpt
+from news_monitoring.users.models import User
+from news_monitoring.utils import pagination
+from news_monitoring.utils.responses import FastJsonResponse
+
+SENTENCE = (
+    "Shares of the company rose after it reported quarterly earnings ahead of analyst "
+    "forecasts. "
+)
+BODY = SENTENCE * 20
+
+
+def legacy_stories_response(stories_qs, page_size):
+    """The old implementation: models, prefetching, Python excerpts, JsonResponse."""
+    stories_qs = (
+        stories_qs.select_related("company", "article")
+        .prefetch_related(
+            Prefetch("tagged_companies", queryset=Company.objects.only("id", "name")),
+        )
+        .only(
+            "id",
+            "published_date",
+            "company_id",
+            "article__title",
+            "article__article_url",
+            "article__body_text",
+        )
+    )
+    page_obj = pagination.paginate(stories_qs, services.STORY_ORDERING, "", page_size)
+    return JsonResponse(
+        {
+            "stories": [
+                {
+                    "id": story.id,
+                    "title": story.article.title,
+                    "article_url": story.article.article_url,
+                    "published_date": story.published_date.strftime("%Y-%m-%d"),
+                    "body_text": make_excerpt(story.article.body_text),
+                    "tagged_companies": [
+                        company.name for company in story.tagged_companies.all()
+                    ],
+                }
+                for story in page_obj.items
+            ],
+            "has_next": page_obj.has_next,
+            "has_previous": page_obj.has_previous,
+            "next_cursor": page_obj.next_cursor,
+            "previous_cursor": page_obj.previous_cursor,
+        },
+    )
+
+
+def lean_stories_response(stories_qs, page_size):
+    return FastJsonResponse(
+        services.get_stories_json(stories_qs, "", page_size=page_size),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of building one story list page as model instances with "
+        "JsonResponse and as database-built values with orjson. All data is rolled "
+        "back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Stories per page.",
+        )
+        parser.add_argument(
+            "--tags",
+            type=int,
+            default=3,
+            help="Tagged companies per story.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Runs per measurement; the best is kept.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["page_size"], options["tags"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def run(self, page_size, tags, repeat):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(email=f"bench-{tag}@example.com", password=None)
+        user.company = Company.objects.create(
+            name=f"bench-{tag}",
+            domain=f"https://bench-{tag}.example.com",
+        )
+        tagged = [
+            Company.objects.create(
+                name=f"Tagged {tag} {i}",
+                domain=f"https://tagged-{tag}-{i}.example.com",
+            )
+            for i in range(tags)
+        ]
+        articles = Article.objects.bulk_create(
+            Article(
+                title=f"Story {i}",
+                body_text=BODY,
+                excerpt=make_excerpt(BODY),
+                article_url=f"https://bench.example.com/{tag}/{i}",
+                article_url_hash=url_hash(f"https://bench.example.com/{tag}/{i}"),
+                published_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i),
+            )
+            for i in range(page_size * 2)
+        )
+        Story.objects.bulk_create(
+            Story(
+                article=article,
+                article_url_hash=article.article_url_hash,
+                published_date=article.published_date,
+                company=user.company,
+                added_by=user,
+            )
+            for article in articles
+        )
+        story_ids = Story.objects.filter(company=user.company).values_list(
+            "id",
+            flat=True,
+        )
+        company_services.tag_companies(
+            Story.tagged_companies,
+            story_ids,
+            [company.id for company in tagged],
+        )
+
+        stories_qs = services.get_stories(user, "", None)
+        legacy = legacy_stories_response(stories_qs, page_size)
+        lean = lean_stories_response(stories_qs, page_size)
+        same = self.normalized(legacy) == self.normalized(lean)
+        self.stdout.write(
+            f"Same data: {same} ({len(legacy.content):,} vs {len(lean.content):,} "
+            "bytes)",
+        )
+
+        legacy_seconds = self.measure(
+            lambda: legacy_stories_response(stories_qs, page_size),
+            repeat,
+        )
+        lean_seconds = self.measure(
+            lambda: lean_stories_response(stories_qs, page_size),
+            repeat,
+        )
+        self.stdout.write(f"{'path':<8} | {'ms/page':>8}")
+        self.stdout.write(f"{'legacy':<8} | {legacy_seconds * 1000:>8.2f}")
+        self.stdout.write(f"{'lean':<8} | {lean_seconds * 1000:>8.2f}")
+        self.stdout.write(f"Speedup: {legacy_seconds / lean_seconds:.1f}x")
+
+    def normalized(self, response):
+        """
+        The response data, with tags in name order.
+
+        The legacy prefetch returns them in no particular order.
+        """
+        data = json.loads(response.content)
+        for story in data["stories"]:
+            story["tagged_companies"].sort()
+        return data
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
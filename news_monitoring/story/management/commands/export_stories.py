@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from news_monitoring.story import export
+from news_monitoring.story.models import Story
+from news_monitoring.story.services import parse_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the stories of a company (or of every company) as NDJSON or CSV to a "
+        "file or stdout, streamed in constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company",
+            type=int,
+            dest="company_id",
+            help="Only the stories of this company id.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=export.FORMATS,
+            default=export.NDJSON,
+            dest="export_format",
+        )
+        parser.add_argument("--output", help="File to write; stdout when omitted.")
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            help="First published date (YYYY-MM-DD), inclusive.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            help="Last published date (YYYY-MM-DD), inclusive.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=export.BATCH_SIZE,
+            help="Stories per fetch.",
+        )
+
+    def handle(self, *args, **options):
+        stories_qs = Story.objects.all()
+        if options["company_id"]:
+            stories_qs = stories_qs.filter(company_id=options["company_id"])
+        try:
+            date_from, date_to = (
+                parse_day(options["date_from"]),
+                parse_day(options["date_to"]),
+            )
+        except ValueError as e:
+            msg = f"Invalid date: {e}"
+            raise CommandError(msg) from e
+        if date_from:
+            stories_qs = stories_qs.filter(published_date__gte=date_from)
+        if date_to:
+            stories_qs = stories_qs.filter(published_date__lte=date_to)
+
+        chunks = export.export_stories(
+            stories_qs,
+            options["export_format"],
+            options["batch_size"],
+        )
+        if options["output"]:
+            with Path(options["output"]).open("wb") as output:
+                output.writelines(chunks)
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+            self.stdout.flush()
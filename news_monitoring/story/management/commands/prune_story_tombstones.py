@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from news_monitoring.story import changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of stories deleted more than STORY_TOMBSTONE_DAYS ago; "
+        "the changes feed refuses cursors that old anyway."
+    )
+
+    def handle(self, *args, **options):
+        pruned = changes.prune(timezone.now() - changes.retention())
+        self.stdout.write(f"{pruned} story tombstones pruned")
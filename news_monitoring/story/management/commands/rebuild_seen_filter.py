@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import seen
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the seen filters of feed imports from the stories, dropping the "
+        "hashes of deleted stories and adding the ones of stories written around the "
+        "services."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company",
+            type=int,
+            dest="company_id",
+            help="Only the filter of this company id.",
+        )
+
+    def handle(self, *args, **options):
+        backend = seen.get_settings()[0]
+        if backend != seen.REDIS:
+            # Nothing outlives the process: local filters are built on first use
+            self.stdout.write(
+                f"The {backend} seen filter backend keeps no filters to rebuild.",
+            )
+            return
+
+        company_ids = Company.objects.order_by("id").values_list("id", flat=True)
+        if options["company_id"]:
+            company_ids = company_ids.filter(id=options["company_id"])
+        self.stdout.write(
+            f"{'company':>8} | {'stories':>9} | {'est. false positives':>20}",
+        )
+        for company_id in company_ids:
+            bloom, count = seen.rebuild(company_id)
+            self.stdout.write(
+                f"{company_id:>8} | {count:>9,} | {bloom.error_rate():>20.3%}",
+            )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news_monitoring.company.models import Company
+from news_monitoring.story import facets
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the story counts per day, source and tagged company from the "
+        "stories, fixing any drift of the incrementally maintained facet tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company",
+            type=int,
+            dest="company_id",
+            help="Only the counts of this company id.",
+        )
+
+    def handle(self, *args, **options):
+        companies = (
+            Company.objects.filter(id=options["company_id"])
+            if options["company_id"]
+            else None
+        )
+        with transaction.atomic():
+            rows = facets.rebuild(companies)
+        for table, count in rows.items():
+            self.stdout.write(f"{table}: {count} rows")
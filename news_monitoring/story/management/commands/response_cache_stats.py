@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from news_monitoring.utils import response_cache
+
+
+class Command(BaseCommand):
+    help = "Print the hit rate of the story and source list response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'namespace':<10} | {'hits':>10} | {'misses':>10} | {'hit rate':>8}",
+        )
+        for namespace, stats in response_cache.get_stats().items():
+            self.stdout.write(
+                f"{namespace:<10} | {stats['hits']:>10} | {stats['misses']:>10} | "
+                f"{stats['hit_rate']:>8.1%}",
+            )
+        if options["reset"]:
+            response_cache.reset_stats()
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from news_monitoring.story import seen
+
+
+class Command(BaseCommand):
+    help = (
+        "Print how often the seen filters of feed imports ruled entries out and saved "
+        "the dedup lookup, net of the queries local filters spent catching up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = seen.get_stats()
+        self.stdout.write(
+            f"{'checked':>10} | {'ruled out':>10} | {'false pos.':>10} | "
+            f"{'fp rate':>8} | {'lookups':>10} | {'avoided':>10} | "
+            f"{'catch-up q.':>11} | {'saved':>10}",
+        )
+        self.stdout.write(
+            f"{stats[seen.CHECKED]:>10} | {stats[seen.RULED_OUT]:>10} | "
+            f"{stats[seen.FALSE_POSITIVES]:>10} | {stats['false_positive_rate']:>8.2%} "
+            f"| {stats[seen.LOOKUPS]:>10} | {stats[seen.AVOIDED]:>10} | "
+            f"{stats[seen.CATCH_UP_QUERIES]:>11} | {stats['queries_saved']:>10}",
+        )
+        if options["reset"]:
+            seen.reset_stats()
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.13 on 2026-10-18 16:25
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_rename_company_url_company_domain_and_more'),
+        ('source', '0005_source_poll_schedule'),
+        ('story', '0004_alter_story_article_url_alter_story_tagged_companies'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='story',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='story.story'),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='fingerprint',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='fingerprint_bands',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, size=None),
+        ),
+        migrations.AlterField(
+            model_name='story',
+            name='tagged_companies',
+            field=models.ManyToManyField(related_name='tagged_stories', to='company.company'),
+        ),
+        migrations.AddIndex(
+            model_name='story',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['fingerprint_bands'], name='story_fingerprint_bands_gin'),
+        ),
+    ]
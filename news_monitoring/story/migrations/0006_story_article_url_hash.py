@@ -0,0 +1,60 @@
+import hashlib
+
+from django.db import migrations, models
+
+from news_monitoring.story.canonical import canonicalize_url
+from news_monitoring.story.canonical import url_hash
+
+BATCH_SIZE = 2000
+
+
+def backfill_article_url_hash(apps, schema_editor):
+    """
+    Canonicalize the URL of every story and store its hash.
+
+    Stories whose URLs only differed by tracking parameters, scheme and the like
+    now collide: the oldest one keeps the canonical URL, the others keep their raw
+    URL, are keyed on its hash and are linked to the oldest as duplicates.
+    """
+    Story = apps.get_model("story", "Story")
+    originals = {}
+    last_id = 0
+    while True:
+        stories = list(
+            Story.objects.filter(id__gt=last_id).order_by("id").only("id", "company_id", "article_url")[:BATCH_SIZE]
+        )
+        if not stories:
+            return
+        last_id = stories[-1].id
+
+        for story in stories:
+            key = (story.company_id, url_hash(story.article_url))
+            if key in originals:
+                story.article_url_hash = hash_raw_url(story.article_url)
+                story.duplicate_of_id = originals[key]
+            else:
+                originals[key] = story.id
+                story.article_url = canonicalize_url(story.article_url)
+                story.article_url_hash = key[1]
+        Story.objects.bulk_update(stories, ["article_url", "article_url_hash", "duplicate_of"])
+
+
+def hash_raw_url(url):
+    # Keyed apart from the canonical URL so the unique index still holds
+    return int.from_bytes(hashlib.blake2b(f"raw:{url}".encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0005_story_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='story',
+            name='article_url_hash',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_article_url_hash, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_rename_company_url_company_domain_and_more'),
+        ('story', '0006_story_article_url_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='story',
+            name='article_url_hash',
+            field=models.BigIntegerField(editable=False),
+        ),
+        migrations.AlterUniqueTogether(
+            name='story',
+            unique_together={('company', 'article_url_hash')},
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.13 on 2026-10-18 16:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_rename_company_url_company_domain_and_more'),
+        ('source', '0005_source_poll_schedule'),
+        ('story', '0007_alter_story_article_url_hash_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(condition=models.Q(('duplicate_of__isnull', True)), fields=['company', 'published_date', 'id'], name='story_company_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(condition=models.Q(('duplicate_of__isnull', True)), fields=['published_date', 'id'], name='story_published_idx'),
+        ),
+    ]
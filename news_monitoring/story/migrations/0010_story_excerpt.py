@@ -0,0 +1,18 @@
+# Generated by Django 5.0.13 on 2026-10-18 16:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0009_story_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='story',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=103),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.13 on 2026-10-18 17:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_trgm'),
+        ('source', '0006_source_name_trgm'),
+        ('story', '0010_story_excerpt'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['source', 'published_date'], name='story_source_published_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.13 on 2026-10-18 17:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_trgm'),
+        ('source', '0006_source_name_trgm'),
+        ('story', '0011_story_source_published_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoryDayCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='company.company')),
+            ],
+            options={
+                'unique_together': {('company', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StorySourceCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='company.company')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='source.source')),
+            ],
+            options={
+                'unique_together': {('company', 'source')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StoryTagCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='company.company')),
+                ('tagged_company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='company.company')),
+            ],
+            options={
+                'unique_together': {('company', 'tagged_company')},
+            },
+        ),
+    ]
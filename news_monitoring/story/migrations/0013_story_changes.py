@@ -0,0 +1,39 @@
+# Generated by Django 5.0.13 on 2026-10-18 18:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_trgm'),
+        ('source', '0006_source_name_trgm'),
+        ('story', '0012_story_facet_counts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoryTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('story_id', models.BigIntegerField()),
+                ('deleted_on', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['company', 'updated_on', 'id'], name='story_company_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='storytombstone',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='company.company'),
+        ),
+        migrations.AddIndex(
+            model_name='storytombstone',
+            index=models.Index(fields=['company', 'deleted_on', 'id'], name='story_tombstone_company_idx'),
+        ),
+    ]
@@ -0,0 +1,157 @@
+# Generated by Django 5.0.13 on 2026-10-18 18:25
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Feed stories share one canonical article per URL hash: the oldest unedited
+# story's content. Edited stories and stories written by hand get a private
+# article each, numbered in advance so each story can be pointed at its own.
+FORWARD_SQL = """
+-- AddField made the new foreign key immediate; the private articles are inserted after their stories point at them
+SET CONSTRAINTS ALL DEFERRED;
+
+INSERT INTO story_article (
+    article_url, article_url_hash, canonical, title, body_text, published_date, added_on, excerpt, fingerprint,
+    fingerprint_bands
+)
+SELECT DISTINCT ON (article_url_hash)
+    article_url, article_url_hash, TRUE, title, body_text, published_date, added_on, excerpt, fingerprint,
+    fingerprint_bands
+FROM story_story
+WHERE source_id IS NOT NULL AND updated_by_id IS NULL
+ORDER BY article_url_hash, id;
+
+UPDATE story_story story SET article_id = article.id
+FROM story_article article
+WHERE article.canonical AND article.article_url_hash = story.article_url_hash
+    AND story.updated_by_id IS NULL
+    AND (article.article_url, article.title, article.body_text, article.published_date)
+        = (story.article_url, story.title, story.body_text, story.published_date);
+
+UPDATE story_story SET article_id = nextval(pg_get_serial_sequence('story_article', 'id'))
+WHERE article_id IS NULL;
+
+INSERT INTO story_article (
+    id, article_url, article_url_hash, canonical, title, body_text, published_date, added_on, excerpt, fingerprint,
+    fingerprint_bands
+)
+SELECT
+    article_id, article_url, article_url_hash, FALSE, title, body_text, published_date, added_on, excerpt,
+    fingerprint, fingerprint_bands
+FROM story_story story
+WHERE NOT EXISTS (SELECT FROM story_article article WHERE article.id = story.article_id);
+
+-- Check the deferred foreign keys now, so the columns can be dropped in this transaction
+SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+REVERSE_SQL = """
+UPDATE story_story story SET
+    article_url = article.article_url, title = article.title, body_text = article.body_text,
+    excerpt = article.excerpt, fingerprint = article.fingerprint, fingerprint_bands = article.fingerprint_bands
+FROM story_article article
+WHERE article.id = story.article_id;
+
+SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_trgm'),
+        ('source', '0006_source_name_trgm'),
+        ('story', '0013_story_changes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Article',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('article_url', models.URLField(max_length=500)),
+                ('article_url_hash', models.BigIntegerField(editable=False)),
+                ('canonical', models.BooleanField(default=True)),
+                ('title', models.CharField(max_length=255)),
+                ('body_text', models.TextField()),
+                ('published_date', models.DateField()),
+                ('added_on', models.DateTimeField(auto_now_add=True)),
+                ('excerpt', models.CharField(blank=True, default='', editable=False, max_length=103)),
+                ('search_vector', models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('body_text', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField())),
+                ('fingerprint', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None)),
+                ('fingerprint_bands', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, size=None)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['fingerprint_bands'], name='article_fingerprint_bands_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='article_search_vector_gin'),
+        ),
+        migrations.AddConstraint(
+            model_name='article',
+            constraint=models.UniqueConstraint(condition=models.Q(('canonical', True)), fields=('article_url_hash',), name='article_canonical_url_hash_uniq'),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='article',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='stories', to='story.article'),
+        ),
+        migrations.RunSQL(FORWARD_SQL, REVERSE_SQL),
+        migrations.AlterField(
+            model_name='story',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stories', to='story.article'),
+        ),
+        migrations.RemoveIndex(
+            model_name='story',
+            name='story_fingerprint_bands_gin',
+        ),
+        migrations.RemoveIndex(
+            model_name='story',
+            name='story_search_vector_gin',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='search_vector',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='article_url',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='body_text',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='excerpt',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='fingerprint',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='fingerprint_bands',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='title',
+        ),
+        migrations.AlterField(
+            model_name='story',
+            name='company',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stories', to='company.company'),
+        ),
+        migrations.AlterField(
+            model_name='story',
+            name='source',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stories', to='source.source'),
+        ),
+    ]
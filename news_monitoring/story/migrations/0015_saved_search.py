@@ -0,0 +1,49 @@
+# Generated by Django 5.0.13 on 2026-10-18 18:57
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0004_company_alias'),
+        ('story', '0014_article'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('query', models.CharField(max_length=500)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('anchors', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), editable=False, size=None)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='company.company')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('read_on', models.DateTimeField(blank=True, null=True)),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='story.savedsearch')),
+                ('story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='story.story')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=django.contrib.postgres.indexes.GinIndex(fastupdate=False, fields=['anchors'], name='savedsearch_anchors_gin'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchnotification',
+            unique_together={('saved_search', 'story')},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.13 on 2026-10-18 20:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0015_saved_search'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='savedsearch',
+            name='company',
+        ),
+    ]
@@ -1,27 +1,308 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+
 from news_monitoring.company.models import Company
 from news_monitoring.source.models import Source
+from news_monitoring.story.canonical import canonicalize_url
+from news_monitoring.story.canonical import url_hash
 from news_monitoring.users.models import User
 
+SEARCH_CONFIG = "english"
+EXCERPT_LENGTH = 100
+
+
+def make_excerpt(body_text):
+    """Return a body's preview for list pages: its start, with "..." when cut."""
+    return (
+        body_text[:EXCERPT_LENGTH] + "..."
+        if len(body_text) > EXCERPT_LENGTH
+        else body_text
+    )
+
+
+class Article(models.Model):
+    """
+    The content of a news article, stored once for every company that follows it.
+
+    Feed imports share one *canonical* article per URL hash across companies. A
+    story a user writes or edits gets a private (non-canonical) article of its own,
+    so edits never leak into another company's stories.
+    """
+
+    article_url = models.URLField(max_length=500)
+    # Dedup key; see story.canonical
+    article_url_hash = models.BigIntegerField(editable=False)
+    canonical = models.BooleanField(default=True)
+
+    title = models.CharField(max_length=255)
+    body_text = models.TextField()
+    published_date = models.DateField()
+    added_on = models.DateTimeField(auto_now_add=True)
+    # What list pages show of body_text, so they never read the (TOASTed) body itself
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH + 3,
+        blank=True,
+        default="",
+        editable=False,
+    )
+
+    # Full-text index of the title (weight A) and body (weight B), kept by PostgreSQL
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("body_text", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # MinHash signature of the body and its LSH band keys; see story.fingerprints
+    fingerprint = ArrayField(models.IntegerField(), default=list, blank=True)
+    fingerprint_bands = ArrayField(models.BigIntegerField(), default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article_url_hash"],
+                condition=Q(canonical=True),
+                name="article_canonical_url_hash_uniq",
+            ),
+        ]
+        indexes = [
+            GinIndex(
+                fields=["fingerprint_bands"],
+                name="article_fingerprint_bands_gin",
+            ),
+            GinIndex(fields=["search_vector"], name="article_search_vector_gin"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        # bulk_create() skips this, so bulk inserts set these fields themselves
+        self.article_url = canonicalize_url(self.article_url)
+        self.article_url_hash = url_hash(self.article_url)
+        self.excerpt = make_excerpt(self.body_text or "")
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            derived = {"article_url": "article_url_hash", "body_text": "excerpt"}
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(derived[f] for f in update_fields if f in derived),
+            }
+        super().save(*args, **kwargs)
+
 
 class Story(models.Model):
+    """A company's link to an article: tagging, source, audit and duplicate status."""
+
     tagged_companies = models.ManyToManyField(Company, related_name="tagged_stories")
 
-    source = models.ForeignKey(Source, on_delete=models.CASCADE, related_name="stories", null=True, blank=True)
-    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="stories")
-    added_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="added_stories")
-    updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="updated_stories")
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.PROTECT,
+        related_name="stories",
+    )
+    # Both lead composite indexes below, so neither needs one of its own
+    source = models.ForeignKey(
+        Source,
+        on_delete=models.CASCADE,
+        related_name="stories",
+        null=True,
+        blank=True,
+        db_index=False,
+    )
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="stories",
+        db_index=False,
+    )
+    added_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="added_stories",
+    )
+    updated_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="updated_stories",
+    )
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates",
+    )
 
-    published_date = models.DateField()
     added_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
 
-    title = models.CharField(max_length=255)
-    body_text = models.TextField()
-    article_url = models.URLField(max_length=500)
+    # Copies of the article's, so dedup and the list pages stay on this table's indexes
+    published_date = models.DateField()
+    article_url_hash = models.BigIntegerField(editable=False)
 
     class Meta:
-        unique_together = ("company", "article_url")  # Ensuring uniqueness per company
+        # Ensuring uniqueness per company
+        unique_together = ("company", "article_url_hash")
+        indexes = [
+            # Keyset pagination of the story list, which only shows originals
+            models.Index(
+                fields=["company", "published_date", "id"],
+                condition=Q(duplicate_of__isnull=True),
+                name="story_company_published_idx",
+            ),
+            models.Index(
+                fields=["published_date", "id"],
+                condition=Q(duplicate_of__isnull=True),
+                name="story_published_idx",
+            ),
+            # A source's stories by date
+            models.Index(
+                fields=["source", "published_date"],
+                name="story_source_published_idx",
+            ),
+            # The changes feed, which walks a company's stories in update order
+            models.Index(
+                fields=["company", "updated_on", "id"],
+                name="story_company_updated_idx",
+            ),
+        ]
 
     def __str__(self):
-        return self.title
+        return str(self.article)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        # bulk_create() skips this, so bulk inserts copy the article's fields themselves
+        if update_fields is None or "article" in update_fields:
+            self.published_date = self.article.published_date
+            self.article_url_hash = self.article.article_url_hash
+        if update_fields is not None:
+            # updated_on too: the changes feed finds edits by it
+            derived = {"article": ("published_date", "article_url_hash")}
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(f for field in update_fields for f in derived.get(field, ())),
+                "updated_on",
+            }
+        super().save(*args, **kwargs)
+
+
+class StoryTombstone(models.Model):
+    """A deleted story, kept for the changes feed (see story.changes) until pruned."""
+
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="+")
+    story_id = models.BigIntegerField()
+    deleted_on = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["company", "deleted_on", "id"],
+                name="story_tombstone_company_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Story {self.story_id} deleted on {self.deleted_on:%Y-%m-%d}"
+
+
+# Story counts the facets endpoint reads instead of grouping stories per request.
+# Only originals are counted, like the story list. See story.facets.
+
+
+class StoryDayCount(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("company", "day")
+
+    def __str__(self):
+        return f"{self.day}: {self.count}"
+
+
+class StorySourceCount(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="+")
+    source = models.ForeignKey(Source, on_delete=models.CASCADE, related_name="+")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("company", "source")
+
+    def __str__(self):
+        return f"Source {self.source_id}: {self.count}"
+
+
+class StoryTagCount(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="+")
+    tagged_company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("company", "tagged_company")
+
+    def __str__(self):
+        return f"Company {self.tagged_company_id}: {self.count}"
+
+
+class SavedSearch(models.Model):
+    """A user's search query, matched against their company's new stories."""
+
+    # Matched against the stories of the user's current company, so a search never
+    # outlives its user's access to a company
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="saved_searches",
+    )
+    name = models.CharField(max_length=100)
+    query = models.CharField(max_length=500)
+    created_on = models.DateTimeField(auto_now_add=True)
+    # A story must contain one of these lexemes to match; see alerts.get_anchors
+    anchors = ArrayField(models.TextField(), editable=False)
+
+    class Meta:
+        # Searches are saved rarely and looked up on every import, so new entries go
+        # straight into the index rather than into a pending list every lookup scans
+        indexes = [
+            GinIndex(
+                fields=["anchors"],
+                name="savedsearch_anchors_gin",
+                fastupdate=False,
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class SearchNotification(models.Model):
+    """A story imported after a saved search was saved that matches it."""
+
+    saved_search = models.ForeignKey(
+        SavedSearch,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+    )
+    story = models.ForeignKey(Story, on_delete=models.CASCADE, related_name="+")
+    created_on = models.DateTimeField(auto_now_add=True)
+    read_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Also makes matching a story twice a no-op
+        unique_together = ("saved_search", "story")
+
+    def __str__(self):
+        return f"{self.saved_search} matched story {self.story_id}"
@@ -0,0 +1,419 @@
+"""
+Bloom filters of each company's stored URL hashes, in front of the feed dedup lookup.
+
+A filter answers "definitely new" for a URL hash without asking the database,
+so the dedup lookup (``services.get_stored_url_hashes``) only asks about the
+possible hits: the stored stories, plus about ``SEEN_FILTER_ERROR_RATE`` of the
+new ones, and a poll whose entries are all new needs no lookup at all. Filters
+are sized for ``SEEN_FILTER_CAPACITY`` stories per company; past that their
+false positive rate grows, which costs lookups but never a wrong answer.
+
+``settings.SEEN_FILTER_BACKEND`` picks where the filters live:
+
+- ``"redis"``: one filter per company shared by every process, in a Redis
+  string whose bits are read and set with one ``BITFIELD`` command per batch.
+  While Redis is unreachable each process uses local filters instead, and sends
+  the hashes it added once Redis answers again.
+- ``"local"``: one filter per company in each process. Since other processes add
+  stories too, it reads the hashes of the company's stories changed since it
+  last did, on the changes feed's index, at most once per
+  ``SEEN_FILTER_CATCH_UP_SECONDS``. It reads from the previous catch-up's
+  ``utils.commits.horizon`` on, so stories that commit after newer ones are not
+  missed. A catch-up costs two queries to save at most one lookup, so the local
+  filters pay off when a company's sources are imported in batches, several
+  polls per window, as the scheduler does; the catch-up queries are counted
+  next to the lookups avoided.
+- ``"off"``: every hash is looked up.
+
+A filter that missed a stored story costs the work of preparing it again: the
+unique ``(company, article_url_hash)`` insert drops the story itself. So the
+services add the hashes of the stories they store (:func:`add`) before their
+transaction commits, and a local filter is only as stale as its catch-up
+window. Writes that bypass them (the admin, raw SQL) or hashes a
+process could not send to Redis before it died are only picked up by ``manage.py
+rebuild_seen_filter``, which also drops the bits of deleted stories. A filter
+key is named after its size, so changing the settings starts new filters, built
+from the stories on first use.
+
+How many hashes were checked, ruled out and looked up in vain, and how many
+queries the local filters spent catching up, is counted in the cache (see
+``manage.py seen_filter_stats``).
+"""
+
+import functools
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import cast
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from news_monitoring.story.models import Story
+from news_monitoring.utils import commits
+
+logger = logging.getLogger(__name__)
+
+REDIS = "redis"
+LOCAL = "local"
+OFF = "off"
+
+# Advisory lock space of filter rebuilds, shared by adds; the second key is the company
+LOCK_CLASS = 0x5EE7
+MASK = (1 << 64) - 1
+
+CHECKED = "checked"
+RULED_OUT = "ruled_out"
+FALSE_POSITIVES = "false_positives"
+LOOKUPS = "lookups"
+AVOIDED = "avoided"
+CATCH_UP_QUERIES = "catch_up_queries"
+STATS = (CHECKED, RULED_OUT, FALSE_POSITIVES, LOOKUPS, AVOIDED, CATCH_UP_QUERIES)
+# The horizon and the read of a local filter's catch-up (or build)
+QUERIES_PER_CATCH_UP = 2
+
+
+def get_settings():
+    """Return the configured ``(backend, bits, hashes)`` of the filters."""
+    backend = getattr(settings, "SEEN_FILTER_BACKEND", LOCAL)
+    capacity = getattr(settings, "SEEN_FILTER_CAPACITY", 100_000)
+    error_rate = getattr(settings, "SEEN_FILTER_ERROR_RATE", 0.01)
+    if backend not in (REDIS, LOCAL, OFF):
+        msg = f"SEEN_FILTER_BACKEND must be {REDIS!r}, {LOCAL!r} or {OFF!r}."
+        raise ImproperlyConfigured(msg)
+    if capacity < 1 or not 0 < error_rate < 1:
+        msg = (
+            "SEEN_FILTER_CAPACITY must be positive and SEEN_FILTER_ERROR_RATE in "
+            "(0, 1)."
+        )
+        raise ImproperlyConfigured(msg)
+    return backend, *filter_size(capacity, error_rate)
+
+
+def filter_size(capacity, error_rate):
+    """Return the bits and hash functions for ``capacity`` hashes at ``error_rate``."""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    return bits, max(1, round(bits / capacity * math.log(2)))
+
+
+def _mix(value):
+    """The splitmix64 finalizer: a second, independent hash of a 64-bit value."""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK
+    return value ^ (value >> 31)
+
+
+def positions(url_hash, bits, hashes):
+    """Return the bit positions of ``url_hash`` for ``bits`` bits, ``hashes`` hashes."""
+    # Double hashing: the URL hash is uniform, so it and its mix give every position
+    first = url_hash & MASK
+    step = _mix(first) | 1
+    return [1 + (first + i * step) % bits for i in range(hashes)]
+
+
+class BloomFilter:
+    """
+    A Bloom filter of URL hashes over a bit string in Redis's bit order.
+
+    Bit 0 says the filter was built from the stories, so a filter Redis evicted
+    or never had reads as not built rather than as empty.
+    """
+
+    def __init__(self, bits, hashes, data=None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray(data or (bits + 8) // 8)
+
+    def positions(self, url_hash):
+        return positions(url_hash, self.bits, self.hashes)
+
+    def _set(self, position):
+        self.data[position >> 3] |= 0x80 >> (position & 7)
+
+    def add(self, url_hash):
+        for position in self.positions(url_hash):
+            self._set(position)
+
+    def __contains__(self, url_hash):
+        return all(
+            self.data[position >> 3] & 0x80 >> (position & 7)
+            for position in self.positions(url_hash)
+        )
+
+    @property
+    def built(self):
+        return bool(self.data[0] & 0x80)
+
+    def mark_built(self):
+        self._set(0)
+
+    def error_rate(self):
+        """Estimate the false positive rate at the current fill."""
+        fill = (int.from_bytes(self.data).bit_count() - self.built) / self.bits
+        return fill**self.hashes
+
+
+def _build(company_id, bits, hashes):
+    """Return a filter of the company's stored stories and how many it holds."""
+    bloom = BloomFilter(bits, hashes)
+    bloom.mark_built()
+    count = 0
+    for url_hash in (
+        Story.objects.filter(company_id=company_id)
+        .values_list("article_url_hash", flat=True)
+        .iterator()
+    ):
+        bloom.add(url_hash)
+        count += 1
+    return bloom, count
+
+
+class LocalFilters:
+    """This process's filters, caught up with the stories changed every so often."""
+
+    def __init__(self, bits, hashes, catch_up_seconds=0):
+        self.bits = bits
+        self.hashes = hashes
+        self.catch_up_seconds = catch_up_seconds
+        # company id: (filter, horizon it was caught up to, monotonic time it was)
+        self._filters = {}
+        self._lock = threading.Lock()
+
+    def possibly_seen(self, company_id, url_hashes):
+        with self._lock:
+            bloom = self._caught_up(company_id)
+            return {url_hash for url_hash in url_hashes if url_hash in bloom}
+
+    def _caught_up(self, company_id):
+        now = time.monotonic()
+        if company_id in self._filters:
+            bloom, checked, caught_up_at = self._filters[company_id]
+            if now - caught_up_at < self.catch_up_seconds:
+                return bloom
+        horizon = commits.horizon(timezone.now())
+        if company_id not in self._filters:
+            bloom, _ = _build(company_id, self.bits, self.hashes)
+        else:
+            # updated_on is set on creation too
+            for url_hash in Story.objects.filter(
+                company_id=company_id,
+                updated_on__gt=checked,
+            ).values_list("article_url_hash", flat=True):
+                bloom.add(url_hash)
+        self._filters[company_id] = (bloom, horizon, now)
+        _count(CATCH_UP_QUERIES, QUERIES_PER_CATCH_UP)
+        return bloom
+
+    def add(self, company_id, url_hashes):
+        with self._lock:
+            if company_id in self._filters:
+                for url_hash in url_hashes:
+                    self._filters[company_id][0].add(url_hash)
+
+    def rebuild(self, company_id):
+        now = timezone.now()
+        bloom, count = _build(company_id, self.bits, self.hashes)
+        with self._lock:
+            self._filters[company_id] = (bloom, now, time.monotonic())
+        return bloom, count
+
+
+class RedisFilters:
+    """Filters shared by every process in Redis; local ones stand in when it is down."""
+
+    def __init__(self, url, bits, hashes, catch_up_seconds=0):
+        self.client = redis.Redis.from_url(url)
+        self.bits = bits
+        self.hashes = hashes
+        self.local = LocalFilters(bits, hashes, catch_up_seconds)
+        # Hashes added while Redis was unreachable, by company id
+        self._unsent = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def key(self, company_id):
+        return f"seen-filter:{self.bits}:{self.hashes}:{company_id}"
+
+    def possibly_seen(self, company_id, url_hashes):
+        url_hashes = list(url_hashes)
+        try:
+            self._send_unsent()
+            found = self._get(company_id, url_hashes)
+            if found is None:  # Not built yet, or evicted
+                self.build(company_id)
+                found = self._get(company_id, url_hashes)
+            return set(url_hashes if found is None else found)
+        except redis.RedisError as error:
+            logger.warning("Seen filter unavailable, using local filters: %s", error)
+            return self.local.possibly_seen(company_id, url_hashes)
+
+    def _get(self, company_id, url_hashes):
+        """Return the hashes the filter may hold, or None if it is not built."""
+        operation = self.client.bitfield(self.key(company_id))
+        operation.get("u1", 0)
+        for url_hash in url_hashes:
+            for position in positions(url_hash, self.bits, self.hashes):
+                operation.get("u1", position)
+        values = cast("list[int]", operation.execute())
+        if not values[0]:
+            return None
+        return [
+            url_hash
+            for index, url_hash in enumerate(url_hashes)
+            if all(values[1 + index * self.hashes : 1 + (index + 1) * self.hashes])
+        ]
+
+    def add(self, company_id, url_hashes):
+        # Shared with rebuild(), which would otherwise replace the bits between
+        # this add and its commit
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock_shared(%s, %s)",
+                [LOCK_CLASS, company_id],
+            )
+        self.local.add(company_id, url_hashes)
+        try:
+            self._send_unsent()
+            self._set(company_id, url_hashes)
+        except redis.RedisError as error:
+            logger.warning(
+                "Seen filter unavailable, keeping the added hashes until it is back: "
+                "%s",
+                error,
+            )
+            with self._lock:
+                self._unsent[company_id].update(url_hashes)
+
+    def _set(self, company_id, url_hashes):
+        operation = self.client.bitfield(self.key(company_id))
+        for url_hash in url_hashes:
+            for position in positions(url_hash, self.bits, self.hashes):
+                operation.set("u1", position, 1)
+        operation.execute()
+
+    def _send_unsent(self):
+        with self._lock:
+            unsent, self._unsent = self._unsent, defaultdict(set)
+        try:
+            while unsent:
+                company_id, url_hashes = unsent.popitem()
+                self._set(company_id, url_hashes)
+        except redis.RedisError:
+            with self._lock:
+                self._unsent[company_id].update(url_hashes)
+                for company_id, url_hashes in unsent.items():
+                    self._unsent[company_id].update(url_hashes)
+            raise
+
+    def build(self, company_id, *, replace=False):
+        """
+        Write the filter of the company's stories; return it and how many it holds.
+
+        Without ``replace`` the bits are merged into the stored ones, so hashes
+        added meanwhile are kept.
+        """
+        bloom, count = _build(company_id, self.bits, self.hashes)
+        key = self.key(company_id)
+        pipeline = self.client.pipeline()
+        if replace:
+            pipeline.set(key, bytes(bloom.data))
+        else:
+            built_key = f"{key}:build:{uuid.uuid4().hex}"
+            pipeline.set(built_key, bytes(bloom.data))
+            pipeline.bitop("OR", key, key, built_key)
+            pipeline.delete(built_key)
+        pipeline.execute()
+        return bloom, count
+
+    def rebuild(self, company_id):
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Waits for the transactions that added hashes to commit, so their
+            # stories are read below
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [LOCK_CLASS, company_id],
+            )
+            return self.build(company_id, replace=True)
+
+
+@functools.cache
+def get_filters():
+    """Return the filters of ``settings.SEEN_FILTER_BACKEND``, None when off."""
+    backend, bits, hashes = get_settings()
+    catch_up_seconds = getattr(settings, "SEEN_FILTER_CATCH_UP_SECONDS", 30)
+    if backend == REDIS:
+        return RedisFilters(settings.REDIS_URL, bits, hashes, catch_up_seconds)
+    if backend == LOCAL:
+        return LocalFilters(bits, hashes, catch_up_seconds)
+    return None
+
+
+def possibly_seen(company_id, url_hashes):
+    """Return the ``url_hashes`` the company may have stored; the others are new."""
+    filters = get_filters()
+    return (
+        set(url_hashes)
+        if filters is None
+        else filters.possibly_seen(company_id, url_hashes)
+    )
+
+
+def add(company_id, url_hashes):
+    """Add the hashes of stories being stored for the company, in their transaction."""
+    filters = get_filters()
+    if filters is not None and url_hashes:
+        filters.add(company_id, url_hashes)
+
+
+def rebuild(company_id):
+    """Rebuild the company's filter from its stories; return it and its hash count."""
+    return get_filters().rebuild(company_id)
+
+
+def _count(stat, amount):
+    key = f"seen-filter:stats:{stat}"
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, amount)
+    except ValueError:  # Evicted between the two calls
+        cache.set(key, amount, timeout=None)
+
+
+def record(checked, possible, stored):
+    """Count a lookup: ``checked`` hashes, ``possible`` filter hits, ``stored`` ones."""
+    if not checked:
+        return
+    for stat, amount in (
+        (CHECKED, checked),
+        (RULED_OUT, checked - possible),
+        (FALSE_POSITIVES, possible - stored),
+        (LOOKUPS if possible else AVOIDED, 1),
+    ):
+        if amount:
+            _count(stat, amount)
+
+
+def get_stats():
+    """
+    Return the counters since the last reset, with derived figures.
+
+    ``false_positive_rate`` is the share of new hashes the filter let through to
+    the lookup, and ``queries_saved`` the lookups avoided less the queries spent
+    catching local filters up.
+    """
+    stats = {stat: cache.get(f"seen-filter:stats:{stat}", 0) for stat in STATS}
+    new = stats[RULED_OUT] + stats[FALSE_POSITIVES]
+    stats["false_positive_rate"] = stats[FALSE_POSITIVES] / new if new else 0.0
+    stats["queries_saved"] = stats[AVOIDED] - stats[CATCH_UP_QUERIES]
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([f"seen-filter:stats:{stat}" for stat in STATS])
@@ -1,15 +1,59 @@
-from django.core.paginator import Paginator
-from django.db import transaction, IntegrityError
-from django.db.models import Prefetch
-from django.http import JsonResponse
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.db import IntegrityError
+from django.db import connection
+from django.db import transaction
+from django.db.models import CharField
+from django.db.models import F
+from django.db.models import FloatField
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models.functions import Cast
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from news_monitoring.company.models import Company
+from news_monitoring.company import services as company_services
+from news_monitoring.story import alerts
+from news_monitoring.story import changes
+from news_monitoring.story import facets
+from news_monitoring.story import fingerprints
+from news_monitoring.story import seen
+from news_monitoring.story.models import SEARCH_CONFIG
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import SavedSearch
+from news_monitoring.story.models import SearchNotification
 from news_monitoring.story.models import Story
+from news_monitoring.story.models import StoryDayCount
+from news_monitoring.story.models import StorySourceCount
+from news_monitoring.story.models import StoryTagCount
+from news_monitoring.story.models import StoryTombstone
+from news_monitoring.utils import commits
+from news_monitoring.utils import pagination
+from news_monitoring.utils import response_cache
+
+RECENT = "recent"
+RELEVANCE = "relevance"
+STORY_ORDERING = ("-published_date", "-id")
+RELEVANCE_ORDERING = ("-rank", "-id")
+PAGE_SIZE = 10
+FACET_DAYS = 30
+FACET_LIMIT = 20
+CHANGES_PAGE_SIZE = 100
+NOTIFICATIONS_PAGE_SIZE = 20
+NOTIFICATION_ORDERING = ("-id",)
 
 
 def get_story(user, story_id):
-    story_qs = Story.objects.prefetch_related("tagged_companies")
+    story_qs = Story.objects.select_related("article").prefetch_related(
+        "tagged_companies",
+    )
 
     if not user.is_staff:
         story_qs = story_qs.select_related("company")
@@ -20,71 +64,497 @@ def get_story(user, story_id):
     return story_obj, tagged_companies
 
 
-def get_stories(user, search_query, filter_date):
-    """Fetch and filter stories based on search query and date."""
-    stories_qs = Story.objects.select_related("company").prefetch_related(
-        Prefetch("tagged_companies", queryset=Company.objects.only("id", "name"))
-    ).only("id", "title", "article_url", "published_date", "body_text", "company_id")
+def get_existing_url_hashes(company, url_hashes, batch_size=1000):
+    """Return the ``url_hashes`` already stored for ``company``, a query per batch."""
+    url_hashes = list(set(url_hashes))
+    existing: set[int] = set()
+
+    for start in range(0, len(url_hashes), batch_size):
+        existing.update(
+            Story.objects.filter(
+                company=company,
+                article_url_hash__in=url_hashes[start : start + batch_size],
+            ).values_list("article_url_hash", flat=True),
+        )
+
+    return existing
+
+
+def get_stored_url_hashes(company, url_hashes):
+    """
+    Return the ``url_hashes`` stored for ``company``, looking up only possible hits.
+
+    The company's seen filter (``story.seen``) rules out the hashes that are
+    definitely new, and the lookup is skipped when it rules out all of them.
+    """
+    url_hashes = set(url_hashes)
+    possible = seen.possibly_seen(company.id, url_hashes)
+    stored = get_existing_url_hashes(company, possible) if possible else set()
+    seen.record(len(url_hashes), len(possible), len(stored))
+    return stored
+
+
+def get_or_create_canonical_articles(articles):
+    """
+    Return ``{url hash: (id, published date)}`` of the canonical ``articles``.
+
+    Articles another company already stored are reused as they are; only the
+    missing ones are inserted, in one batch.
+    """
+
+    def lookup(url_hashes):
+        return {
+            url_hash: (article_id, published_date)
+            for url_hash, article_id, published_date in Article.objects.filter(
+                canonical=True,
+                article_url_hash__in=url_hashes,
+            ).values_list("article_url_hash", "id", "published_date")
+        }
+
+    canonical = lookup([article.article_url_hash for article in articles])
+    missing = [
+        article for article in articles if article.article_url_hash not in canonical
+    ]
+    if missing:
+        # Another import may insert some concurrently
+        Article.objects.bulk_create(missing, ignore_conflicts=True)
+        canonical.update(lookup([article.article_url_hash for article in missing]))
+    return canonical
+
+
+def insert_new_stories(stories, batch_size=1000):
+    """
+    Insert the unsaved ``stories`` their company has not stored yet.
+
+    Like ``bulk_create(ignore_conflicts=True)``, but it reports which rows were
+    written: a concurrent import, or a lookup the seen filter got wrong, may have
+    stored some of them already, and those must not be tagged or counted again.
+
+    Returns:
+        dict: ``{url hash: id}`` of the inserted stories.
+    """
+    fields = [
+        field
+        for field in Story._meta.local_fields
+        if field.concrete and not field.primary_key
+    ]
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    row = f"({', '.join(['%s'] * len(fields))})"
+    inserted = {}
+    with connection.cursor() as cursor:
+        for start in range(0, len(stories), batch_size):
+            batch = stories[start : start + batch_size]
+            cursor.execute(
+                f"""
+                INSERT INTO {Story._meta.db_table} ({columns})
+                VALUES {", ".join([row] * len(batch))}
+                ON CONFLICT DO NOTHING
+                RETURNING article_url_hash, id
+                """,  # noqa: S608
+                [
+                    field.get_db_prep_save(field.pre_save(story, add=True), connection)
+                    for story in batch
+                    for field in fields
+                ],
+            )
+            inserted.update(cursor.fetchall())
+    return inserted
+
+
+def parse_day(value):
+    """
+    Return the date of a ``YYYY-MM-DD`` request parameter, or None when it is empty.
+
+    Raises:
+        ValueError: The value is not a valid date.
+    """
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+    return day
+
+
+def get_stories(user, search_query, filter_date, date_from=None, date_to=None):
+    """
+    Fetch and filter stories based on search query and date.
+
+    ``filter_date`` keeps the stories of one day; ``date_from`` and ``date_to``
+    keep an inclusive range, open on a side left as None. All three are dates.
+
+    The search query runs against the full-text index of title and body, in web
+    search syntax (quoted phrases, ``or``, ``-word``), and annotates each match
+    with its ``rank``.
+    """
+    # Near duplicates are listed through their original
+    stories_qs = Story.objects.filter(duplicate_of__isnull=True)
 
     if not user.is_staff:
-        stories_qs = stories_qs.filter(company=user.company)
+        stories_qs = stories_qs.filter(company_id=user.company_id)
 
     if search_query:
-        stories_qs = stories_qs.filter(title__icontains=search_query)
+        query = SearchQuery(search_query, search_type="websearch", config=SEARCH_CONFIG)
+        stories_qs = stories_qs.filter(article__search_vector=query).annotate(
+            # ts_rank() is a real; as a double it round-trips through a cursor exactly
+            rank=Cast(SearchRank(F("article__search_vector"), query), FloatField()),
+        )
 
     if filter_date:
         stories_qs = stories_qs.filter(published_date=filter_date)
+    if date_from:
+        stories_qs = stories_qs.filter(published_date__gte=date_from)
+    if date_to:
+        stories_qs = stories_qs.filter(published_date__lte=date_to)
 
     return stories_qs
 
 
-def get_stories_json(stories_qs, page_number):
-    """Paginate and return JSON response for AJAX requests."""
-    paginator = Paginator(stories_qs, 10)
-    page_obj = paginator.get_page(page_number)
+def get_export_stories(user, date_from=None, date_to=None):
+    """
+    Return the user's company's stories for a full dump, near duplicates included.
+
+    ``date_from`` and ``date_to`` keep an inclusive range of published dates.
+    """
+    stories_qs = (
+        Story.objects.all()
+        if user.is_staff
+        else Story.objects.filter(company_id=user.company_id)
+    )
+    if date_from:
+        stories_qs = stories_qs.filter(published_date__gte=date_from)
+    if date_to:
+        stories_qs = stories_qs.filter(published_date__lte=date_to)
+    return stories_qs
+
+
+def story_list_values(stories_qs):
+    """
+    Return ``stories_qs`` as the dicts the story list shows, built in one query.
+
+    The title and URL come from the shared article, the body is represented by its
+    stored excerpt and the tagged company names are aggregated into an array by the
+    database, so neither bodies nor company rows are read. ``published_date`` stays
+    a date for the JSON encoder.
+    """
+    tagged_names = (
+        Story.tagged_companies.through.objects.filter(story_id=OuterRef("id"))
+        .values("story_id")
+        .annotate(
+            names=ArrayAgg("company__name", order_by="company__name"),
+        )
+        .values("names")  # type: ignore[misc]
+    )
+    return stories_qs.values(
+        "id",
+        "published_date",
+        *stories_qs.query.annotations,
+    ).annotate(
+        title=F("article__title"),
+        article_url=F("article__article_url"),
+        body_text=F("article__excerpt"),
+        tagged_companies=Coalesce(
+            Subquery(tagged_names),
+            Value([], ArrayField(CharField())),
+        ),
+    )
+
+
+def get_stories_json(stories_qs, cursor, order=RECENT, page_size=PAGE_SIZE):
+    """
+    Return a page of stories for AJAX, newest first or, for a search, best first.
+
+    Pages are keyset-paginated on ``(published_date, id)``, or ``(rank, id)`` by
+    relevance; pass the ``next_cursor`` or ``previous_cursor`` of a page to get
+    the page after or before it. The dates are left to the JSON encoder
+    (``utils.responses.FastJsonResponse``).
+
+    Raises:
+        InvalidCursorError: The cursor was tampered with.
+    """
+    by_relevance = order == RELEVANCE and "rank" in stories_qs.query.annotations
+    page_obj = pagination.paginate(
+        story_list_values(stories_qs),
+        RELEVANCE_ORDERING if by_relevance else STORY_ORDERING,
+        cursor,
+        page_size,
+    )
+    for story in page_obj.items:
+        story.pop("rank", None)
+
+    return {
+        "stories": page_obj.items,
+        "has_next": page_obj.has_next,
+        "has_previous": page_obj.has_previous,
+        "next_cursor": page_obj.next_cursor,
+        "previous_cursor": page_obj.previous_cursor,
+    }
+
+
+def get_story_facets(user, date_from=None, date_to=None, limit=FACET_LIMIT):
+    """
+    Return the user's story counts per day, source and company, from the facet tables.
+
+    Days are limited to the inclusive ``date_from``/``date_to`` range, or to the
+    last ``FACET_DAYS`` days with stories when neither is given; sources and
+    companies are counted over all days and the ``limit`` largest are returned.
+    Staff get the counts of every company summed.
+    """
+
+    def scoped(model):
+        rows = model.objects.filter(count__gt=0)
+        return rows if user.is_staff else rows.filter(company_id=user.company_id)
+
+    days = scoped(StoryDayCount)
+    if date_from:
+        days = days.filter(day__gte=date_from)
+    if date_to:
+        days = days.filter(day__lte=date_to)
+    days = days.values("day").annotate(total=Sum("count")).order_by("-day")
+    if not (date_from or date_to):
+        days = days[:FACET_DAYS]
+
+    sources = (
+        scoped(StorySourceCount)
+        .values("source_id", "source__name")
+        .annotate(
+            total=Sum("count"),
+        )
+        .order_by("-total", "source_id")[:limit]
+    )
+    companies = (
+        scoped(StoryTagCount)
+        .values("tagged_company_id", "tagged_company__name")
+        .annotate(
+            total=Sum("count"),
+        )
+        .order_by("-total", "tagged_company_id")[:limit]
+    )
 
     return {
-        "stories": [
+        "days": [{"day": row["day"], "count": row["total"]} for row in days],
+        "sources": [
+            {"id": row["source_id"], "name": row["source__name"], "count": row["total"]}
+            for row in sources
+        ],
+        "companies": [
             {
-                "id": story.id,
-                "title": story.title,
-                "article_url": story.article_url,
-                "published_date": story.published_date.strftime('%Y-%m-%d'),
-                "body_text": story.body_text[:100] + "..." if len(story.body_text) > 100 else story.body_text,
-                "tagged_companies": [company.name for company in story.tagged_companies.all()]
+                "id": row["tagged_company_id"],
+                "name": row["tagged_company__name"],
+                "count": row["total"],
             }
-            for story in page_obj
+            for row in companies
         ],
-        "has_next": page_obj.has_next(),
-        "has_previous": page_obj.has_previous(),
-        "current_page": page_obj.number,
-        "total_pages": paginator.num_pages,
     }
 
 
-def update_or_create_story(story, user, title, body_text, published_date, article_url, tagged_companies):
+def get_story_changes(user, cursor="", page_size=CHANGES_PAGE_SIZE):
+    """
+    Return the changes to the user's stories after ``cursor`` (all without one).
+
+    ``stories`` holds added and edited stories in the story list's shape, to be
+    upserted by id. ``deleted`` holds the ids of stories to drop: deleted ones and
+    ones now listed through an original they duplicate. Pass ``cursor`` back for
+    the next changes; ``has_more`` says whether some are already waiting. See
+    ``story.changes``.
+
+    Raises:
+        InvalidCursorError: The cursor was tampered with.
+        ExpiredCursorError: The cursor is older than the tombstones kept.
+    """
+    now = timezone.now()
+    horizon = commits.horizon(now)
+    stories = Story.objects.filter(updated_on__lte=horizon).annotate(
+        changed_at=F("updated_on"),
+        kind=Value(changes.STORY, IntegerField()),
+        duplicate=F("duplicate_of_id"),
+    )
+    tombstones = StoryTombstone.objects.filter(deleted_on__lte=horizon).annotate(
+        changed_at=F("deleted_on"),
+        kind=Value(changes.TOMBSTONE, IntegerField()),
+    )
+    if not user.is_staff:
+        stories = stories.filter(company_id=user.company_id)
+        tombstones = tombstones.filter(company_id=user.company_id)
+    if cursor:
+        (changed_at, _, _), _ = pagination.decode_cursor(
+            cursor,
+            stories,
+            changes.ORDERING,
+        )
+        if changed_at < now - changes.retention():
+            raise changes.ExpiredCursorError(cursor)
+
+    story_page = pagination.paginate(
+        story_list_values(stories),
+        changes.ORDERING,
+        cursor,
+        page_size,
+    )
+    tombstone_page = pagination.paginate(
+        tombstones.values("story_id", *changes.ORDERING),
+        changes.ORDERING,
+        cursor,
+        page_size,
+    )
+    items = sorted(
+        story_page.items + tombstone_page.items,
+        key=lambda item: [item[field] for field in changes.ORDERING],
+    )
+    has_more = len(items) > page_size or story_page.has_next or tombstone_page.has_next
+    items = items[:page_size]
+
+    result = {
+        "stories": [],
+        "deleted": [],
+        "cursor": (
+            pagination.encode_cursor([items[-1][field] for field in changes.ORDERING])
+            if has_more
+            else changes.caught_up_cursor(horizon)
+        ),
+        "has_more": has_more,
+    }
+    for item in items:
+        if item["kind"] == changes.TOMBSTONE:
+            result["deleted"].append(item["story_id"])
+        elif item["duplicate"] is not None:
+            result["deleted"].append(item["id"])
+        else:
+            for field in ("changed_at", "kind", "duplicate"):
+                del item[field]
+            result["stories"].append(item)
+    return result
+
+
+def get_saved_searches_json(user):
+    return {
+        "searches": list(
+            SavedSearch.objects.filter(user=user)
+            .order_by("name", "id")
+            .values("id", "name", "query", "created_on"),
+        ),
+    }
+
+
+def create_saved_search(user, name, query):
+    """
+    Save ``query`` for the user, to be alerted of their company's matching stories.
+
+    Raises:
+        UnanchoredQueryError: No term of the query must be in a matching story.
+    """
+    return SavedSearch.objects.create(
+        user=user,
+        name=name,
+        query=query,
+        anchors=alerts.get_anchors(query),
+    )
+
+
+def get_notifications_json(user, cursor, page_size=NOTIFICATIONS_PAGE_SIZE):
+    """
+    Return a page of the user's notifications, newest first, and the unread count.
+
+    Raises:
+        InvalidCursorError: The cursor was tampered with.
+    """
+    notifications = SearchNotification.objects.filter(
+        saved_search__user=user,
+        story__company_id=user.company_id,
+    )
+    page_obj = pagination.paginate(
+        notifications.values(
+            "id",
+            "story_id",
+            "created_on",
+            "read_on",
+            search_id=F("saved_search_id"),
+            search_name=F("saved_search__name"),
+            title=F("story__article__title"),
+            article_url=F("story__article__article_url"),
+            published_date=F("story__published_date"),
+        ),
+        NOTIFICATION_ORDERING,
+        cursor,
+        page_size,
+    )
+    return {
+        "notifications": page_obj.items,
+        "unread": notifications.filter(read_on__isnull=True).count(),
+        "has_next": page_obj.has_next,
+        "next_cursor": page_obj.next_cursor,
+    }
+
+
+def mark_notifications_read(user, notification_ids=None):
+    """
+    Mark the user's unread notifications read and return how many.
+
+    Only those of ``notification_ids`` are marked when it is given.
+    """
+    notifications = SearchNotification.objects.filter(
+        saved_search__user=user,
+        story__company_id=user.company_id,
+        read_on__isnull=True,
+    )
+    if notification_ids is not None:
+        notifications = notifications.filter(id__in=notification_ids)
+    return notifications.update(read_on=timezone.now())
+
+
+def update_or_create_story(
+    story,
+    user,
+    title,
+    body_text,
+    published_date,
+    article_url,
+    tagged_companies,
+):
     try:
         with transaction.atomic():
-
+            article_fields = {
+                "title": title,
+                "body_text": body_text,
+                "article_url": article_url,
+                "published_date": published_date,
+                **fingerprints.fingerprint_fields(body_text or ""),
+            }
             if story:
-                story.title = title
-                story.body_text = body_text
-                story.published_date = published_date
-                story.article_url = article_url
+                # Counted again below, with its new date and tags
+                facets.remove(Story.objects.filter(id=story.id))
+                previous = story.article
+                if previous.canonical:
+                    # Shared with other companies' stories, so the edit gets
+                    # an article of its own
+                    story.article = Article.objects.create(
+                        canonical=False,
+                        **article_fields,
+                    )
+                else:
+                    for name, value in article_fields.items():
+                        setattr(previous, name, value)
+                    previous.save()
                 story.updated_by = user
-                story.save(update_fields=["title", "body_text", "published_date", "article_url", "updated_by"])
+                story.save(update_fields=["article", "updated_by"])
+                delete_orphan_articles([previous.id])
             else:
                 story = Story.objects.create(
-                    title=title,
-                    body_text=body_text,
-                    article_url=article_url,
-                    published_date=published_date,
+                    article=Article.objects.create(canonical=False, **article_fields),
                     added_by=user,
                     company=user.company,
                 )
+            seen.add(story.company_id, [story.article_url_hash])
 
             if tagged_companies:
-                story.tagged_companies.set(tagged_companies)
+                company_services.tag_companies(
+                    Story.tagged_companies,
+                    [story.id],
+                    tagged_companies,
+                    replace=True,
+                )
+            facets.add(Story.objects.filter(id=story.id))
+            response_cache.invalidate(story.company_id, response_cache.STORIES)
 
         return True
 
@@ -97,6 +567,44 @@ def update_or_create_story(story, user, title, body_text, published_date, articl
         return False
 
 
+def delete_stories(stories_qs):
+    """
+    Delete ``stories_qs``, keeping facet counts in step and leaving tombstones.
+
+    Near duplicates of a deleted story lose their original and are listed (and
+    counted) as originals from then on.
+    """
+    promoted_ids = list(
+        Story.objects.filter(duplicate_of__in=stories_qs)
+        .exclude(id__in=stories_qs)
+        .values_list("id", flat=True),
+    )
+    article_ids = list(stories_qs.values_list("article_id", flat=True))
+    facets.remove(stories_qs)
+    changes.record_deletions(stories_qs)
+    stories_qs.delete()
+    delete_orphan_articles(article_ids)
+    promoted = Story.objects.filter(id__in=promoted_ids)
+    # The update cleared duplicate_of without touching updated_on
+    promoted.update(updated_on=timezone.now())
+    facets.add(promoted)
+
+
+def delete_stories_and_invalidate(stories_qs):
+    """Delete ``stories_qs`` with :func:`delete_stories` and drop their cached lists."""
+    company_ids = set(stories_qs.values_list("company_id", flat=True).distinct())
+    if not company_ids:
+        return
+    delete_stories(stories_qs)
+    for company_id in company_ids:
+        response_cache.invalidate(company_id, response_cache.STORIES)
+
+
+def delete_orphan_articles(article_ids):
+    """Delete the articles among ``article_ids`` that no story links to anymore."""
+    Article.objects.filter(id__in=article_ids, stories__isnull=True).delete()
+
+
 def validate_form_data(user, payload, story_id):
     try:
         title = payload.get("title")
@@ -107,8 +615,15 @@ def validate_form_data(user, payload, story_id):
 
         if title and article_url:
             story, _ = get_story(user, story_id) if story_id else (None, [])
-            success = update_or_create_story(story, user, title, body_text, published_date, article_url,
-                                             tagged_companies)
+            success = update_or_create_story(
+                story,
+                user,
+                title,
+                body_text,
+                published_date,
+                article_url,
+                tagged_companies,
+            )
             return success
 
         return False
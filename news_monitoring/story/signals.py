@@ -0,0 +1,38 @@
+"""
+Deletes that take stories with them, routed through ``services.delete_stories``.
+
+A source's stories, and the stories a user added, go with them as a database
+cascade wherever the delete comes from (the admin, a shell, a cascade of its own),
+which would leave no tombstones in the changes feed, the facet counts too high and
+the cached lists stale. Just before such a delete its stories are deleted through
+the service instead. A deleted company takes its feed, counts and cached lists
+with it, so nothing is done for the sources and stories it cascades to.
+"""
+
+from django.db.models import QuerySet
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from news_monitoring.company.models import Company
+from news_monitoring.source.models import Source
+from news_monitoring.story import services
+from news_monitoring.story.models import Story
+from news_monitoring.users.models import User
+from news_monitoring.utils import response_cache
+
+
+def _deletes_a_company(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, Company)
+
+
+@receiver(pre_delete, sender=Source)
+def delete_source_stories(sender, instance, origin=None, **kwargs):
+    if not _deletes_a_company(origin):
+        services.delete_stories_and_invalidate(Story.objects.filter(source=instance))
+        response_cache.invalidate(instance.company_id, response_cache.SOURCES)
+
+
+@receiver(pre_delete, sender=User)
+def delete_added_stories(sender, instance, origin=None, **kwargs):
+    services.delete_stories_and_invalidate(Story.objects.filter(added_by=instance))
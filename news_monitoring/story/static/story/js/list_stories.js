@@ -47,28 +47,29 @@
 //        });
 //    }
 $(document).ready(function () {
-    fetchStories(1);  // Load the first page on initial page load
+    fetchStories();  // Load the first page on initial page load
 
     // Search and filter event
-    $("#search-title, #filter-date").on("input change", function () {
-        fetchStories(1);  // Reset to first page on new search
+    $("#search-title, #filter-from, #filter-to, #sort-order").on("input change", function () {
+        fetchStories();  // Reset to first page on new search
     });
 
     // Pagination event handlers (will be dynamically added later)
     $(document).on("click", ".pagination-link", function (e) {
         e.preventDefault();
-        let page = $(this).data("page");  // Get the page number from button
-        fetchStories(page);
+        fetchStories($(this).attr("data-cursor"));  // Cursor of the page to show
     });
 });
 
-function fetchStories(page = 1) {
+function fetchStories(cursor = "") {
     $.ajax({
         url: storyListUrl,
         data: {
             q: $("#search-title").val().trim(),
-            date: $("#filter-date").val(),
-            page: page  // Pass the selected page number
+            from: $("#filter-from").val(),
+            to: $("#filter-to").val(),
+            order: $("#sort-order").val(),
+            cursor: cursor  // Empty for the first page
         },
         dataType: "json",
         success: function (response) {
@@ -77,6 +78,7 @@ function fetchStories(page = 1) {
 
             if (!response.stories || response.stories.length === 0) {
                 storiesList.append("<p>No results found.</p>");
+                updatePagination(response);
                 return;
             }
 
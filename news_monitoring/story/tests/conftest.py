@@ -0,0 +1,24 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+
+class Migrator:
+    """Move the story app's schema to a migration and back to the latest after."""
+
+    def migrate(self, name):
+        """Migrate the story app to ``name``; return the app registry at that point."""
+        executor = MigrationExecutor(connection)
+        executor.migrate([("story", name)])
+        return MigrationExecutor(connection).loader.project_state(("story", name)).apps
+
+    def reset(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes("story"))
+
+
+@pytest.fixture
+def migrator(transactional_db):
+    migrator = Migrator()
+    yield migrator
+    migrator.reset()
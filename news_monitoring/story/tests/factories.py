@@ -0,0 +1,36 @@
+import datetime
+
+from factory import LazyAttribute
+from factory import SelfAttribute
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.users.tests.factories import UserFactory
+
+
+class ArticleFactory(DjangoModelFactory[Article]):
+    title = Sequence(lambda n: f"Story {n}")
+    body_text = LazyAttribute(lambda o: f"Body of {o.title}.")
+    article_url = Sequence(lambda n: f"https://news.example.com/articles/{n}")
+    published_date = datetime.date(2025, 4, 1)
+    canonical = False
+
+    class Meta:
+        model = Article
+
+
+class StoryFactory(DjangoModelFactory[Story]):
+    company = SubFactory(CompanyFactory)
+    added_by = SubFactory(UserFactory)
+    published_date = datetime.date(2025, 4, 1)
+    article = SubFactory(
+        ArticleFactory,
+        published_date=SelfAttribute("..published_date"),
+    )
+
+    class Meta:
+        model = Story
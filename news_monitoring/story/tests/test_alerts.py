@@ -0,0 +1,259 @@
+import datetime
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source import services as source_services
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story import alerts
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import SavedSearch
+from news_monitoring.story.models import SearchNotification
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def company_user(user):
+    user.company = CompanyFactory()
+    user.save()
+    return user
+
+
+def feed_entry(i, title, body):
+    link = f"https://wire.example.com/{i}"
+    return {
+        "title": title,
+        "body_text": body,
+        "excerpt": body,
+        "article_url": link,
+        "article_url_hash": url_hash(link),
+        "published_date": datetime.date(2025, 4, 1),
+        "fingerprint": [],
+        "fingerprint_bands": [],
+    }
+
+
+def import_entries(source, *entries):
+    return source_services.save_feed_entries(
+        source,
+        source.added_by,
+        source.company,
+        list(entries),
+    )
+
+
+def notified(user):
+    return sorted(
+        SearchNotification.objects.filter(saved_search__user=user).values_list(
+            "saved_search__name",
+            "story__article__title",
+        ),
+    )
+
+
+class TestGetAnchors:
+    @pytest.mark.parametrize(
+        ("query", "anchors"),
+        [
+            ("acquisitions", ["acquisit"]),
+            # One side of an AND is enough, the longer the rarer
+            ("acme acquisitions", ["acquisit"]),
+            # Both sides of an OR, no negated term
+            ('"acme corp" or globex -layoffs', ["corp", "globex"]),
+            # A phrase needs all its words, a single word is fewer
+            ('"big bank" merger', ["merger"]),
+        ],
+    )
+    def test_keeps_the_terms_a_match_must_contain(self, query, anchors):
+        assert alerts.get_anchors(query) == anchors
+
+    @pytest.mark.parametrize("query", ["-layoffs", "the", "acme or -layoffs"])
+    def test_refuses_queries_without_a_required_term(self, query):
+        with pytest.raises(alerts.UnanchoredQueryError):
+            alerts.get_anchors(query)
+
+
+class TestPercolate:
+    def test_imported_stories_notify_the_searches_they_match(self, company_user):
+        source = SourceFactory(company=company_user.company)
+        other_user = UserFactory(company=CompanyFactory())
+        for user, name, query in (
+            (company_user, "Deals", "merger or acquisition"),
+            (company_user, "Acme, not layoffs", "acme -layoffs"),
+            (company_user, "Phrase", '"quarterly earnings"'),
+            (other_user, "Elsewhere", "merger"),
+        ):
+            services.create_saved_search(user, name, query)
+
+        import_entries(
+            source,
+            feed_entry(0, "Acme agrees merger", "Acme will buy Globex."),
+            feed_entry(1, "Acme layoffs", "Acme cuts jobs."),
+            feed_entry(2, "Earnings", "Globex beat its earnings for the quarter."),
+        )
+
+        assert notified(company_user) == [
+            ("Acme, not layoffs", "Acme agrees merger"),
+            ("Deals", "Acme agrees merger"),
+        ]
+        assert notified(other_user) == []
+
+    def test_candidates_come_from_the_anchor_index(self, company_user):
+        story = StoryFactory(
+            company=company_user.company,
+            article__title="Acme agrees merger",
+        )
+        services.create_saved_search(company_user, "Deals", "merger")
+
+        with CaptureQueriesContext(connection) as queries:
+            assert alerts.percolate(Story.objects.filter(id=story.id)) == 1
+        assert "&& tsvector_to_array(" in queries[0]["sql"]
+
+        # Matching again is a no-op, and near duplicates are never matched
+        assert alerts.percolate(Story.objects.filter(id=story.id)) == 0
+        duplicate = StoryFactory(
+            company=company_user.company,
+            article__title="Acme agrees merger",
+            duplicate_of=story,
+        )
+        assert alerts.percolate(Story.objects.filter(id=duplicate.id)) == 0
+        assert alerts.percolate(Story.objects.none()) == 0
+
+    def test_searches_follow_their_user_to_another_company(self, client, company_user):
+        old_company = company_user.company
+        services.create_saved_search(company_user, "Deals", "merger")
+        before = StoryFactory(company=old_company, article__title="Merger before")
+        alerts.percolate(Story.objects.filter(id=before.id))
+
+        company_user.company = CompanyFactory()
+        company_user.save()
+        after = StoryFactory(company=old_company, article__title="Merger after")
+        moved = StoryFactory(company=company_user.company, article__title="Merger")
+        alerts.percolate(Story.objects.filter(id__in=[after.id, moved.id]))
+        client.force_login(company_user)
+
+        assert notified(company_user) == [
+            ("Deals", "Merger"),
+            ("Deals", "Merger before"),
+        ]
+        page = client.get(reverse("story:notifications")).json()
+        assert [item["story_id"] for item in page["notifications"]] == [moved.id]
+        assert page["unread"] == 1
+        assert client.post(reverse("story:read-notifications")).json() == {"read": 1}
+
+
+class TestViews:
+    def test_saving_listing_and_deleting_searches(self, client, company_user):
+        client.force_login(company_user)
+
+        response = client.post(
+            reverse("story:searches"),
+            {"name": "Deals", "query": "merger"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        search_id = response.json()["id"]
+        assert (
+            client.post(
+                reverse("story:searches"),
+                {"name": "Bad", "query": "-merger"},
+            ).status_code
+            == HTTPStatus.BAD_REQUEST
+        )
+        assert (
+            client.post(
+                reverse("story:searches"),
+                {"name": "", "query": "merger"},
+            ).status_code
+            == HTTPStatus.BAD_REQUEST
+        )
+
+        assert [
+            search["name"]
+            for search in client.get(reverse("story:searches")).json()["searches"]
+        ] == ["Deals"]
+        assert (
+            client.post(reverse("story:delete-search", args=[search_id])).status_code
+            == HTTPStatus.OK
+        )
+        assert not SavedSearch.objects.exists()
+
+    def test_searches_of_other_users_cannot_be_deleted(self, client, company_user):
+        search = services.create_saved_search(
+            UserFactory(company=company_user.company),
+            "Deals",
+            "merger",
+        )
+        client.force_login(company_user)
+
+        assert (
+            client.post(reverse("story:delete-search", args=[search.id])).status_code
+            == HTTPStatus.NOT_FOUND
+        )
+
+    def test_listing_and_reading_notifications(self, client, company_user):
+        search = services.create_saved_search(company_user, "Deals", "merger")
+        stories = [
+            StoryFactory(company=company_user.company, article__title=f"Merger {i}")
+            for i in range(3)
+        ]
+        alerts.percolate(Story.objects.filter(id__in=[story.id for story in stories]))
+        client.force_login(company_user)
+
+        page = client.get(reverse("story:notifications")).json()
+        assert sorted(item["story_id"] for item in page["notifications"]) == [
+            story.id for story in stories
+        ]
+        assert {item["search_name"] for item in page["notifications"]} == {search.name}
+        assert page["unread"] == len(stories)
+
+        first = page["notifications"][0]["id"]
+        assert client.post(
+            reverse("story:read-notifications"),
+            {"id": [first]},
+        ).json() == {"read": 1}
+        unread = len(stories) - 1
+        assert client.get(reverse("story:notifications")).json()["unread"] == unread
+        assert client.post(reverse("story:read-notifications")).json() == {
+            "read": unread,
+        }
+        assert (
+            client.get(reverse("story:notifications"), {"cursor": "nope"}).status_code
+            == HTTPStatus.BAD_REQUEST
+        )
+
+
+def test_benchmark_matches_as_many_stories_both_ways():
+    out = StringIO()
+
+    call_command(
+        "bench_saved_search_alerts",
+        "--searches",
+        "200",
+        "--stories",
+        "10",
+        "--words",
+        "50",
+        "--repeat",
+        "1",
+        stdout=out,
+    )
+
+    rows = {
+        line.split("|")[0].strip(): line.split("|")
+        for line in out.getvalue().splitlines()[1:]
+    }
+    assert int(rows["indexed"][3].replace(",", "")) < int(
+        rows["naive"][3].replace(",", ""),
+    )
+    assert rows["indexed"][4] == rows["naive"][4]
@@ -0,0 +1,214 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from news_monitoring.source import services as source_services
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def feed_entry(i):
+    link = f"https://wire.example.com/{i}"
+    return {
+        "title": f"Wire story {i}",
+        "body_text": f"Body of wire story {i}.",
+        "excerpt": f"Body of wire story {i}.",
+        "article_url": link,
+        "article_url_hash": url_hash(link),
+        "published_date": datetime.date(2025, 4, 1),
+        "fingerprint": [],
+        "fingerprint_bands": [],
+    }
+
+
+def save_feed(source, entries):
+    return source_services.save_feed_entries(
+        source,
+        source.added_by,
+        source.company,
+        entries,
+    )
+
+
+class TestSharedArticles:
+    def test_companies_following_the_same_feed_share_its_articles(self):
+        first, second = SourceFactory(), SourceFactory()
+
+        save_feed(first, [feed_entry(0), feed_entry(1)])
+        save_feed(second, [feed_entry(1), feed_entry(2)])
+
+        assert set(
+            Article.objects.filter(canonical=True).values_list(
+                "article_url",
+                flat=True,
+            ),
+        ) == {f"https://wire.example.com/{i}" for i in range(3)}
+        shared = Story.objects.filter(article__article_url="https://wire.example.com/1")
+        assert {story.company_id for story in shared} == {
+            first.company_id,
+            second.company_id,
+        }
+        assert len({story.article_id for story in shared}) == 1
+
+    def test_the_list_contract_is_unchanged(self, user):
+        source = SourceFactory()
+        user.company = source.company
+        save_feed(source, [feed_entry(0)])
+        story = Story.objects.get()
+
+        assert services.get_stories_json(services.get_stories(user, "", None), "")[
+            "stories"
+        ] == [
+            {
+                "id": story.id,
+                "title": "Wire story 0",
+                "article_url": "https://wire.example.com/0",
+                "published_date": datetime.date(2025, 4, 1),
+                "body_text": "Body of wire story 0.",
+                "tagged_companies": [],
+            },
+        ]
+
+    def test_edits_copy_a_shared_article_and_update_a_private_one(self):
+        first, second = SourceFactory(), SourceFactory()
+        save_feed(first, [feed_entry(0)])
+        save_feed(second, [feed_entry(0)])
+        mine, theirs = (
+            Story.objects.get(company=first.company),
+            Story.objects.get(company=second.company),
+        )
+        user = UserFactory(company=first.company)
+
+        services.update_or_create_story(
+            mine,
+            user,
+            "Corrected",
+            "New body.",
+            datetime.date(2025, 4, 2),
+            mine.article.article_url,
+            [],
+        )
+        copy_id = mine.article_id
+        services.update_or_create_story(
+            mine,
+            user,
+            "Corrected again",
+            "New body.",
+            datetime.date(2025, 4, 2),
+            mine.article.article_url,
+            [],
+        )
+
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        assert mine.article_id == copy_id != theirs.article_id
+        assert (mine.article.title, mine.article.canonical, mine.published_date) == (
+            "Corrected again",
+            False,
+            datetime.date(2025, 4, 2),
+        )
+        assert (theirs.article.title, theirs.published_date) == (
+            "Wire story 0",
+            datetime.date(2025, 4, 1),
+        )
+
+    def test_articles_go_with_their_last_story(self):
+        first, second = StoryFactory(), StoryFactory()
+        shared = StoryFactory(article=first.article)
+
+        services.delete_stories(Story.objects.filter(id__in=[first.id, second.id]))
+
+        assert list(Article.objects.values_list("id", flat=True)) == [shared.article_id]
+
+
+def test_migration_splits_stories_into_shared_and_private_articles(migrator):
+    old_apps = migrator.migrate("0013_story_changes")
+    Story = old_apps.get_model("story", "Story")
+    first, second = SourceFactory(), SourceFactory()
+
+    def story(source, url, title, *, edited=False):
+        company = source.company if source else first.company
+        return Story.objects.create(
+            company_id=company.id,
+            source_id=source and source.id,
+            added_by_id=first.added_by_id,
+            updated_by_id=first.added_by_id if edited else None,
+            title=title,
+            body_text=f"Body of {title}.",
+            article_url=url,
+            article_url_hash=url_hash(url),
+            published_date=datetime.date(2025, 4, 1),
+        )
+
+    imported = story(first, "https://wire.example.com/0", "Wire")
+    followed = story(second, "https://wire.example.com/0", "Wire")
+    story(first, "https://wire.example.com/1", "Wire 1")
+    edited = story(second, "https://wire.example.com/1", "Edited", edited=True)
+    edited_first = story(first, "https://wire.example.com/2", "Edited", edited=True)
+    unedited = story(second, "https://wire.example.com/2", "Wire 2")
+    written = story(None, "https://example.com/mine", "Mine")
+
+    new_apps = migrator.migrate("0014_article")
+
+    stories = (
+        new_apps.get_model("story", "Story").objects.select_related("article").in_bulk()
+    )
+    assert stories[imported.id].article_id == stories[followed.id].article_id
+    assert stories[imported.id].article.canonical
+    assert (stories[edited.id].article.title, stories[edited.id].article.canonical) == (
+        "Edited",
+        False,
+    )
+    assert (
+        stories[unedited.id].article.title,
+        stories[unedited.id].article.canonical,
+    ) == ("Wire 2", True)
+    assert not stories[edited_first.id].article.canonical
+    assert (
+        stories[written.id].article.title,
+        stories[written.id].article.canonical,
+    ) == ("Mine", False)
+    assert sorted(
+        new_apps.get_model("story", "Article").objects.values_list(
+            "article_url",
+            "canonical",
+        ),
+    ) == [
+        ("https://example.com/mine", False),
+        ("https://wire.example.com/0", True),
+        ("https://wire.example.com/1", False),
+        ("https://wire.example.com/1", True),
+        ("https://wire.example.com/2", False),
+        ("https://wire.example.com/2", True),
+    ]
+
+
+def test_storage_benchmark_shows_the_shared_layout_is_smaller():
+    out = StringIO()
+
+    call_command(
+        "bench_article_storage",
+        "--articles",
+        "20",
+        "--companies",
+        "5",
+        "--body-size",
+        "500",
+        stdout=out,
+    )
+
+    rows = {
+        line.split("|")[0].strip(): line.split("|")
+        for line in out.getvalue().splitlines()[1:]
+    }
+    assert float(rows["shared"][2]) < float(rows["per-story"][2])
+    assert float(rows["shared"][4]) < float(rows["per-story"][4])
@@ -0,0 +1,88 @@
+import datetime
+
+import pytest
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.story.canonical import canonicalize_url
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.users.tests.factories import UserFactory
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://news.example.com/a/b", "https://news.example.com/a/b"),
+        (" HTTPS://News.Example.COM/a/B/ ", "https://news.example.com/a/B"),
+        ("https://news.example.com:443/a#comments", "https://news.example.com/a"),
+        ("http://news.example.com:8080/a", "http://news.example.com:8080/a"),
+        (
+            "https://news.example.com/a?utm_source=rss&id=7&fbclid=x&UTM_Medium=feed&b=",
+            "https://news.example.com/a?b=&id=7",
+        ),
+        ("https://news.example.com/?z=1&a=2", "https://news.example.com?a=2&z=1"),
+        ("https://[::1]:8000/a/", "https://[::1]:8000/a"),
+        ("mailto:desk@example.com", "mailto:desk@example.com"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_hash_ignores_scheme_and_www():
+    expected = url_hash("https://news.example.com/a")
+
+    assert url_hash("http://www.news.example.com/a/?utm_campaign=x") == expected
+    assert url_hash("https://news.example.com/b") != expected
+
+
+@pytest.mark.django_db
+def test_article_url_hash_is_kept_in_sync_on_save():
+    story = StoryFactory(
+        article__article_url="http://www.news.example.com/a/?utm_source=rss",
+    )
+    assert story.article.article_url == "http://www.news.example.com/a"
+
+    story.article.article_url = "https://news.example.com/b"
+    story.article.save(update_fields=["article_url"])
+    story.save(update_fields=["article"])
+
+    story.refresh_from_db()
+    assert (
+        story.article.article_url_hash
+        == story.article_url_hash
+        == url_hash("https://news.example.com/b")
+    )
+
+
+def test_backfill_links_urls_that_now_collide(migrator):
+    old_apps = migrator.migrate("0005_story_near_duplicates")
+    Story = old_apps.get_model("story", "Story")
+    company, user = CompanyFactory(), UserFactory()
+    first, second, other = (
+        Story.objects.create(
+            company_id=company.id,
+            added_by_id=user.id,
+            title="Story",
+            body_text="",
+            article_url=raw_url,
+            published_date=datetime.date(2025, 4, 1),
+        )
+        for raw_url in (
+            "https://news.example.com/a?utm_source=rss",
+            "http://news.example.com/a/",
+            "https://news.example.com/b#top",
+        )
+    )
+
+    new_apps = migrator.migrate("0006_story_article_url_hash")
+
+    stories = new_apps.get_model("story", "Story").objects.in_bulk(
+        [first.id, second.id, other.id],
+    )
+    assert stories[first.id].article_url == "https://news.example.com/a"
+    assert stories[first.id].article_url_hash == url_hash("https://news.example.com/a")
+    assert stories[second.id].article_url == "http://news.example.com/a/"
+    assert stories[second.id].duplicate_of_id == first.id
+    assert stories[other.id].article_url == "https://news.example.com/b"
+    assert stories[other.id].duplicate_of_id is None
@@ -0,0 +1,302 @@
+import datetime
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story import changes
+from news_monitoring.story import facets
+from news_monitoring.story import services
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.story.models import StoryTombstone
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.story.tests.test_facets import assert_counts_match_a_rebuild
+from news_monitoring.users.tests.factories import UserFactory
+from news_monitoring.utils import commits
+from news_monitoring.utils import pagination
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def settled(monkeypatch):
+    """Changes are returned as soon as they are made, unless a test says otherwise."""
+    monkeypatch.setattr(commits, "SETTLE", datetime.timedelta(0))
+
+
+@pytest.fixture
+def company_user(user):
+    user.company = CompanyFactory()
+    user.save()
+    return user
+
+
+def sync(user, cursor="", page_size=services.CHANGES_PAGE_SIZE):
+    """Follow the feed until caught up; return upserted and deleted ids, last cursor."""
+    upserted, deleted = [], []
+    while True:
+        page = services.get_story_changes(user, cursor, page_size)
+        upserted += [story["id"] for story in page["stories"]]
+        deleted += page["deleted"]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            return upserted, deleted, cursor
+
+
+class TestDeletesOutsideTheServices:
+    def test_deleting_a_source_leaves_tombstones(self, company_user):
+        source = SourceFactory(company=company_user.company)
+        stories = StoryFactory.create_batch(
+            2,
+            company=company_user.company,
+            source=source,
+        )
+        duplicate = StoryFactory(company=company_user.company, duplicate_of=stories[0])
+        facets.rebuild()
+        _, _, cursor = sync(company_user)
+
+        source.delete()
+
+        upserted, deleted, _ = sync(company_user, cursor)
+        assert (upserted, deleted) == ([duplicate.id], [story.id for story in stories])
+        assert not Article.objects.filter(
+            id__in=[story.article_id for story in stories],
+        ).exists()
+        assert_counts_match_a_rebuild()
+
+    def test_deleting_a_user_leaves_tombstones_for_their_stories(self, company_user):
+        author = UserFactory(company=company_user.company)
+        story = StoryFactory(company=company_user.company, added_by=author)
+        facets.rebuild()
+        _, _, cursor = sync(company_user)
+
+        author.delete()
+
+        assert sync(company_user, cursor)[:2] == ([], [story.id])
+        assert_counts_match_a_rebuild()
+
+    def test_admin_deletes_leave_tombstones(self, company_user, admin_client):
+        stories = StoryFactory.create_batch(2, company=company_user.company)
+        facets.rebuild()
+        _, _, cursor = sync(company_user)
+
+        admin_client.post(
+            reverse("admin:story_story_delete", args=[stories[0].id]),
+            {"post": "yes"},
+        )
+        admin_client.post(
+            reverse("admin:story_story_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [stories[1].id],
+                "post": "yes",
+            },
+        )
+
+        assert sync(company_user, cursor)[:2] == (
+            [],
+            [story.id for story in stories],
+        )
+        assert_counts_match_a_rebuild()
+
+    def test_deleting_a_company_takes_its_tombstones(self, company_user):
+        source = SourceFactory(company=company_user.company)
+        StoryFactory(company=company_user.company, source=source)
+
+        company_user.company.delete()
+
+        assert not StoryTombstone.objects.exists()
+        assert not Story.objects.exists()
+
+
+class TestGetStoryChanges:
+    def test_from_the_start_then_only_deltas(self, company_user):
+        stories = StoryFactory.create_batch(3, company=company_user.company)
+        StoryFactory()  # Another company's
+
+        upserted, deleted, cursor = sync(company_user)
+        assert (upserted, deleted) == ([story.id for story in stories], [])
+        assert sync(company_user, cursor)[:2] == ([], [])
+
+        services.update_or_create_story(
+            stories[0],
+            company_user,
+            "Edited",
+            "Body.",
+            stories[0].published_date,
+            stories[0].article.article_url,
+            [],
+        )
+        added = StoryFactory(company=company_user.company)
+        services.delete_stories(Story.objects.filter(id=stories[1].id))
+
+        upserted, deleted, _ = sync(company_user, cursor)
+        assert (upserted, deleted) == ([stories[0].id, added.id], [stories[1].id])
+
+    def test_stories_follow_the_list_shape(self, company_user):
+        story = StoryFactory(company=company_user.company, article__body_text="x" * 150)
+        story.tagged_companies.set([CompanyFactory(name="Acme")])
+
+        page = services.get_story_changes(company_user)
+
+        assert page["stories"] == [
+            {
+                "id": story.id,
+                "title": story.article.title,
+                "article_url": story.article.article_url,
+                "published_date": story.published_date,
+                "body_text": "x" * 100 + "...",
+                "tagged_companies": ["Acme"],
+            },
+        ]
+
+    def test_duplicates_leave_the_list_and_return_when_their_original_goes(
+        self,
+        company_user,
+    ):
+        original = StoryFactory(company=company_user.company)
+        duplicate = StoryFactory(company=company_user.company, duplicate_of=original)
+
+        upserted, deleted, cursor = sync(company_user)
+        assert (upserted, deleted) == ([original.id], [duplicate.id])
+
+        services.delete_stories(Story.objects.filter(id=original.id))
+
+        upserted, deleted, _ = sync(company_user, cursor)
+        assert (upserted, deleted) == ([duplicate.id], [original.id])
+
+    def test_pages_interleave_stories_and_tombstones(self, company_user):
+        stories = StoryFactory.create_batch(6, company=company_user.company)
+        for story in stories[::2]:
+            services.delete_stories(Story.objects.filter(id=story.id))
+        added = StoryFactory.create_batch(2, company=company_user.company)
+
+        upserted, deleted, _ = sync(company_user, page_size=2)
+        everything, _, _ = sync(company_user)
+
+        assert deleted == [story.id for story in stories[::2]]
+        assert upserted == everything
+        assert len(upserted) == len(set(upserted))
+        assert set(upserted) == {story.id for story in stories[1::2] + added}
+
+    def test_recent_changes_wait_for_concurrent_commits(
+        self,
+        company_user,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(commits, "SETTLE", datetime.timedelta(minutes=1))
+        StoryFactory(company=company_user.company)
+
+        page = services.get_story_changes(company_user)
+        monkeypatch.setattr(commits, "SETTLE", datetime.timedelta(0))
+
+        assert page["stories"] == []
+        assert (
+            len(services.get_story_changes(company_user, page["cursor"])["stories"])
+            == 1
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_changes_committed_after_their_timestamp_are_returned(self, company_user):
+        story = StoryFactory(company=company_user.company)
+        other = connections.create_connection("default")
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as other_cursor:
+                other_cursor.execute("SELECT 1")
+                other_cursor.execute(
+                    f"UPDATE {Story._meta.db_table} "  # noqa: S608
+                    "SET updated_on = %s WHERE id = %s",
+                    [timezone.now(), story.id],
+                )
+                cursor = sync(company_user)[2]
+                other.commit()
+        finally:
+            other.close()
+
+        upserted, _, _ = sync(company_user, cursor)
+
+        assert upserted == [story.id]
+
+    def test_expired_cursors_are_refused(self, company_user, settings):
+        settings.STORY_TOMBSTONE_DAYS = 1
+        cursor = changes.caught_up_cursor(timezone.now() - datetime.timedelta(days=2))
+
+        with pytest.raises(changes.ExpiredCursorError):
+            services.get_story_changes(company_user, cursor)
+
+    def test_pages_are_read_on_the_changes_indexes(self, company_user):
+        stories = StoryFactory.create_batch(3, company=company_user.company)
+        services.delete_stories(Story.objects.filter(id=stories[0].id))
+        cursor = changes.caught_up_cursor(timezone.now() - datetime.timedelta(hours=1))
+
+        with connection.cursor() as db_cursor:
+            db_cursor.execute("SET LOCAL enable_seqscan = off")
+            with CaptureQueriesContext(connection) as queries:
+                services.get_story_changes(company_user, cursor)
+            plans = []
+            for query in queries.captured_queries[-2:]:
+                db_cursor.execute(f"EXPLAIN {query['sql']}")
+                plans.append("\n".join(row[0] for row in db_cursor.fetchall()))
+
+        assert "story_company_updated_idx" in plans[0]
+        assert "story_tombstone_company_idx" in plans[1]
+        assert not any("Sort" in plan for plan in plans)
+
+
+class TestChangesView:
+    def test_returns_the_feed(self, client, company_user):
+        client.force_login(company_user)
+        story = StoryFactory(company=company_user.company)
+
+        response = client.get(reverse("story:changes"))
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item["id"] for item in data["stories"]] == [story.id]
+        assert (data["deleted"], data["has_more"]) == ([], False)
+
+    def test_bad_and_expired_cursors(self, client, company_user):
+        client.force_login(company_user)
+        expired = pagination.encode_cursor(
+            [timezone.now() - datetime.timedelta(days=400), changes.STORY, 0],
+        )
+
+        assert (
+            client.get(reverse("story:changes"), {"cursor": "nope"}).status_code
+            == HTTPStatus.BAD_REQUEST
+        )
+        assert (
+            client.get(reverse("story:changes"), {"cursor": expired}).status_code
+            == HTTPStatus.GONE
+        )
+
+
+def test_prune_command_keeps_recent_tombstones(settings):
+    settings.STORY_TOMBSTONE_DAYS = 1
+    company = CompanyFactory()
+    StoryTombstone.objects.create(
+        company=company,
+        story_id=1,
+        deleted_on=timezone.now() - datetime.timedelta(days=2),
+    )
+    StoryTombstone.objects.create(
+        company=company,
+        story_id=2,
+        deleted_on=timezone.now(),
+    )
+    out = StringIO()
+
+    call_command("prune_story_tombstones", stdout=out)
+
+    assert list(StoryTombstone.objects.values_list("story_id", flat=True)) == [2]
+    assert "1 story tombstones pruned" in out.getvalue()
@@ -0,0 +1,173 @@
+import csv
+import datetime
+import io
+from http import HTTPStatus
+from io import StringIO
+
+import orjson
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.story import export
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def company_client(client, user):
+    user.company = CompanyFactory()
+    user.save()
+    client.force_login(user)
+    return client
+
+
+def ndjson_rows(content):
+    return [orjson.loads(line) for line in content.splitlines()]
+
+
+class TestExportStories:
+    def test_tags_are_resolved_in_one_query_per_batch(self, django_assert_num_queries):
+        company = CompanyFactory()
+        acme, zeta = CompanyFactory(name="Acme"), CompanyFactory(name="Zeta")
+        stories = StoryFactory.create_batch(5, company=company)
+        stories[0].tagged_companies.set([zeta, acme])
+
+        # The stories through one server-side cursor, plus a tag query per batch of two
+        with django_assert_num_queries(1 + 3):
+            rows = ndjson_rows(
+                b"".join(
+                    export.export_stories(
+                        Story.objects.filter(company=company),
+                        batch_size=2,
+                    ),
+                ),
+            )
+
+        assert [row["id"] for row in rows] == [story.id for story in stories]
+        assert rows[0]["tagged_companies"] == ["Acme", "Zeta"]
+        assert rows[1]["tagged_companies"] == []
+        assert rows[0]["published_date"] == stories[0].published_date.isoformat()
+
+    def test_csv_has_a_header_and_joined_tags(self):
+        story = StoryFactory(article__title='Rates, "held"')
+        story.tagged_companies.set(
+            [CompanyFactory(name="Acme"), CompanyFactory(name="Beta")],
+        )
+
+        content = b"".join(
+            export.export_stories(Story.objects.all(), export.CSV),
+        ).decode()
+
+        header, row = csv.reader(io.StringIO(content))
+        assert header == list(export.FIELDS)
+        assert dict(zip(header, row, strict=False)) | {"body_text": ""} == {
+            "id": str(story.id),
+            "company_id": str(story.company_id),
+            "source_id": "",
+            "duplicate_of_id": "",
+            "title": 'Rates, "held"',
+            "article_url": story.article.article_url,
+            "published_date": story.published_date.isoformat(),
+            "body_text": "",
+            "tagged_companies": "Acme; Beta",
+        }
+
+    def test_empty_csv_still_has_a_header(self):
+        content = b"".join(
+            export.export_stories(Story.objects.none(), export.CSV),
+        ).decode()
+
+        assert content.strip() == ",".join(export.FIELDS)
+
+    def test_unknown_formats_are_rejected(self):
+        with pytest.raises(ValueError, match="xml"):
+            export.export_stories(Story.objects.all(), "xml")
+
+
+class TestExportView:
+    def test_streams_the_company_stories(self, company_client, user):
+        original = StoryFactory(company=user.company)
+        duplicate = StoryFactory(company=user.company, duplicate_of=original)
+        StoryFactory()  # Another company's
+
+        response = company_client.get(reverse("story:export"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert (
+            response["Content-Disposition"] == 'attachment; filename="stories.ndjson"'
+        )
+        rows = ndjson_rows(b"".join(response.streaming_content))
+        assert [(row["id"], row["duplicate_of_id"]) for row in rows] == [
+            (original.id, None),
+            (duplicate.id, original.id),
+        ]
+
+    def test_date_range_and_format(self, company_client, user):
+        StoryFactory(company=user.company, published_date=datetime.date(2025, 4, 1))
+        kept = StoryFactory(
+            company=user.company,
+            published_date=datetime.date(2025, 4, 2),
+        )
+
+        response = company_client.get(
+            reverse("story:export"),
+            {"format": "csv", "from": "2025-04-02"},
+        )
+
+        assert response["Content-Type"] == "text/csv"
+        rows = list(
+            csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())),
+        )
+        assert [row["id"] for row in rows] == [str(kept.id)]
+
+    @pytest.mark.parametrize("params", [{"format": "xml"}, {"from": "April"}])
+    def test_invalid_parameters(self, company_client, params):
+        assert (
+            company_client.get(reverse("story:export"), params).status_code
+            == HTTPStatus.BAD_REQUEST
+        )
+
+
+def test_command_writes_one_company(tmp_path):
+    story = StoryFactory()
+    StoryFactory()  # Another company's
+    out = StringIO()
+    output = tmp_path / "stories.csv"
+
+    call_command("export_stories", "--company", str(story.company_id), stdout=out)
+    call_command(
+        "export_stories",
+        "--format",
+        "csv",
+        "--output",
+        str(output),
+        stderr=StringIO(),
+    )
+
+    assert [row["id"] for row in ndjson_rows(out.getvalue().encode())] == [story.id]
+    # A header and a row per story of every company
+    assert len(output.read_text().splitlines()) == 1 + Story.objects.count()
+
+
+def test_benchmark_reports_every_size():
+    out = StringIO()
+    sizes = ["20", "50"]
+
+    call_command(
+        "bench_story_export",
+        "--sizes",
+        *sizes,
+        "--batch-size",
+        "10",
+        stdout=out,
+    )
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 1 + len(sizes) * len(export.FORMATS)
+    assert lines[-1].split("|")[0].strip() == "50"
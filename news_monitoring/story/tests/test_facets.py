@@ -0,0 +1,285 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from news_monitoring.company import mentions
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source import services as source_services
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story import facets
+from news_monitoring.story import fingerprints
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Story
+from news_monitoring.story.models import StoryDayCount
+from news_monitoring.story.models import StorySourceCount
+from news_monitoring.story.models import StoryTagCount
+from news_monitoring.story.models import make_excerpt
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.story.tests.test_fingerprints import REWRITTEN_BODY
+from news_monitoring.story.tests.test_fingerprints import WIRE_BODY
+from news_monitoring.utils import response_cache
+
+pytestmark = pytest.mark.django_db
+
+APRIL_1 = datetime.date(2025, 4, 1)
+APRIL_2 = datetime.date(2025, 4, 2)
+
+
+def counts():
+    """Every positive count, as {(table, company id, key): count}."""
+    return {
+        (model.__name__, row[0], row[1]): row[2]
+        for model, key in (
+            (StoryDayCount, "day"),
+            (StorySourceCount, "source_id"),
+            (StoryTagCount, "tagged_company_id"),
+        )
+        for row in model.objects.filter(count__gt=0).values_list(
+            "company_id",
+            key,
+            "count",
+        )
+    }
+
+
+def assert_counts_match_a_rebuild():
+    incremental = counts()
+    facets.rebuild()
+    assert incremental == counts()
+
+
+def entry(link, published_date, body="Brief."):
+    return {
+        "title": link,
+        "body_text": body,
+        "excerpt": make_excerpt(body),
+        "article_url": link,
+        "article_url_hash": url_hash(link),
+        "published_date": published_date,
+        **fingerprints.fingerprint_fields(body),
+    }
+
+
+class TestIncrementalCounts:
+    def test_feed_imports_count_new_originals(self, user, settings):
+        settings.STORY_TAGGING = mentions.SOURCE
+        source = SourceFactory()
+        tagged = CompanyFactory()
+        source.tagged_companies.set([tagged])
+        entries = [
+            entry("https://wire.example.com/1", APRIL_1, WIRE_BODY),
+            # A near duplicate of the first
+            entry("https://wire.example.com/2", APRIL_1, REWRITTEN_BODY),
+            entry("https://wire.example.com/3", APRIL_2),
+        ]
+
+        source_services.save_feed_entries(source, user, source.company, entries)
+        # Nothing new
+        source_services.save_feed_entries(source, user, source.company, entries)
+
+        company = source.company_id
+        assert counts() == {
+            ("StoryDayCount", company, APRIL_1): 1,
+            ("StoryDayCount", company, APRIL_2): 1,
+            ("StorySourceCount", company, source.id): 2,
+            ("StoryTagCount", company, tagged.id): 2,
+        }
+        assert_counts_match_a_rebuild()
+
+    def test_entries_stored_since_the_lookup_are_not_counted_again(
+        self,
+        user,
+        settings,
+        monkeypatch,
+    ):
+        settings.STORY_TAGGING = mentions.SOURCE
+        source = SourceFactory()
+        tagged = CompanyFactory()
+        source.tagged_companies.set([tagged])
+        entries = [
+            entry("https://wire.example.com/1", APRIL_1, WIRE_BODY),
+            entry("https://wire.example.com/2", APRIL_1, REWRITTEN_BODY),
+            entry("https://wire.example.com/3", APRIL_2),
+        ]
+        source_services.save_feed_entries(source, user, source.company, entries[:1])
+        # As if another import stored the first entry after this one looked it up
+        monkeypatch.setattr(services, "get_stored_url_hashes", lambda *args: set())
+
+        added = source_services.save_feed_entries(
+            source,
+            user,
+            source.company,
+            entries,
+        )
+
+        company = source.company_id
+        assert added == len(entries[1:])
+        assert counts() == {
+            ("StoryDayCount", company, APRIL_1): 1,
+            ("StoryDayCount", company, APRIL_2): 1,
+            ("StorySourceCount", company, source.id): 2,
+            ("StoryTagCount", company, tagged.id): 2,
+        }
+        assert_counts_match_a_rebuild()
+
+    def test_edits_move_a_story_between_days_and_tags(self, user):
+        user.company = CompanyFactory()
+        first, second = CompanyFactory.create_batch(2)
+        services.update_or_create_story(
+            None,
+            user,
+            "Story",
+            "Body.",
+            APRIL_1,
+            "https://e.com/a",
+            [first.id],
+        )
+        story = Story.objects.get(company=user.company)
+
+        services.update_or_create_story(
+            story,
+            user,
+            "Story",
+            "Body.",
+            APRIL_2,
+            story.article.article_url,
+            [second.id],
+        )
+
+        assert counts() == {
+            ("StoryDayCount", user.company.id, APRIL_2): 1,
+            ("StoryTagCount", user.company.id, second.id): 1,
+        }
+        assert_counts_match_a_rebuild()
+
+    def test_deletes_are_uncounted(self, client, user):
+        user.company = CompanyFactory()
+        user.save()
+        client.force_login(user)
+        source = SourceFactory(company=user.company, added_by=user)
+        kept = StoryFactory(
+            company=user.company,
+            source=source,
+            added_by=user,
+            published_date=APRIL_1,
+        )
+        deleted = StoryFactory(
+            company=user.company,
+            source=source,
+            added_by=user,
+            published_date=APRIL_2,
+        )
+        other_source = SourceFactory(company=user.company, added_by=user)
+        StoryFactory(company=user.company, source=other_source, published_date=APRIL_2)
+        facets.rebuild()
+
+        client.get(reverse("story:delete", args=[deleted.id]))
+        assert counts()[("StorySourceCount", user.company.id, source.id)] == 1
+        client.post(reverse("source:delete", args=[source.id]))
+
+        assert not Story.objects.filter(id=kept.id).exists()
+        assert counts() == {
+            ("StoryDayCount", user.company.id, APRIL_2): 1,
+            ("StorySourceCount", user.company.id, other_source.id): 1,
+        }
+        assert_counts_match_a_rebuild()
+
+    def test_deleting_an_original_counts_its_duplicates(self, client, user):
+        user.company = CompanyFactory()
+        user.save()
+        client.force_login(user)
+        original = StoryFactory(
+            company=user.company,
+            added_by=user,
+            published_date=APRIL_1,
+        )
+        StoryFactory(
+            company=user.company,
+            duplicate_of=original,
+            published_date=APRIL_2,
+        )
+        facets.rebuild()
+
+        client.get(reverse("story:delete", args=[original.id]))
+
+        assert counts() == {("StoryDayCount", user.company.id, APRIL_2): 1}
+        assert_counts_match_a_rebuild()
+
+    def test_relinking_near_duplicates_moves_the_counts(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        company = CompanyFactory()
+        StoryFactory(
+            company=company,
+            article__body_text=WIRE_BODY,
+            published_date=APRIL_1,
+        )
+        StoryFactory(
+            company=company,
+            article__body_text=REWRITTEN_BODY,
+            published_date=APRIL_2,
+        )
+        facets.rebuild()
+        version = response_cache.get_version(response_cache.STORIES, company.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("backfill_story_fingerprints", "--link", stdout=StringIO())
+
+        assert counts() == {("StoryDayCount", company.id, APRIL_1): 1}
+        assert_counts_match_a_rebuild()
+        assert response_cache.get_version(response_cache.STORIES, company.id) > version
+
+
+def test_rebuild_command_fixes_drift():
+    story = StoryFactory(published_date=APRIL_1)
+    StoryDayCount.objects.create(company=story.company, day=APRIL_2, count=7)
+    out = StringIO()
+
+    call_command("rebuild_story_facets", "--company", str(story.company_id), stdout=out)
+
+    assert list(StoryDayCount.objects.values_list("day", "count")) == [(APRIL_1, 1)]
+    assert "StoryDayCount: 1 rows" in out.getvalue()
+
+
+class TestFacetsEndpoint:
+    def test_counts_are_scoped_to_the_company(self, client, user):
+        user.company = CompanyFactory()
+        user.save()
+        client.force_login(user)
+        source = SourceFactory(company=user.company, name="Wire")
+        tagged = CompanyFactory(name="Acme")
+        for day in (APRIL_1, APRIL_2, APRIL_2):
+            StoryFactory(
+                company=user.company,
+                source=source,
+                published_date=day,
+            ).tagged_companies.set([tagged])
+        StoryFactory(published_date=APRIL_1)  # Another company's
+        facets.rebuild()
+
+        data = client.get(reverse("story:facets")).json()
+        in_range = client.get(reverse("story:facets"), {"from": "2025-04-02"}).json()
+
+        assert data == {
+            "days": [
+                {"day": "2025-04-02", "count": 2},
+                {"day": "2025-04-01", "count": 1},
+            ],
+            "sources": [{"id": source.id, "name": "Wire", "count": 3}],
+            "companies": [{"id": tagged.id, "name": "Acme", "count": 3}],
+        }
+        assert in_range["days"] == [{"day": "2025-04-02", "count": 2}]
+
+    def test_staff_see_every_company_summed(self, client, admin_user):
+        client.force_login(admin_user)
+        StoryFactory.create_batch(2, published_date=APRIL_1)
+        facets.rebuild()
+
+        assert client.get(reverse("story:facets")).json()["days"] == [
+            {"day": "2025-04-01", "count": 2},
+        ]
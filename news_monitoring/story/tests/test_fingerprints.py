@@ -0,0 +1,145 @@
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.story import fingerprints
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+
+WIRE_BODY = (
+    "The central bank left its benchmark interest rate unchanged on Thursday, saying "
+    "inflation remained too high to begin cutting, although policy makers signalled "
+    "that easing could start later this year if price pressures in services continue "
+    "to fade."
+)
+REWRITTEN_BODY = WIRE_BODY.replace("on Thursday", "on Thursday morning").replace(
+    "signalled",
+    "said",
+)
+OTHER_BODY = (
+    "Shares of the chip maker jumped after it raised its annual revenue forecast on "
+    "strong demand for data centre processors, and said it would buy back up to five "
+    "billion dollars of stock."
+)
+UNRELATED_SIMILARITY = 0.2  # Unrelated stories share few shingles, well below this
+
+
+def unsaved_article(body):
+    return Article(
+        title="Wire copy",
+        body_text=body,
+        **fingerprints.fingerprint_fields(body),
+    )
+
+
+def make_story(company, body=WIRE_BODY, **kwargs):
+    fields = {
+        f"article__{name}": value
+        for name, value in fingerprints.fingerprint_fields(body).items()
+    }
+    return StoryFactory(company=company, article__body_text=body, **fields, **kwargs)
+
+
+class TestMinhash:
+    def test_rewrites_are_similar_and_other_stories_not(self):
+        original = fingerprints.minhash(WIRE_BODY)
+        threshold, _, _ = fingerprints.get_settings()
+
+        assert (
+            fingerprints.similarity(original, fingerprints.minhash(REWRITTEN_BODY))
+            >= threshold
+        )
+        assert (
+            fingerprints.similarity(original, fingerprints.minhash(OTHER_BODY))
+            < UNRELATED_SIMILARITY
+        )
+
+    def test_rewrites_share_a_band_key(self):
+        original = fingerprints.band_keys(fingerprints.minhash(WIRE_BODY), 16)
+        rewrite = fingerprints.band_keys(fingerprints.minhash(REWRITTEN_BODY), 16)
+        other = fingerprints.band_keys(fingerprints.minhash(OTHER_BODY), 16)
+
+        assert set(original) & set(rewrite)
+        assert not set(original) & set(other)
+
+    def test_short_bodies_are_not_fingerprinted(self):
+        assert fingerprints.fingerprint_fields("Read more on our website") == {
+            "fingerprint": [],
+            "fingerprint_bands": [],
+        }
+
+    def test_bands_must_be_able_to_find_the_threshold(self, settings):
+        settings.NEAR_DUPLICATE_BANDS = 4
+
+        with pytest.raises(ImproperlyConfigured):
+            fingerprints.get_settings()
+
+
+@pytest.mark.django_db
+class TestFindNearDuplicates:
+    def test_stored_and_batch_duplicates_are_found_in_one_query(
+        self,
+        django_assert_num_queries,
+    ):
+        company = CompanyFactory()
+        original = make_story(company)
+        make_story(company, body=REWRITTEN_BODY, duplicate_of=original)
+        make_story(CompanyFactory(), body=OTHER_BODY)
+        new = [
+            unsaved_article(body)
+            for body in (REWRITTEN_BODY, OTHER_BODY, OTHER_BODY, "")
+        ]
+
+        with django_assert_num_queries(1):
+            stored, within = fingerprints.find_near_duplicates(company, new)
+
+        assert stored == {0: original.id}
+        assert within == {2: 1}
+
+    def test_threshold_is_configurable(self, settings):
+        company = CompanyFactory()
+        make_story(company)
+        settings.NEAR_DUPLICATE_THRESHOLD = 1.0
+
+        assert fingerprints.find_near_duplicates(
+            company,
+            [unsaved_article(REWRITTEN_BODY)],
+        ) == ({}, {})
+
+
+@pytest.mark.django_db
+def test_backfill_fingerprints_and_links_duplicates():
+    company = CompanyFactory()
+    original = StoryFactory(company=company, article__body_text=WIRE_BODY)
+    rewrite = StoryFactory(company=company, article__body_text=REWRITTEN_BODY)
+    copy = StoryFactory(company=company, article__body_text=WIRE_BODY)
+    other = StoryFactory(company=company, article__body_text=OTHER_BODY)
+    out = StringIO()
+
+    call_command(
+        "backfill_story_fingerprints",
+        "--link",
+        "--batch-size",
+        "2",
+        stdout=out,
+    )
+
+    assert (
+        f"{company.name}: 4 stories fingerprinted, 2 near duplicates" in out.getvalue()
+    )
+    stories = Story.objects.in_bulk([original.id, rewrite.id, copy.id, other.id])
+    assert len(stories[original.id].article.fingerprint) == fingerprints.PERMUTATIONS
+    _, bands, _ = fingerprints.get_settings()
+    assert len(stories[original.id].article.fingerprint_bands) == bands
+    assert [
+        stories[story.id].duplicate_of_id for story in (original, rewrite, copy, other)
+    ] == [
+        None,
+        original.id,
+        original.id,
+        None,
+    ]
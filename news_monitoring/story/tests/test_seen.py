@@ -0,0 +1,230 @@
+import datetime
+import random
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections
+from django.utils import timezone
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source import services as source_services
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story import seen
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.utils import commits
+
+pytestmark = pytest.mark.django_db
+
+
+def feed_entry(i):
+    link = f"https://wire.example.com/{i}"
+    return {
+        "title": f"Wire story {i}",
+        "body_text": f"Body of wire story {i}.",
+        "excerpt": f"Body of wire story {i}.",
+        "article_url": link,
+        "article_url_hash": url_hash(link),
+        "published_date": datetime.date(2025, 4, 1),
+        "fingerprint": [],
+        "fingerprint_bands": [],
+    }
+
+
+class TestBloomFilter:
+    def test_added_hashes_are_always_found_and_others_rarely(self):
+        rng = random.Random(0)  # noqa: S311
+        capacity, error_rate, others = 1_000, 0.01, 10_000
+        bloom = seen.BloomFilter(*seen.filter_size(capacity, error_rate))
+        added = [rng.getrandbits(64) - 2**63 for _ in range(capacity)]
+        for value in added:
+            bloom.add(value)
+
+        assert all(value in bloom for value in added)
+        false_positives = sum(
+            rng.getrandbits(64) - 2**63 in bloom for _ in range(others)
+        )
+        assert false_positives < 2 * error_rate * others
+        assert error_rate / 2 < bloom.error_rate() < 2 * error_rate
+
+    def test_settings_must_be_valid(self, settings):
+        settings.SEEN_FILTER_ERROR_RATE = 1.5
+
+        with pytest.raises(ImproperlyConfigured):
+            seen.get_settings()
+
+
+class TestGetStoredUrlHashes:
+    def test_only_possible_hits_are_looked_up(self, django_assert_num_queries):
+        company = CompanyFactory()
+        stored = StoryFactory(company=company)
+        new = url_hash("https://news.example.com/new")
+        assert services.get_stored_url_hashes(
+            company,
+            [stored.article_url_hash, new],
+        ) == {stored.article_url_hash}
+
+        # No lookup, the filter rules the hash out, and no catch-up inside its window
+        with django_assert_num_queries(0):
+            assert services.get_stored_url_hashes(company, [new]) == set()
+
+        stats = seen.get_stats()
+        assert (
+            stats[seen.CHECKED],
+            stats[seen.RULED_OUT] + stats[seen.FALSE_POSITIVES],
+            stats[seen.LOOKUPS],
+            stats[seen.AVOIDED],
+            stats[seen.CATCH_UP_QUERIES],
+        ) == (3, 2, 1, 1, seen.QUERIES_PER_CATCH_UP)
+        assert stats["queries_saved"] == 1 - seen.QUERIES_PER_CATCH_UP
+
+    def test_local_filters_catch_up_once_per_window(
+        self,
+        monkeypatch,
+        django_assert_num_queries,
+    ):
+        company = CompanyFactory()
+        filters = seen.get_filters()
+        clock = [0.0]
+        monkeypatch.setattr(seen.time, "monotonic", lambda: clock[0])
+        services.get_stored_url_hashes(company, [])
+        stored = StoryFactory(company=company)  # As another process would store it
+
+        clock[0] += filters.catch_up_seconds - 1
+        with django_assert_num_queries(0):
+            filters.possibly_seen(company.id, [stored.article_url_hash])
+        clock[0] += 1
+        with django_assert_num_queries(seen.QUERIES_PER_CATCH_UP):
+            assert filters.possibly_seen(company.id, [stored.article_url_hash]) == {
+                stored.article_url_hash,
+            }
+        assert seen.get_stats()[seen.CATCH_UP_QUERIES] == (
+            2 * seen.QUERIES_PER_CATCH_UP
+        )
+
+    def test_stories_stored_elsewhere_are_caught_up(self, settings):
+        settings.SEEN_FILTER_CATCH_UP_SECONDS = 0
+        company = CompanyFactory()
+        services.get_stored_url_hashes(company, [])
+
+        # As another process would store it, without this process's filter hearing of it
+        stored = StoryFactory(company=company)
+
+        assert services.get_stored_url_hashes(company, [stored.article_url_hash]) == {
+            stored.article_url_hash,
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stories_committed_after_a_check_are_caught_up(
+        self,
+        monkeypatch,
+        settings,
+    ):
+        settings.SEEN_FILTER_CATCH_UP_SECONDS = 0
+        monkeypatch.setattr(commits, "SETTLE", datetime.timedelta(0))
+        company = CompanyFactory()
+        story = StoryFactory(company=company)
+        stored = url_hash("https://news.example.com/late")
+        other = connections.create_connection("default")
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as other_cursor:
+                # As a slow import would store it: stamped now, committed later
+                other_cursor.execute("SELECT 1")
+                other_cursor.execute(
+                    f"UPDATE {Story._meta.db_table} "  # noqa: S608
+                    "SET article_url_hash = %s, updated_on = %s WHERE id = %s",
+                    [stored, timezone.now(), story.id],
+                )
+                services.get_stored_url_hashes(company, [])
+                other.commit()
+        finally:
+            other.close()
+
+        assert services.get_stored_url_hashes(company, [stored]) == {stored}
+
+    def test_the_filter_can_be_off(self, settings, django_assert_num_queries):
+        settings.SEEN_FILTER_BACKEND = seen.OFF
+        company = CompanyFactory()
+
+        with django_assert_num_queries(1):
+            services.get_stored_url_hashes(
+                company,
+                [url_hash("https://news.example.com/new")],
+            )
+
+    def test_imports_add_the_hashes_they_store(self, monkeypatch):
+        source = SourceFactory()
+        source_services.save_feed_entries(
+            source,
+            source.added_by,
+            source.company,
+            [feed_entry(0)],
+        )
+        filters = seen.get_filters()
+        monkeypatch.setattr(
+            filters,
+            "_caught_up",
+            lambda company_id: filters._filters[company_id][0],  # noqa: SLF001
+        )
+
+        source_services.save_feed_entries(
+            source,
+            source.added_by,
+            source.company,
+            [feed_entry(1)],
+        )
+
+        assert seen.possibly_seen(
+            source.company_id,
+            [feed_entry(0)["article_url_hash"]],
+        ) == {
+            feed_entry(0)["article_url_hash"],
+        }
+        assert seen.possibly_seen(
+            source.company_id,
+            [feed_entry(1)["article_url_hash"]],
+        ) == {
+            feed_entry(1)["article_url_hash"],
+        }
+
+
+class TestRedisFallback:
+    def test_local_filters_stand_in_while_redis_is_down(self):
+        filters = seen.RedisFilters(
+            "redis://127.0.0.1:1/0",
+            *seen.filter_size(1_000, 0.01),
+        )
+        stored = StoryFactory()
+        new = url_hash("https://news.example.com/new")
+
+        assert filters.possibly_seen(
+            stored.company_id,
+            [stored.article_url_hash, new],
+        ) == {stored.article_url_hash}
+
+        filters.add(stored.company_id, [new])
+        assert filters._unsent == {stored.company_id: {new}}  # noqa: SLF001
+
+
+class TestCommands:
+    def test_rebuild_needs_a_shared_backend(self):
+        out = StringIO()
+
+        call_command("rebuild_seen_filter", stdout=out)
+
+        assert "keeps no filters to rebuild" in out.getvalue()
+
+    def test_stats_are_printed_and_reset(self):
+        seen.record(10, 2, 1)
+        out = StringIO()
+
+        call_command("seen_filter_stats", "--reset", stdout=out)
+
+        values = [value.strip() for value in out.getvalue().splitlines()[1].split("|")]
+        assert values == ["10", "8", "1", "11.11%", "1", "0", "0", "0"]
+        assert seen.get_stats()[seen.CHECKED] == 0
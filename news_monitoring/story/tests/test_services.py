@@ -0,0 +1,212 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.source.models import Source
+from news_monitoring.source.tests.factories import SourceFactory
+from news_monitoring.story import services
+from news_monitoring.story.canonical import url_hash
+from news_monitoring.story.models import Article
+from news_monitoring.story.models import Story
+from news_monitoring.story.tests.factories import StoryFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestGetExistingUrlHashes:
+    def test_only_hashes_of_the_company_are_returned(self, django_assert_num_queries):
+        company = CompanyFactory()
+        stored = StoryFactory(company=company)
+        other = StoryFactory()
+
+        with django_assert_num_queries(1):
+            existing = services.get_existing_url_hashes(
+                company,
+                [
+                    stored.article_url_hash,
+                    other.article_url_hash,
+                    url_hash("https://news.example.com/new"),
+                ],
+            )
+
+        assert existing == {stored.article_url_hash}
+
+    def test_large_lists_are_resolved_in_batches(self, django_assert_num_queries):
+        company = CompanyFactory()
+        stories = StoryFactory.create_batch(5, company=company)
+        hashes = [story.article_url_hash for story in stories]
+        hashes += [url_hash(f"https://news.example.com/x/{i}") for i in range(5)]
+
+        with django_assert_num_queries(5):
+            existing = services.get_existing_url_hashes(company, hashes, batch_size=2)
+
+        assert existing == {story.article_url_hash for story in stories}
+
+
+class TestUpdateOrCreateStory:
+    def test_tags_are_replaced_on_edit(self, user):
+        user.company = CompanyFactory()
+        first, second = CompanyFactory.create_batch(2)
+        story = StoryFactory(company=user.company, added_by=user)
+        story.tagged_companies.set([first])
+
+        success = services.update_or_create_story(
+            story,
+            user,
+            "Edited",
+            "Body",
+            "2025-04-02",
+            story.article.article_url,
+            [str(second.id)],
+        )
+
+        assert success
+        assert list(story.tagged_companies.all()) == [second]
+
+
+class TestGetStories:
+    def test_near_duplicates_are_listed_through_their_original(self, user):
+        user.company = CompanyFactory()
+        original = StoryFactory(company=user.company)
+        StoryFactory(company=user.company, duplicate_of=original)
+
+        assert list(services.get_stories(user, "", None)) == [original]
+
+
+class TestStoryIndexes:
+    """Story list queries must stay on their indexes, or they grow with every tenant."""
+
+    @pytest.fixture
+    def tenant(self, user):
+        """
+        A user whose company shares the table with another company.
+
+        Both follow the same 2000 articles over 500 days.
+        """
+        user.company = CompanyFactory()
+        articles = Article.objects.bulk_create(
+            Article(
+                title=f"Story {i}",
+                body_text="",
+                article_url=f"https://example.com/{i}",
+                article_url_hash=i,
+                published_date=datetime.date(2024, 1, 1)
+                + datetime.timedelta(days=i % 500),
+            )
+            for i in range(2000)
+        )
+        for company in (user.company, CompanyFactory()):
+            source = SourceFactory(company=company)
+            Story.objects.bulk_create(
+                Story(
+                    company=company,
+                    source=source,
+                    added_by=user,
+                    article=article,
+                    article_url_hash=article.article_url_hash,
+                    published_date=article.published_date,
+                )
+                for article in articles
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Article._meta.db_table}, {Story._meta.db_table}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return user
+
+    @pytest.mark.parametrize(
+        ("date_from", "date_to"),
+        [
+            (None, None),
+            (datetime.date(2025, 4, 1), None),
+            (datetime.date(2025, 4, 1), datetime.date(2025, 4, 30)),
+        ],
+    )
+    def test_company_list_pages_by_date_on_the_company_index(
+        self,
+        tenant,
+        date_from,
+        date_to,
+    ):
+        stories_qs = services.get_stories(tenant, "", None, date_from, date_to)
+
+        plan = stories_qs.order_by(*services.STORY_ORDERING)[:11].explain()
+
+        assert "story_company_published_idx" in plan
+        assert "Sort" not in plan
+
+    def test_exact_day_uses_the_company_index(self, tenant):
+        plan = services.get_stories(tenant, "", datetime.date(2025, 4, 1)).explain()
+
+        assert "story_company_published_idx" in plan
+
+    def test_staff_list_pages_on_the_date_index(self, tenant):
+        tenant.is_staff = True
+        stories_qs = services.get_stories(tenant, "", None, datetime.date(2025, 4, 1))
+
+        plan = stories_qs.order_by(*services.STORY_ORDERING)[:11].explain()
+
+        assert "story_published_idx" in plan
+        assert "Sort" not in plan
+
+    def test_source_stories_by_date_use_the_source_index(self, tenant):
+        source = Source.objects.get(company=tenant.company)
+
+        plan = Story.objects.filter(
+            source=source,
+            published_date__gte=datetime.date(2025, 4, 1),
+        ).explain()
+
+        assert "story_source_published_idx" in plan
+
+
+class TestStoryExcerpt:
+    def test_is_kept_in_sync_on_save(self):
+        story = StoryFactory(article__body_text="x" * 101)
+        assert story.article.excerpt == "x" * 100 + "..."
+
+        story.article.body_text = "Short."
+        story.article.save(update_fields=["body_text"])
+
+        story.article.refresh_from_db()
+        assert story.article.excerpt == "Short."
+
+    def test_backfill_fills_missing_excerpts(self):
+        long, short = (
+            StoryFactory(article__body_text="é" * 150),
+            StoryFactory(article__body_text="Brief."),
+        )
+        articles_qs = Article.objects.filter(id__in=[long.article_id, short.article_id])
+        articles_qs.update(excerpt="")
+
+        call_command("backfill_story_excerpts", "--batch-size", "1", stdout=StringIO())
+
+        assert dict(articles_qs.values_list("id", "excerpt")) == {
+            long.article_id: "é" * 100 + "...",
+            short.article_id: "Brief.",
+        }
+
+    def test_benchmark_shows_the_excerpt_transfers_less(self):
+        out = StringIO()
+
+        call_command(
+            "bench_story_excerpt",
+            "--stories",
+            "50",
+            "--page-size",
+            "10",
+            "--repeat",
+            "1",
+            stdout=out,
+        )
+
+        rows = {
+            line.split("|")[0].strip(): line.split("|")
+            for line in out.getvalue().splitlines()[1:]
+        }
+        assert int(rows["excerpt"][1].replace(",", "")) < int(
+            rows["full body"][1].replace(",", ""),
+        )
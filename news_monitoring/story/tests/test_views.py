@@ -0,0 +1,357 @@
+import datetime
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from news_monitoring.company.tests.factories import CompanyFactory
+from news_monitoring.story import services
+from news_monitoring.story.tests.factories import StoryFactory
+from news_monitoring.utils import response_cache
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def company_client(client, user):
+    user.company = CompanyFactory()
+    user.save()
+    client.force_login(user)
+    return client
+
+
+def fetch(client, **params):
+    response = client.get(reverse("story:fetch"), params)
+    assert response.status_code == HTTPStatus.OK
+    return response.json()
+
+
+class TestFetchStories:
+    def test_pages_are_walked_with_cursors(self, company_client, user):
+        # Three stories per day, so pages break inside a day and the id decides
+        start = datetime.date(2025, 4, 1)
+        stories = [
+            StoryFactory(
+                company=user.company,
+                published_date=start + datetime.timedelta(days=i // 3),
+            )
+            for i in range(25)
+        ]
+        StoryFactory()  # Another company's
+        expected = [
+            story.id
+            for story in sorted(
+                stories,
+                key=lambda s: (s.published_date, s.id),
+                reverse=True,
+            )
+        ]
+
+        first = fetch(company_client)
+        second = fetch(company_client, cursor=first["next_cursor"])
+        third = fetch(company_client, cursor=second["next_cursor"])
+
+        assert [
+            story["id"] for page in (first, second, third) for story in page["stories"]
+        ] == expected
+        assert (first["has_previous"], first["has_next"]) == (False, True)
+        assert (second["has_previous"], second["has_next"]) == (True, True)
+        assert (third["has_previous"], third["has_next"]) == (True, False)
+        assert "total_pages" not in first
+
+        back = fetch(company_client, cursor=third["previous_cursor"])
+        assert back["stories"] == second["stories"]
+        first_again = fetch(company_client, cursor=back["previous_cursor"])
+        assert first_again["stories"] == first["stories"]
+        assert (first_again["has_previous"], first_again["has_next"]) == (False, True)
+
+    def test_filters_apply_to_every_page(self, company_client, user):
+        StoryFactory.create_batch(12, company=user.company, article__title="Rates hold")
+        StoryFactory.create_batch(3, company=user.company, article__title="Oil slips")
+
+        first = fetch(company_client, q="rates")
+        second = fetch(company_client, q="rates", cursor=first["next_cursor"])
+
+        assert [len(first["stories"]), len(second["stories"])] == [10, 2]
+        assert not second["has_next"]
+
+    def test_date_ranges_are_inclusive(self, company_client, user):
+        for day in range(1, 6):
+            StoryFactory(
+                company=user.company,
+                article__title=f"April {day}",
+                published_date=datetime.date(2025, 4, day),
+            )
+
+        def titles(**params):
+            return [
+                story["title"] for story in fetch(company_client, **params)["stories"]
+            ]
+
+        assert titles(**{"from": "2025-04-02", "to": "2025-04-04"}) == [
+            "April 4",
+            "April 3",
+            "April 2",
+        ]
+        assert titles(**{"from": "2025-04-04"}) == ["April 5", "April 4"]
+        assert titles(to="2025-04-01") == ["April 1"]
+        assert titles(date="2025-04-03") == ["April 3"]
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"from": "2025-13-01"}, {"to": "yesterday"}, {"date": "2025-02-30"}],
+    )
+    def test_invalid_dates_are_rejected(self, company_client, params):
+        response = company_client.get(reverse("story:fetch"), params)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_search_matches_title_and_body_by_stem(self, company_client, user):
+        def story(title, body_text):
+            return StoryFactory(
+                company=user.company,
+                article__title=title,
+                article__body_text=body_text,
+            )
+
+        in_title = story("Acme plans mergers", "Terms undisclosed.")
+        in_body = story("Deal day", "The merger of two rivals closed.")
+        story("Merge conflict", "Emerging markets rallied.")
+        story("Oil slips", "Crude fell on supply news.")
+
+        assert {
+            story["id"] for story in fetch(company_client, q="merger")["stories"]
+        } == {in_title.id, in_body.id}
+        assert [
+            story["id"]
+            for story in fetch(company_client, q="merger -rivals")["stories"]
+        ] == [in_title.id]
+        assert (
+            fetch(company_client, q='"supply news"')["stories"][0]["title"]
+            == "Oil slips"
+        )
+
+    def test_relevance_order_is_walked_with_cursors(self, company_client, user):
+        # Title matches outrank body matches; more mentions outrank fewer
+        def story(title, body_text):
+            return StoryFactory(
+                company=user.company,
+                article__title=title,
+                article__body_text=body_text,
+            )
+
+        body = [story(f"Update {i}", "Rates were held.") for i in range(8)]
+        repeated = story("Update", "Rates, rates and rates.")
+        titled = [story("Rates held", "No change.") for _ in range(3)]
+        expected = (
+            [story.id for story in reversed(titled)]
+            + [repeated.id]
+            + [story.id for story in reversed(body)]
+        )
+
+        first = fetch(company_client, q="rates", order="relevance")
+        second = fetch(
+            company_client,
+            q="rates",
+            order="relevance",
+            cursor=first["next_cursor"],
+        )
+        back = fetch(
+            company_client,
+            q="rates",
+            order="relevance",
+            cursor=second["previous_cursor"],
+        )
+
+        assert [
+            story["id"] for page in (first, second) for story in page["stories"]
+        ] == expected
+        assert back["stories"] == first["stories"]
+
+    def test_relevance_without_search_is_newest_first(self, company_client, user):
+        older = StoryFactory(
+            company=user.company,
+            published_date=datetime.date(2025, 4, 1),
+        )
+        newer = StoryFactory(
+            company=user.company,
+            published_date=datetime.date(2025, 4, 2),
+        )
+
+        assert [
+            story["id"] for story in fetch(company_client, order="relevance")["stories"]
+        ] == [newer.id, older.id]
+
+    def test_stories_are_serialized_in_one_query(
+        self,
+        company_client,
+        user,
+        django_assert_num_queries,
+    ):
+        acme, globex = CompanyFactory(name="Acme"), CompanyFactory(name="Globex")
+        long = StoryFactory(
+            company=user.company,
+            article__title="Long",
+            article__body_text="Ä" * 150,
+            published_date=datetime.date(2025, 4, 2),
+        )
+        long.tagged_companies.set([globex, acme])
+        StoryFactory(
+            company=user.company,
+            article__title="Short",
+            article__body_text="Brief.",
+            published_date=datetime.date(2025, 4, 1),
+        )
+
+        # The request savepoint, session, user and the page
+        with django_assert_num_queries(5):
+            stories = fetch(company_client)["stories"]
+
+        assert stories == [
+            {
+                "id": long.id,
+                "title": "Long",
+                "article_url": long.article.article_url,
+                "published_date": "2025-04-02",
+                "body_text": "Ä" * 100 + "...",
+                "tagged_companies": ["Acme", "Globex"],
+            },
+            {
+                "id": stories[1]["id"],
+                "title": "Short",
+                "article_url": stories[1]["article_url"],
+                "published_date": "2025-04-01",
+                "body_text": "Brief.",
+                "tagged_companies": [],
+            },
+        ]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["not-a-cursor", "eyJrIjpbXX0", "eyJrIjpbIngiLCAxXSwgImIiOiBmYWxzZX0"],
+    )
+    def test_tampered_cursors_are_rejected(self, company_client, cursor):
+        response = company_client.get(reverse("story:fetch"), {"cursor": cursor})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestResponseCache:
+    def test_repeated_polls_are_served_from_the_cache(
+        self,
+        company_client,
+        user,
+        django_assert_num_queries,
+    ):
+        StoryFactory.create_batch(3, company=user.company)
+        first = fetch(company_client, q="story")
+
+        # The request savepoint, session and user only
+        with django_assert_num_queries(4):
+            assert fetch(company_client, q="story") == first
+        fetch(company_client, q="other")
+
+        stats = response_cache.get_stats()[response_cache.STORIES]
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (
+            1,
+            2,
+            pytest.approx(1 / 3),
+        )
+
+    def test_writes_retire_the_company_pages(
+        self,
+        company_client,
+        user,
+        django_capture_on_commit_callbacks,
+    ):
+        other_company = CompanyFactory()
+        StoryFactory(company=user.company, article__title="First")
+        assert len(fetch(company_client)["stories"]) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            services.update_or_create_story(
+                None,
+                user,
+                "Second",
+                "Body.",
+                datetime.date(2025, 4, 2),
+                "https://example.com/second",
+                [],
+            )
+        assert [story["title"] for story in fetch(company_client)["stories"]] == [
+            "Second",
+            "First",
+        ]
+
+        second = user.added_stories.get(article__title="Second")
+        with django_capture_on_commit_callbacks(execute=True):
+            company_client.get(reverse("story:delete", args=[second.id]))
+        assert [story["title"] for story in fetch(company_client)["stories"]] == [
+            "First",
+        ]
+
+        version = response_cache.get_version(response_cache.STORIES, other_company.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            response_cache.invalidate(user.company_id, response_cache.STORIES)
+        assert (
+            response_cache.get_version(response_cache.STORIES, other_company.id)
+            == version
+        )
+
+    def test_errors_are_not_cached(self, company_client):
+        for _ in range(2):
+            response = company_client.get(
+                reverse("story:fetch"),
+                {"cursor": "not-a-cursor"},
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        assert response_cache.get_stats()[response_cache.STORIES]["hits"] == 0
+
+
+def test_pagination_benchmark_runs():
+    out = StringIO()
+
+    call_command(
+        "bench_story_pagination",
+        "--stories",
+        "300",
+        "--pages",
+        "1",
+        "20",
+        "--repeat",
+        "1",
+        stdout=out,
+    )
+
+    assert [line.split()[0] for line in out.getvalue().splitlines()[1:]] == ["1", "20"]
+
+
+def test_search_benchmark_runs():
+    out = StringIO()
+
+    call_command("bench_story_search", "--stories", "300", "--repeat", "1", stdout=out)
+
+    assert [line.split()[0] for line in out.getvalue().splitlines()[2:]] == [
+        "merger",
+        "oil",
+        "rare42",
+        '"supply',
+    ]
+
+
+def test_serialization_benchmark_runs():
+    out = StringIO()
+
+    call_command(
+        "bench_story_serialization",
+        "--page-size",
+        "20",
+        "--repeat",
+        "1",
+        stdout=out,
+    )
+
+    assert out.getvalue().startswith("Same data: True")
@@ -8,5 +8,16 @@ urlpatterns = [
     path("add/", views.add_or_edit, name="add"),
     path("edit/<int:story_id>/", views.add_or_edit, name="edit"),
     path("delete/<int:story_id>/", views.delete, name="delete"),
-    path("fetch-story/", views.fetch_stories, name="fetch")
+    path("fetch-story/", views.fetch_stories, name="fetch"),
+    path("facets/", views.fetch_facets, name="facets"),
+    path("export/", views.export_stories, name="export"),
+    path("changes/", views.fetch_changes, name="changes"),
+    path("searches/", views.saved_searches, name="searches"),
+    path(
+        "searches/<int:search_id>/delete/",
+        views.delete_saved_search,
+        name="delete-search",
+    ),
+    path("notifications/", views.fetch_notifications, name="notifications"),
+    path("notifications/read/", views.read_notifications, name="read-notifications"),
 ]
@@ -1,12 +1,19 @@
+from django import shortcuts
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django import shortcuts
 from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 
-from news_monitoring.story.models import Story
 from news_monitoring.company.models import Company
+from news_monitoring.story import alerts
+from news_monitoring.story import changes
+from news_monitoring.story import export
 from news_monitoring.story import services
+from news_monitoring.story.models import SavedSearch
+from news_monitoring.story.models import Story
+from news_monitoring.utils import pagination
+from news_monitoring.utils import response_cache
+from news_monitoring.utils.responses import FastJsonResponse
 
 
 @login_required
@@ -26,44 +33,195 @@ def add_or_edit(request, story_id=None):
                 {
                     "error": "Title and URL are required!",
                     "story": story,  # Pass css data if editing
-                    "tagged_companies": tagged_companies
+                    "tagged_companies": tagged_companies,
                 },
             )
         return shortcuts.redirect("story:list")
 
     if story_id:
         story, tagged_companies = services.get_story(request.user, story_id)
-        companies = Company.objects.filter(id__in=[company for company in tagged_companies])
+        companies = Company.objects.filter(
+            id__in=[company for company in tagged_companies],
+        )
 
     return shortcuts.render(
         request,
         "story/add_story.html",
-        {
-            "story": story,
-            "companies": companies,
-            "tagged_companies": tagged_companies
-        }
+        {"story": story, "companies": companies, "tagged_companies": tagged_companies},
     )
 
 
 @login_required
 def list_stories(request):
-    return shortcuts.render(request, 'story/list_stories.html')
+    return shortcuts.render(request, "story/list_stories.html")
 
 
 @login_required
 def fetch_stories(request):
-    search_query = request.GET.get('q', '').strip()
-    filter_date = request.GET.get('date', '').strip()
-    page_number = request.GET.get('page')
+    search_query = request.GET.get("q", "").strip()
+    filter_date = request.GET.get("date", "").strip()
+    date_from = request.GET.get("from", "").strip()
+    date_to = request.GET.get("to", "").strip()
+    cursor = request.GET.get("cursor", "").strip()
+    order = request.GET.get("order", services.RECENT).strip()
+
+    def build():
+        try:
+            dates = [
+                services.parse_day(value) for value in (filter_date, date_from, date_to)
+            ]
+        except ValueError:
+            return JsonResponse({"error": "Invalid date"}, status=400)
+
+        stories_qs = services.get_stories(request.user, search_query, *dates)
+        try:
+            return FastJsonResponse(
+                services.get_stories_json(stories_qs, cursor, order),
+            )
+        except pagination.InvalidCursorError:
+            return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+    params = {
+        "q": search_query,
+        "date": filter_date,
+        "from": date_from,
+        "to": date_to,
+        "cursor": cursor,
+        "order": order,
+    }
+    return response_cache.cached_json(
+        response_cache.STORIES,
+        request.user,
+        params,
+        build,
+    )
+
+
+@login_required
+def fetch_facets(request):
+    """Story counts per day, source and company for the list's ``from``/``to``."""
+    date_from = request.GET.get("from", "").strip()
+    date_to = request.GET.get("to", "").strip()
+
+    def build():
+        try:
+            dates = [services.parse_day(value) for value in (date_from, date_to)]
+        except ValueError:
+            return JsonResponse({"error": "Invalid date"}, status=400)
+        return FastJsonResponse(services.get_story_facets(request.user, *dates))
+
+    params = {"facets": True, "from": date_from, "to": date_to}
+    return response_cache.cached_json(
+        response_cache.STORIES,
+        request.user,
+        params,
+        build,
+    )
+
+
+@login_required
+def fetch_changes(request):
+    """Stories added, edited or deleted since ``cursor``; see ``get_story_changes``."""
+    cursor = request.GET.get("cursor", "").strip()
+    try:
+        return FastJsonResponse(services.get_story_changes(request.user, cursor))
+    except changes.ExpiredCursorError:
+        return JsonResponse({"error": "Cursor expired, reload the stories"}, status=410)
+    except pagination.InvalidCursorError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+
 
-    stories_qs = services.get_stories(request.user, search_query, filter_date)
-    return JsonResponse(services.get_stories_json(stories_qs, page_number))
+@login_required
+def saved_searches(request):
+    """List the user's saved searches, or save the POSTed ``name`` and ``query``."""
+    if request.method != "POST":
+        return FastJsonResponse(services.get_saved_searches_json(request.user))
+
+    name = request.POST.get("name", "").strip()
+    query = request.POST.get("query", "").strip()
+    if not name or not query:
+        return JsonResponse({"error": "Name and query are required"}, status=400)
+    if request.user.company_id is None:
+        return JsonResponse({"error": "Join a company to save searches"}, status=400)
+    try:
+        search = services.create_saved_search(request.user, name, query)
+    except alerts.UnanchoredQueryError:
+        return JsonResponse(
+            {"error": "The query needs a word matching stories must contain"},
+            status=400,
+        )
+    return JsonResponse(
+        {"id": search.id, "name": search.name, "query": search.query},
+        status=201,
+    )
+
+
+@login_required
+def delete_saved_search(request, search_id):
+    if request.method == "POST":
+        search = services.get_object_or_404(
+            SavedSearch,
+            id=search_id,
+            user=request.user,
+        )
+        search.delete()  # Its notifications go with it
+        return JsonResponse({"deleted": search_id})
+    return JsonResponse({"error": "Invalid request method"}, status=400)
+
+
+@login_required
+def fetch_notifications(request):
+    """The user's saved-search notifications; see ``get_notifications_json``."""
+    cursor = request.GET.get("cursor", "").strip()
+    try:
+        return FastJsonResponse(services.get_notifications_json(request.user, cursor))
+    except pagination.InvalidCursorError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+
+@login_required
+def read_notifications(request):
+    """Mark the POSTed ``id`` notifications read, or every unread one without any."""
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=400)
+    try:
+        notification_ids = [int(value) for value in request.POST.getlist("id")] or None
+    except ValueError:
+        return JsonResponse({"error": "Invalid notification id"}, status=400)
+    return JsonResponse(
+        {"read": services.mark_notifications_read(request.user, notification_ids)},
+    )
+
+
+@login_required
+def export_stories(request):
+    """Stream every story of the user's company as ``ndjson`` (default) or ``csv``."""
+    export_format = request.GET.get("format", export.NDJSON).strip()
+    if export_format not in export.FORMATS:
+        return JsonResponse({"error": "Invalid format"}, status=400)
+    try:
+        dates = [
+            services.parse_day(request.GET.get(name, "").strip())
+            for name in ("from", "to")
+        ]
+    except ValueError:
+        return JsonResponse({"error": "Invalid date"}, status=400)
+
+    response = StreamingHttpResponse(
+        export.export_stories(
+            services.get_export_stories(request.user, *dates),
+            export_format,
+        ),
+        content_type=export.CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="stories.{export_format}"'
+    return response
 
 
 @login_required
 def delete(request, story_id):
     story = services.get_object_or_404(Story, id=story_id, added_by=request.user)
-    story.delete()
+    services.delete_stories(Story.objects.filter(id=story.id))
+    response_cache.invalidate(story.company_id, response_cache.STORIES)
     messages.success(request, "Story deleted successfully.")
     return shortcuts.redirect("story:list")
@@ -0,0 +1,35 @@
+"""
+The time up to which every change stamped in ``updated_on`` style is committed.
+
+Timestamps are taken from the clock before their transaction commits, so a
+change can become visible long after changes stamped later: an import that
+spends seconds tagging and matching commits rows older than ones a quicker
+request committed meanwhile. Readers that remember how far they have read (the
+changes feed, the mention matchers, the seen filters) must only trust rows up
+to :func:`horizon`: no transaction open with writes started later, so none can
+still commit an older stamp.
+
+``SETTLE`` is kept as a margin for a transaction that has stamped a change but
+not written it yet (PostgreSQL only lists it as writing once it has), and for
+clock drift between the web and database hosts.
+"""
+
+import datetime
+
+from django.db import connection
+
+SETTLE = datetime.timedelta(seconds=2)
+OLDEST_OPEN_WRITE_SQL = """
+    SELECT min(xact_start) FROM pg_stat_activity
+    WHERE backend_xid IS NOT NULL
+        AND pid <> pg_backend_pid()
+        AND datname = current_database()
+"""
+
+
+def horizon(now):
+    """Return the time up to which every change is committed: ``now`` or older."""
+    with connection.cursor() as cursor:
+        cursor.execute(OLDEST_OPEN_WRITE_SQL)
+        (oldest,) = cursor.fetchone()
+    return min(now, oldest or now) - SETTLE
@@ -0,0 +1,157 @@
+"""
+Keyset (cursor) pagination.
+
+Offset pagination counts the whole result and scans past every skipped row, so
+deep pages get slower the deeper they are. Keyset pagination instead remembers
+the sort key of the last row shown and asks for the rows after it, which an index
+on the sort key answers in the same time on every page.
+
+Cursors are opaque to clients: URL-safe base64 of the boundary row's sort key and
+the paging direction.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursorError(ValueError):
+    """The cursor was not issued by :func:`paginate` for this ordering."""
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder cuts datetimes to milliseconds; sort keys must round-trip
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, *, backwards=False):
+    payload = json.dumps(
+        {"k": values, "b": backwards},
+        cls=_CursorEncoder,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _output_field(queryset, name):
+    annotation = queryset.query.annotations.get(name)
+    return (
+        annotation.output_field
+        if annotation is not None
+        else queryset.model._meta.get_field(name)
+    )
+
+
+def decode_cursor(cursor, queryset, fields):
+    """Return a cursor's sort key and direction, its values converted to field types."""
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)),
+        )
+        values, backwards = payload["k"], payload["b"]
+        values = [
+            _output_field(queryset, field).to_python(value)
+            for field, value in zip(fields, values, strict=True)
+        ]
+    except (
+        binascii.Error,
+        UnicodeDecodeError,
+        ValueError,
+        KeyError,
+        TypeError,
+        ValidationError,
+    ) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(backwards, bool) or None in values:
+        raise InvalidCursorError(cursor)
+    return values, backwards
+
+
+def _beyond(fields, values, lookup):
+    """
+    Rows whose key is beyond ``values`` in one direction, compared lexicographically.
+
+    The leading inclusive bound on the first field is implied by the rest; it is
+    spelled out so the database can use it as an index range.
+    """
+    condition = Q(**{f"{fields[-1]}__{lookup}": values[-1]})
+    for field, value in zip(reversed(fields[:-1]), reversed(values[:-1]), strict=True):
+        condition = Q(**{f"{field}__{lookup}": value}) | (
+            Q(**{field: value}) & condition
+        )
+    return Q(**{f"{fields[0]}__{lookup}e": values[0]}) & condition
+
+
+def _key(item, fields):
+    return [
+        item[field] if isinstance(item, dict) else getattr(item, field)
+        for field in fields
+    ]
+
+
+def paginate(queryset, ordering, cursor=None, page_size=10):
+    """
+    Return one page of ``queryset`` in ``ordering``, starting after ``cursor``.
+
+    Args:
+        queryset (QuerySet): Rows to page through, as instances or ``values()`` dicts.
+        ordering (Sequence[str]): Field or annotation names, all ascending or all
+            descending ("-" prefix), ending with a unique field so every row has its
+            own key.
+        cursor (str, optional): ``next_cursor`` or ``previous_cursor`` of another
+            page; the first page when empty.
+        page_size (int): Rows per page.
+
+    Raises:
+        InvalidCursorError: The cursor cannot be decoded for this ordering.
+    """
+    fields = [field.lstrip("-") for field in ordering]
+    descending = ordering[0].startswith("-")
+    if any(field.startswith("-") != descending for field in ordering):
+        msg = "Keyset ordering must be all ascending or all descending."
+        raise ValueError(msg)
+
+    backwards = False
+    if cursor:
+        values, backwards = decode_cursor(cursor, queryset, fields)
+        lookup = "lt" if descending != backwards else "gt"
+        queryset = queryset.filter(_beyond(fields, values, lookup))
+    if backwards:
+        ordering = [field[1:] if descending else f"-{field}" for field in ordering]
+
+    items = list(queryset.order_by(*ordering)[: page_size + 1])
+    more = len(items) > page_size
+    items = items[:page_size]
+    if backwards:
+        items.reverse()
+
+    page = KeysetPage(items)
+    if items and (more or backwards):
+        page.next_cursor = encode_cursor(_key(items[-1], fields))
+    if items and (more if backwards else bool(cursor)):
+        page.previous_cursor = encode_cursor(_key(items[0], fields), backwards=True)
+    return page
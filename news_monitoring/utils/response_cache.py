@@ -0,0 +1,148 @@
+"""
+Per-company cache of the list pages' JSON responses.
+
+The list pages poll ``story:fetch`` and ``source:fetch_sources`` with the same
+parameters over and over, and each poll rebuilt the same page. Responses are now
+cached under a key made of the namespace ("stories" or "sources"), the company,
+a version number of that company's data in the namespace and a hash of the
+request parameters.
+
+Nothing is deleted on writes: :func:`invalidate` bumps the version once the
+writing transaction commits, so every cached page of the company is skipped at
+once and expires on its own. Staff see every company's rows under the ``all``
+scope, whose version is bumped with each company's.
+
+Hits and misses are counted per namespace in the cache itself (see
+``manage.py response_cache_stats``).
+"""
+
+import contextlib
+import hashlib
+import json
+import time
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+STORIES = "stories"
+SOURCES = "sources"
+NAMESPACES = (STORIES, SOURCES)
+ALL_COMPANIES = "all"
+
+HITS = "hits"
+MISSES = "misses"
+
+
+def _timeout():
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+
+def _version_key(namespace, scope):
+    return f"response-cache:{namespace}:{scope}:version"
+
+
+def _stat_key(namespace, stat):
+    return f"response-cache:{namespace}:{stat}"
+
+
+def _count(namespace, stat):
+    key = _stat_key(namespace, stat)
+    # add() then incr() so concurrent first counts are not lost
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:  # Evicted between the two calls
+        cache.set(key, 1, timeout=None)
+
+
+def get_version(namespace, scope):
+    """
+    Return the current version of ``scope``'s data in ``namespace``.
+
+    A missing version starts at the current time in milliseconds rather than 1, so
+    a version key the cache evicted never restarts at a number old pages are
+    still cached under.
+    """
+    key = _version_key(namespace, scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def scope_of(user):
+    """The cache scope of a user's lists: their company, or every company for staff."""
+    return ALL_COMPANIES if user.is_staff else user.company_id
+
+
+def cached_json(namespace, user, params, build):
+    """
+    Return the cached response for ``params`` in the user's scope, or ``build()`` it.
+
+    Only successful responses are stored.
+
+    Args:
+        namespace (str): ``STORIES`` or ``SOURCES``.
+        params (dict): Every request parameter the response depends on.
+        build (Callable[[], HttpResponse]): Produces the response on a miss.
+    """
+    scope = scope_of(user)
+    digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True).encode(),
+        digest_size=16,
+    ).hexdigest()
+    key = (
+        f"response-cache:{namespace}:{scope}:v{get_version(namespace, scope)}:{digest}"
+    )
+
+    content = cache.get(key)
+    if content is not None:
+        _count(namespace, HITS)
+        return HttpResponse(content, content_type="application/json")
+
+    _count(namespace, MISSES)
+    response = build()
+    if response.status_code == HTTPStatus.OK:
+        cache.set(key, response.content, timeout=_timeout())
+    return response
+
+
+def invalidate(company_id, *namespaces):
+    """Retire the cached ``namespaces`` of ``company_id`` and staff once committed."""
+
+    def bump():
+        for namespace in namespaces:
+            for scope in (company_id, ALL_COMPANIES):
+                # Not cached; the next read starts a fresh version
+                with contextlib.suppress(ValueError):
+                    cache.incr(_version_key(namespace, scope))
+
+    transaction.on_commit(bump)
+
+
+def get_stats():
+    """Return ``{namespace: {"hits", "misses", "hit_rate"}}`` since the last reset."""
+    stats = {}
+    for namespace in NAMESPACES:
+        hits = cache.get(_stat_key(namespace, HITS), 0)
+        misses = cache.get(_stat_key(namespace, MISSES), 0)
+        stats[namespace] = {
+            HITS: hits,
+            MISSES: misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return stats
+
+
+def reset_stats():
+    cache.delete_many(
+        [
+            _stat_key(namespace, stat)
+            for namespace in NAMESPACES
+            for stat in (HITS, MISSES)
+        ],
+    )
@@ -0,0 +1,87 @@
+"""
+Name search ranked by trigram similarity.
+
+``name__icontains`` compiles to ``ILIKE '%term%'``, which a B-tree index cannot
+answer, so every keystroke of an autocomplete scanned the whole table. A GIN index
+with the ``gin_trgm_ops`` operator class from the ``pg_trgm`` extension answers
+``ILIKE`` as well as the word-similarity operator, and ranking by word similarity
+puts the closest names first, so a small ``limit`` returns the useful matches.
+
+``pg_trgm`` ships with PostgreSQL's contrib modules, but not every server has it.
+Where it cannot be installed the migrations skip the indexes and :func:`search`
+falls back to unindexed substring matching, shortest names first.
+"""
+
+import functools
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db import migrations
+from django.db.models import Q
+from django.db.models.functions import Length
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+@functools.cache
+def _installed(database_name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def is_available():
+    """Whether ``pg_trgm`` is installed in the current database."""
+    return _installed(connection.settings_dict["NAME"])
+
+
+def search(queryset, term, field="name", limit=SEARCH_LIMIT):
+    """
+    Return up to ``limit`` rows whose ``field`` contains ``term`` or a similar word.
+
+    Each row is annotated with its ``similarity`` to the term (0 to 1) when
+    ``pg_trgm`` is installed.
+    """
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    matches = Q(**{f"{field}__icontains": term})
+    if not is_available():
+        return queryset.filter(matches).order_by(Length(field), field)[:limit]
+
+    return (
+        queryset.filter(matches | Q(**{f"{field}__trigram_word_similar": term}))
+        .annotate(
+            similarity=TrigramWordSimilarity(term, field),
+        )
+        .order_by("-similarity", Length(field), field)[:limit]
+    )
+
+
+def add_trigram_index(model_name, field, name):
+    """
+    Return the migration operation adding a trigram GIN index on ``model_name.field``.
+
+    The index is always part of the migration state; in the database it is created,
+    with the extension, only where ``pg_trgm`` is available to install.
+    """
+    index = GinIndex(fields=[field], opclasses=["gin_trgm_ops"], name=name)
+
+    def create(apps, schema_editor):
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'",
+            )
+            if cursor.fetchone() is None:
+                return
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        _installed.cache_clear()
+        schema_editor.add_index(apps.get_model(model_name), index)
+
+    def drop(apps, schema_editor):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[migrations.AddIndex(model_name.split(".")[1].lower(), index)],
+        database_operations=[migrations.RunPython(create, drop)],
+    )